@@ -5,7 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.session import get_db_session
 from database.repositories import (SubjectRepository, GroupRepository, TypeRepository, ClassroomRepository,
-                                   TeacherRepository, EntryRepository)
+                                   TeacherRepository, EntryRepository, ScheduleSnapshotRepository,
+                                   SearchRepository, ScheduleChangeRepository, ArchiveRepository)
 
 
 def get_subject_repository(session: AsyncSession = Depends(get_db_session)) -> SubjectRepository:
@@ -60,3 +61,39 @@ def get_entry_repository(session: AsyncSession = Depends(get_db_session)) -> Ent
     :return: Репозиторий для объектов типа Entry.
     """
     return EntryRepository(session)
+
+
+def get_snapshot_repository(session: AsyncSession = Depends(get_db_session)) -> ScheduleSnapshotRepository:
+    """
+    Получение репозитория для объектов типа ScheduleSnapshot.
+    :param session: Сессия БД.
+    :return: Репозиторий для объектов типа ScheduleSnapshot.
+    """
+    return ScheduleSnapshotRepository(session)
+
+
+def get_search_repository(session: AsyncSession = Depends(get_db_session)) -> SearchRepository:
+    """
+    Получение репозитория нечёткого поиска.
+    :param session: Сессия БД.
+    :return: Репозиторий нечёткого поиска.
+    """
+    return SearchRepository(session)
+
+
+def get_change_repository(session: AsyncSession = Depends(get_db_session)) -> ScheduleChangeRepository:
+    """
+    Получение репозитория ленты изменений расписания.
+    :param session: Сессия БД.
+    :return: Репозиторий ленты изменений расписания.
+    """
+    return ScheduleChangeRepository(session)
+
+
+def get_archive_repository(session: AsyncSession = Depends(get_db_session)) -> ArchiveRepository:
+    """
+    Получение репозитория архива занятий прошедших семестров.
+    :param session: Сессия БД.
+    :return: Репозиторий архива занятий.
+    """
+    return ArchiveRepository(session)
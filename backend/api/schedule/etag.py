@@ -0,0 +1,39 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+# Меняется при изменении формата ответа, чтобы клиенты не получили 304 на данные в старом формате
+SCHEDULE_FORMAT_VERSION = 1
+
+
+def schedule_etag(version: UUID, start: datetime, end: datetime) -> str:
+    """
+    Возвращает сильный ETag расписания группы за период.
+
+    :param version: Версия расписания группы.
+    :param start: Начало периода включительно.
+    :param end: Конец периода не включительно.
+    :returns: Значение заголовка ETag в кавычках.
+    """
+    raw = f"{SCHEDULE_FORMAT_VERSION}|{version}|{start.isoformat()}|{end.isoformat()}"
+    return f'"{hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет, совпадает ли ETag с одним из значений заголовка If-None-Match.
+
+    Для If-None-Match используется слабое сравнение: префикс W/ не учитывается.
+
+    :param if_none_match: Значение заголовка If-None-Match.
+    :param etag: Текущий ETag в кавычках.
+    :returns: True, если ресурс не изменился.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,25 @@
+import csv
+import io
+from typing import AsyncIterator, Iterable, Sequence
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+async def csv_chunks(header: Sequence[str], rows: AsyncIterator[Iterable]) -> AsyncIterator[str]:
+    """
+    Преобразует асинхронный поток строк в CSV, отдавая его фрагментами ограниченного размера.
+
+    :param header: Заголовок CSV.
+    :param rows: Асинхронный итератор строк.
+    :returns: Асинхронный итератор фрагментов CSV.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
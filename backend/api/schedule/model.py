@@ -1,7 +1,7 @@
 from uuid import UUID
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 
 
 class Subject(BaseModel):
@@ -20,3 +20,104 @@ class SubjectInDB(Subject):
 class SubjectPayload(BaseModel):
     name: str = Field(..., max_length=255)
     short_name: str = Field(..., max_length=255)
+
+
+class ScheduleEntry(BaseModel):
+    id: UUID
+    start_datetime: datetime
+    end_datetime: datetime
+    subject: str
+    type: str
+    group: Optional[str] = None
+    classroom: Optional[str] = None
+    teacher: Optional[str] = None
+
+
+class ScheduleEntryPage(BaseModel):
+    entries: List[ScheduleEntry]
+    next_cursor: Optional[str] = None
+
+
+class StudyWeek(BaseModel):
+    number: int
+    start_date: date
+    end_date: date
+    semester: str
+
+
+class WeekSchedule(BaseModel):
+    group: str
+    semester: str
+    week: int
+    version: int
+    pairs: List[List[str]]
+    columns: List[str]
+    entries: List[list]
+
+
+class GroupSchedule(BaseModel):
+    group: str
+    start: datetime
+    end: datetime
+    version: UUID
+    pairs: List[List[str]]
+    columns: List[str]
+    entries: List[list]
+
+
+class ScheduleBatchRequest(BaseModel):
+    groups: List[str] = Field(..., min_length=1)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    week: Optional[int] = None
+    semester: Optional[str] = None
+
+
+class ScheduleBatch(BaseModel):
+    schedules: List[GroupSchedule]
+    not_found: List[str]
+
+
+class SearchMatch(BaseModel):
+    kind: str
+    id: UUID
+    name: str
+    similarity: float
+
+
+class ClassroomUtilisation(BaseModel):
+    classroom: str
+    utilisation: float
+
+
+class OccupancyHeatmap(BaseModel):
+    weekdays: List[int]
+    slots: List[str]
+    values: List[List[float]]
+
+
+class ScheduleChange(BaseModel):
+    id: UUID
+    group: str
+    day: date
+    old_version: Optional[UUID] = None
+    new_version: Optional[UUID] = None
+    created_at: datetime
+
+
+class ScheduleChangePage(BaseModel):
+    changes: List[ScheduleChange]
+    cursor: Optional[UUID] = None
+
+
+class IngestStatus(BaseModel):
+    enabled: bool
+    leader: bool
+    running: bool
+    interval: int
+    runs: int
+    failures: int
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_exit_code: Optional[int] = None
+    next_run_at: Optional[datetime] = None
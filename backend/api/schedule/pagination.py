@@ -0,0 +1,32 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(start_datetime: datetime, uuid: UUID) -> str:
+    """
+    Кодирует позицию keyset-пагинации в непрозрачную строку.
+
+    :param start_datetime: Время начала последней записи страницы.
+    :param uuid: ID последней записи страницы.
+    :returns: Курсор следующей страницы.
+    """
+    raw = f"{start_datetime.isoformat()}|{uuid}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Декодирует курсор, полученный от encode_cursor.
+
+    :param cursor: Курсор следующей страницы.
+    :raises ValueError: Если курсор повреждён.
+    :returns: Пара (start_datetime, id).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start_datetime, uuid = raw.split("|")
+        return datetime.fromisoformat(start_datetime), UUID(uuid)
+    except (ValueError, UnicodeDecodeError) as exception:
+        raise ValueError(f"Некорректный курсор: {cursor}") from exception
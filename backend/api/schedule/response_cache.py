@@ -0,0 +1,488 @@
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from loguru import logger
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from api.schedule.serialization import dumps
+from api.schedule.single_flight import SingleFlight
+from config import response_cache_config
+from database.notifications import CacheInvalidation, register_handler
+
+# Метка времени (Unix), до которой запись свежая, хранится перед телом ответа
+EXPIRY = struct.Struct("!d")
+
+# Поколение очистки, при котором запись сохранена в Redis, хранится перед записью
+GENERATION = struct.Struct("!q")
+
+# Ответы, зависящие от расписания многих групп (фильтр по преподавателю или аудитории),
+# устаревают при изменении любой группы
+ANY_GROUP_TAG = "groups"
+
+
+def group_tag(name: str) -> str:
+    """
+    Возвращает тег ответов, построенных по расписанию группы.
+
+    :param name: Название группы.
+    :returns: Тег.
+    """
+    return f"group:{name}"
+
+
+class CacheBackend(ABC):
+    """
+    Хранилище закэшированных ответов: байты по ключу с временем жизни и тегами для инвалидации.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Возвращает найденные записи для нескольких ключей.
+
+        :param keys: Ключи записей.
+        :returns: Словарь ключ → значение только для найденных ключей.
+        """
+        found = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str]):
+        ...
+
+    async def set_many(self, entries: Iterable[Tuple[str, bytes, Iterable[str]]], ttl: float):
+        """
+        Сохраняет несколько записей с одним временем жизни.
+
+        :param entries: Тройки (ключ, значение, теги).
+        :param ttl: Время жизни записей в секундах.
+        """
+        for key, value, tags in entries:
+            await self.set(key, value, ttl, tags)
+
+    @abstractmethod
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        """
+        Удаляет записи с любым из тегов.
+
+        :param tags: Теги.
+        :returns: Количество удалённых записей.
+        """
+
+    @abstractmethod
+    async def clear(self):
+        ...
+
+    async def close(self):
+        """
+        Освобождает соединения хранилища.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_size: int):
+        """
+        Ограниченный LRU-кэш ответов в памяти процесса.
+
+        :param max_size: Максимальное количество записей, при превышении вытесняются самые старые по использованию.
+        """
+        self._max_size = max_size
+        self._entries: OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        value, expires_at, _ = cached
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str]):
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (value, time.monotonic() + ttl, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        return removed
+
+    async def clear(self):
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def _remove(self, key: str):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client: Redis, prefix: str, tag_ttl: float):
+        """
+        Кэш ответов в Redis, общий для всех процессов API.
+
+        Ключи записей тега хранятся в множестве prefix:tag:<тег>. Полная очистка не перебирает ключи,
+        а увеличивает общий счётчик поколения: запись помечена поколением, при котором сохранена, и запись
+        другого поколения считается отсутствующей. Счётчик читается в одном конвейере с самими записями,
+        поэтому очистку, выполненную любым процессом, сразу видят все остальные.
+
+        :param client: Клиент redis.asyncio, команды выполняются через его пул соединений.
+        :param prefix: Префикс всех ключей.
+        :param tag_ttl: Время жизни множеств тегов в секундах, не меньше наибольшего времени жизни записи.
+        """
+        self._client = client
+        self._prefix = prefix
+        self._tag_ttl = int(tag_ttl)
+        self._generation_key = f"{prefix}generation"
+        # Поколение из последнего чтения, им помечаются сохраняемые записи
+        self._generation = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        async with self._client.pipeline(transaction=False) as pipeline:
+            pipeline.get(self._generation_key)
+            pipeline.mget([self._key(key) for key in keys])
+            generation, values = await pipeline.execute()
+        self._generation = int(generation) if generation is not None else 0
+        return {key: value[GENERATION.size:] for key, value in zip(keys, values)
+                if value is not None and len(value) >= GENERATION.size
+                and GENERATION.unpack_from(value)[0] == self._generation}
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str]):
+        await self.set_many([(key, value, tags)], ttl)
+
+    async def set_many(self, entries: Iterable[Tuple[str, bytes, Iterable[str]]], ttl: float):
+        async with self._client.pipeline(transaction=False) as pipeline:
+            for key, value, tags in entries:
+                key = self._key(key)
+                pipeline.set(key, GENERATION.pack(self._generation) + value, ex=max(int(ttl), 1))
+                for tag in tags:
+                    pipeline.sadd(self._tag_key(tag), key)
+                    pipeline.expire(self._tag_key(tag), self._tag_ttl)
+            await pipeline.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        # Множества читаются и удаляются атомарно: ключ, добавленный в тег позже, попадёт в новое множество
+        async with self._client.pipeline(transaction=True) as pipeline:
+            for tag_key in tag_keys:
+                pipeline.smembers(tag_key)
+            pipeline.delete(*tag_keys)
+            *members, _ = await pipeline.execute()
+        keys = set().union(*members)
+        # Часть ключей могла уже истечь, поэтому считаются только реально удалённые
+        return await self._client.delete(*keys) if keys else 0
+
+    async def clear(self):
+        self._generation = await self._client.incr(self._generation_key)
+
+    async def close(self):
+        await self._client.aclose()
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}response:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+
+
+def _query_value(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float, stale_ttl: float = 0, enabled: bool = True):
+        """
+        Кэш результатов запросов к API, сериализованных в JSON.
+
+        Ключ строится из маршрута и нормализованных параметров, запись помечается тегами, по которым
+        её удаляет загрузка расписания. Недоступность хранилища не ломает запрос: ответ просто строится заново.
+
+        Одновременные промахи по одному ключу объединяются: ответ строит один запрос, остальные ждут его результат.
+        Истёкшая запись ещё stale_ttl секунд отдаётся тем запросам, которые пришли, пока её обновляет другой.
+        Инвалидация по тегам удаляет записи сразу, устаревшие данные после изменения расписания не отдаются.
+
+        :param backend: Хранилище записей.
+        :param ttl: Время жизни записи по умолчанию в секундах.
+        :param stale_ttl: (Необязательно) Сколько секунд после истечения запись может отдаваться во время обновления.
+        :param enabled: (Необязательно) False отключает кэширование, ответы строятся на каждый запрос.
+        """
+        self.backend = backend
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._enabled = enabled
+        self._flights = SingleFlight()
+        # Увеличивается при каждой инвалидации: результат, построенный до неё, не сохраняется
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(route: str, **parameters: Any) -> str:
+        """
+        Строит ключ записи. Параметры без значения отбрасываются, остальные упорядочиваются по имени,
+        поэтому ?from=..&to=.. и ?to=..&from=.. дают один ключ.
+
+        :param route: Имя маршрута.
+        :param parameters: Параметры запроса.
+        :returns: Ключ.
+        """
+        query = sorted((name, _query_value(value)) for name, value in parameters.items() if value is not None)
+        return f"{route}?{urlencode(query)}"
+
+    async def get_or_set(self, key: str, compute: Callable[[], Awaitable[Any]], tags: Iterable[str] = (),
+                         ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> bytes:
+        """
+        Возвращает закэшированный ответ или строит, сериализует и сохраняет новый.
+
+        Исключения compute (например, HTTPException 404) пробрасываются всем объединённым запросам,
+        такие ответы не кэшируются.
+
+        :param key: Ключ записи, см. key().
+        :param compute: Корутина-функция, возвращающая данные ответа в форме модели ответа маршрута,
+            они сериализуются serialization.dumps.
+        :param tags: (Необязательно) Теги для инвалидации.
+        :param ttl: (Необязательно) Время жизни записи в секундах, по умолчанию из конфигурации.
+        :param stale_ttl: (Необязательно) Время отдачи истёкшей записи во время обновления, по умолчанию
+            из конфигурации.
+        :returns: Тело ответа в JSON.
+        """
+        if not self._enabled:
+            return dumps(await compute())
+
+        cached = await self._backend_call("get", key)
+        if cached is not None and len(cached) >= EXPIRY.size:
+            fresh_until, = EXPIRY.unpack_from(cached)
+            if fresh_until >= time.time():
+                self.hits += 1
+                return cached[EXPIRY.size:]
+            if self._flights.in_flight(key):
+                # Запись уже обновляет другой запрос, ждать его не нужно
+                self.stale_hits += 1
+                return cached[EXPIRY.size:]
+        self.misses += 1
+        return await self._flights.run(key, lambda: self._compute(key, compute, tags, ttl, stale_ttl))
+
+    @property
+    def generation(self) -> int:
+        """
+        Счётчик инвалидаций процесса. Передаётся в set(), если ответ строился вне get_or_set.
+        """
+        return self._generation
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Возвращает свежие записи для нескольких ключей одним обращением к хранилищу.
+
+        Запросы без объединения и без отдачи истёкших записей: отсутствующие ответы вызывающий строит сам,
+        обычно одним запросом к базе данных для всех ключей, и сохраняет через set().
+
+        :param keys: Ключи записей.
+        :returns: Словарь ключ → тело ответа только для найденных свежих записей.
+        """
+        keys = list(keys)
+        if not self._enabled or not keys:
+            return {}
+        cached = await self._backend_call("get_many", keys) or {}
+        now = time.time()
+        found = {key: value[EXPIRY.size:] for key, value in cached.items()
+                 if len(value) >= EXPIRY.size and EXPIRY.unpack_from(value)[0] >= now}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str] = (), ttl: Optional[float] = None,
+                  stale_ttl: Optional[float] = None, generation: Optional[int] = None):
+        """
+        Сохраняет готовое тело ответа.
+
+        :param key: Ключ записи, см. key().
+        :param body: Тело ответа в JSON.
+        :param tags: (Необязательно) Теги для инвалидации.
+        :param ttl: (Необязательно) Время жизни записи в секундах, по умолчанию из конфигурации.
+        :param stale_ttl: (Необязательно) Время отдачи истёкшей записи во время обновления.
+        :param generation: (Необязательно) Значение generation до построения ответа: если с тех пор была
+            инвалидация, ответ мог устареть и не сохраняется.
+        """
+        if not self._enabled or (generation is not None and generation != self._generation):
+            return
+        ttl = ttl if ttl is not None else self._ttl
+        stale_ttl = stale_ttl if stale_ttl is not None else self._stale_ttl
+        # Хранилище держит запись дольше ttl на stale_ttl, свежесть проверяется по метке в начале записи
+        await self._backend_call("set", key, EXPIRY.pack(time.time() + ttl) + body, ttl + stale_ttl, tags)
+
+    async def set_many(self, entries: Iterable[Tuple[str, bytes, Iterable[str]]], ttl: Optional[float] = None,
+                       stale_ttl: Optional[float] = None, generation: Optional[int] = None):
+        """
+        Сохраняет несколько готовых тел ответов одним обращением к хранилищу.
+
+        :param entries: Тройки (ключ, тело ответа, теги).
+        :param ttl: (Необязательно) Время жизни записей в секундах, по умолчанию из конфигурации.
+        :param stale_ttl: (Необязательно) Время отдачи истёкших записей во время обновления.
+        :param generation: (Необязательно) Значение generation до построения ответов, см. set().
+        """
+        if not self._enabled or (generation is not None and generation != self._generation):
+            return
+        ttl = ttl if ttl is not None else self._ttl
+        stale_ttl = stale_ttl if stale_ttl is not None else self._stale_ttl
+        fresh_until = EXPIRY.pack(time.time() + ttl)
+        entries = [(key, fresh_until + body, tuple(tags)) for key, body, tags in entries]
+        if entries:
+            await self._backend_call("set_many", entries, ttl + stale_ttl)
+
+    async def invalidate(self, tags: Iterable[str]):
+        """
+        Удаляет записи с любым из тегов.
+
+        :param tags: Теги.
+        """
+        self._generation += 1
+        self.invalidations += 1
+        await self._backend_call("invalidate", list(tags))
+
+    async def clear(self):
+        """
+        Удаляет все записи.
+        """
+        self._generation += 1
+        self.invalidations += 1
+        await self._backend_call("clear")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает метрики кэша.
+
+        :returns: Словарь с количеством попаданий (в том числе в истёкшие записи), промахов, инвалидаций,
+            ошибок хранилища, долей попаданий и метриками объединения промахов.
+        """
+        requests = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.stale_hits) / requests if requests else 0.0,
+            **self._flights.stats(),
+        }
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]], tags: Iterable[str],
+                       ttl: Optional[float], stale_ttl: Optional[float]) -> bytes:
+        generation = self._generation
+        body = dumps(await compute())
+        await self.set(key, body, tags, ttl, stale_ttl, generation)
+        return body
+
+    async def _backend_call(self, method: str, *arguments: Any) -> Any:
+        try:
+            return await getattr(self.backend, method)(*arguments)
+        except (ConnectionError, TimeoutError, RedisError) as exception:
+            self.errors += 1
+            logger.warning(f"Ошибка хранилища кэша ответов ({method}): {exception}")
+            return None
+
+
+def create_response_cache() -> ResponseCache:
+    """
+    Создаёт кэш ответов с хранилищем из конфигурации: memory или redis.
+
+    :raises ValueError: Если хранилище в конфигурации неизвестно.
+    :returns: Экземпляр ResponseCache.
+    """
+    config = response_cache_config
+    if config.backend == "memory":
+        backend = MemoryCacheBackend(config.max_size)
+    elif config.backend == "redis":
+        # Пул с ожиданием свободного соединения: при всплеске запросов они ждут, а не получают ошибку
+        pool = BlockingConnectionPool.from_url(config.redis_url, max_connections=config.redis_max_connections,
+                                               timeout=config.redis_timeout, socket_timeout=config.redis_timeout,
+                                               socket_connect_timeout=config.redis_timeout)
+        backend = RedisCacheBackend(Redis(connection_pool=pool), config.key_prefix,
+                                    max(config.ttl, config.versioned_ttl) + config.stale_ttl)
+    else:
+        raise ValueError(f"Неизвестное хранилище кэша ответов: {config.backend}")
+    return ResponseCache(backend, config.ttl, config.stale_ttl, config.enabled)
+
+
+response_cache = create_response_cache()
+
+
+def get_response_cache() -> ResponseCache:
+    return response_cache
+
+
+async def invalidate_schedule_responses(invalidation: CacheInvalidation):
+    """
+    Обработчик уведомлений об изменении расписания: ключ "<группа>:<день>" или "<группа>" удаляет ответы группы
+    и ответы, зависящие от многих групп, пустой ключ — все ответы.
+
+    :param invalidation: Инвалидация сущности schedule.
+    """
+    if invalidation.key is None:
+        await response_cache.clear()
+        return
+    group, _, _ = invalidation.key.rpartition(":")
+    await response_cache.invalidate([group_tag(group or invalidation.key), ANY_GROUP_TAG])
+
+
+async def clear_responses(invalidation: CacheInvalidation):
+    """
+    Обработчик уведомлений, после которых устаревают все ответы, например изменения учебных недель.
+
+    :param invalidation: Любая инвалидация.
+    """
+    await response_cache.clear()
+
+
+def register_response_cache_handlers():
+    """
+    Подписывает кэш ответов на уведомления об изменении расписания и учебных недель.
+    """
+    register_handler("schedule", invalidate_schedule_responses)
+    register_handler("study_weeks", clear_responses)
@@ -1 +1,12 @@
 from .classroom import router as classroom_router
+from .entry import router as entry_router
+from .week import router as week_router
+from .group import router as group_router
+from .export import router as export_router
+from .occupancy import router as occupancy_router
+from .search import router as search_router
+from .analytics import router as analytics_router
+from .change import router as change_router
+from .ingest import router as ingest_router
+from .archive import router as archive_router
+from .schedule import router as schedule_router
@@ -0,0 +1,74 @@
+from datetime import date
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schedule.model import ClassroomUtilisation, OccupancyHeatmap
+from database.analytics import PAIR_SLOTS, STUDY_WEEKDAYS, load_classroom_occupancy
+from database.session import get_db_session
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+SessionDependency = Annotated[AsyncSession, Depends(get_db_session)]
+
+# Ограничения номера пары относятся к каждому элементу списка, а не к самому списку
+PairNumber = Annotated[int, Field(ge=1, le=len(PAIR_SLOTS))]
+
+MAX_PERIOD_DAYS = 200
+
+
+def check_period(date_from: date, date_to: date):
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Начало периода должно быть не позже его конца")
+    if (date_to - date_from).days >= MAX_PERIOD_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Период не может быть длиннее {MAX_PERIOD_DAYS} дней")
+
+
+@router.get("/classrooms/utilisation", response_model=list[ClassroomUtilisation])
+async def get_classroom_utilisation(session: SessionDependency,
+                                    date_from: Annotated[date, Query(alias="from")],
+                                    date_to: Annotated[date, Query(alias="to")]):
+    """
+    Получение процента занятых пар каждой аудитории за период (понедельник – суббота).
+    """
+    check_period(date_from, date_to)
+    occupancy = await load_classroom_occupancy(session, date_from, date_to)
+    utilisation = occupancy.utilisation()
+    return [{"classroom": classroom, "utilisation": percentage}
+            for classroom, percentage in sorted(utilisation.items(), key=lambda item: -item[1])]
+
+
+@router.get("/classrooms/heatmap", response_model=OccupancyHeatmap)
+async def get_classroom_heatmap(session: SessionDependency,
+                                date_from: Annotated[date, Query(alias="from")],
+                                date_to: Annotated[date, Query(alias="to")]):
+    """
+    Получение тепловой карты занятости аудиторий: день недели × пара, в процентах занятых аудиторий.
+    """
+    check_period(date_from, date_to)
+    occupancy = await load_classroom_occupancy(session, date_from, date_to)
+    return {
+        "weekdays": list(STUDY_WEEKDAYS),
+        "slots": [f"{start:%H:%M}-{end:%H:%M}" for start, end in PAIR_SLOTS],
+        "values": occupancy.heatmap().tolist(),
+    }
+
+
+@router.get("/classrooms/free", response_model=list[str])
+async def get_free_classrooms(session: SessionDependency, day: date,
+                              pair: Annotated[Optional[List[PairNumber]], Query()] = None):
+    """
+    Получение аудиторий, свободных во все указанные пары дня (номера пар с 1). По умолчанию — пары с 13:00.
+    """
+    slot_indexes = [number - 1 for number in pair] if pair else \
+        [index for index, (start, _) in enumerate(PAIR_SLOTS) if start.hour >= 13]
+    occupancy = await load_classroom_occupancy(session, day, day)
+    try:
+        return occupancy.free_classrooms(day, slot_indexes)
+    except ValueError as exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exception))
@@ -0,0 +1,60 @@
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from api.schedule.dependencies import get_archive_repository
+from api.schedule.model import ScheduleEntryPage
+from api.schedule.pagination import encode_cursor, decode_cursor
+from api.schedule.serialization import dumps, json_response
+from api.schedule.routes.entry import (resolve_filter_id, GroupRepositoryDependency, TeacherRepositoryDependency,
+                                       ClassroomRepositoryDependency)
+from config import schedule_config
+from database.repositories import ArchiveRepository
+from database.study_calendar import semester_bounds
+
+router = APIRouter(prefix="/archive", tags=["archive"])
+
+ArchiveRepositoryDependency = Annotated[ArchiveRepository, Depends(get_archive_repository)]
+
+
+@router.get("/semesters", response_model=List[str])
+async def get_archived_semesters(repository: ArchiveRepositoryDependency):
+    """
+    Получение семестров, занятия которых перенесены в архив.
+    """
+    return await repository.archived_semesters()
+
+
+@router.get("/entries", response_model=ScheduleEntryPage)
+async def get_archived_entries(
+        repository: ArchiveRepositoryDependency,
+        group_repository: GroupRepositoryDependency,
+        teacher_repository: TeacherRepositoryDependency,
+        classroom_repository: ClassroomRepositoryDependency,
+        semester: str,
+        group: Optional[str] = None,
+        teacher: Optional[str] = None,
+        classroom: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Annotated[int, Query(ge=1, le=schedule_config.max_page_size)] = schedule_config.page_size,
+):
+    """
+    Получение архивных записей расписания группы, преподавателя или аудитории за прошедший семестр.
+
+    Результат разбит на страницы так же, как в /entries/.
+    """
+    try:
+        start, end = semester_bounds(semester)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exception))
+
+    rows = await repository.get_range(
+        start, end,
+        group_id=await resolve_filter_id(group_repository, group, "Группа"),
+        teacher_id=await resolve_filter_id(teacher_repository, teacher, "Преподаватель"),
+        classroom_id=await resolve_filter_id(classroom_repository, classroom, "Аудитория"),
+        after=after, limit=limit
+    )
+    next_cursor = encode_cursor(rows[-1].start_datetime, rows[-1].id) if len(rows) == limit else None
+    return json_response(dumps({"entries": rows, "next_cursor": next_cursor}))
@@ -0,0 +1,34 @@
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from api.schedule.dependencies import get_change_repository, get_group_repository
+from api.schedule.model import ScheduleChangePage
+from api.schedule.routes.entry import resolve_filter_id
+from config import schedule_config
+from database.repositories import ScheduleChangeRepository, GroupRepository
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("/", response_model=ScheduleChangePage)
+async def get_changes(
+        repository: Annotated[ScheduleChangeRepository, Depends(get_change_repository)],
+        group_repository: Annotated[GroupRepository, Depends(get_group_repository)],
+        cursor: Optional[UUID] = None,
+        group: Optional[str] = None,
+        limit: Annotated[int, Query(ge=1, le=schedule_config.max_page_size)] = schedule_config.page_size,
+):
+    """
+    Получение изменений расписания по дням, записанных после курсора.
+
+    Потребитель передаёт в cursor значение из предыдущего ответа. Если новых изменений нет,
+    возвращается тот же курсор, и запрос можно повторить позже.
+    """
+    changes = await repository.get_after(cursor, limit,
+                                         group_id=await resolve_filter_id(group_repository, group, "Группа"))
+    return {
+        "changes": [change._asdict() for change in changes],
+        "cursor": changes[-1].id if changes else cursor,
+    }
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from api.schedule.dependencies import (get_entry_repository, get_group_repository, get_teacher_repository,
+                                       get_classroom_repository)
+from api.schedule.model import ScheduleEntryPage
+from api.schedule.pagination import encode_cursor, decode_cursor
+from api.schedule.response_cache import ANY_GROUP_TAG, ResponseCache, get_response_cache, group_tag
+from api.schedule.serialization import json_response
+from config import schedule_config
+from database.repositories import EntryRepository, GroupRepository, TeacherRepository, ClassroomRepository
+from database.repositories.base import BaseRepository
+
+router = APIRouter(prefix="/entries", tags=["entries"])
+
+
+EntryRepositoryDependency = Annotated[EntryRepository, Depends(get_entry_repository)]
+GroupRepositoryDependency = Annotated[GroupRepository, Depends(get_group_repository)]
+TeacherRepositoryDependency = Annotated[TeacherRepository, Depends(get_teacher_repository)]
+ClassroomRepositoryDependency = Annotated[ClassroomRepository, Depends(get_classroom_repository)]
+ResponseCacheDependency = Annotated[ResponseCache, Depends(get_response_cache)]
+
+
+async def resolve_filter_id(repository: BaseRepository, value: Optional[str], label: str) -> Optional[UUID]:
+    """
+    Получение ID объекта для фильтра по его названию.
+    """
+    if value is None:
+        return None
+    uuid = await repository.resolve_id(value)
+    if uuid is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{label} '{value}' не найден(а)")
+    return uuid
+
+
+@router.get("/", response_model=ScheduleEntryPage)
+async def get_entries(
+        repository: EntryRepositoryDependency,
+        group_repository: GroupRepositoryDependency,
+        teacher_repository: TeacherRepositoryDependency,
+        classroom_repository: ClassroomRepositoryDependency,
+        cache: ResponseCacheDependency,
+        group: Optional[str] = None,
+        teacher: Optional[str] = None,
+        classroom: Optional[str] = None,
+        date_from: Annotated[Optional[datetime], Query(alias="from")] = None,
+        date_to: Annotated[Optional[datetime], Query(alias="to")] = None,
+        week: Annotated[Optional[int], Query(ge=1)] = None,
+        cursor: Optional[str] = None,
+        limit: Annotated[int, Query(ge=1, le=schedule_config.max_page_size)] = schedule_config.page_size,
+):
+    """
+    Получение записей расписания группы, преподавателя или аудитории за период или учебную неделю.
+
+    Результат разбит на страницы, курсор следующей страницы возвращается в поле next_cursor.
+    """
+    if week is not None and (date_from is not None or date_to is not None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Нельзя одновременно указывать неделю и период")
+
+    async def build_page():
+        period_start, period_end = date_from, date_to
+        if week is not None:
+            try:
+                period_start, period_end = repository.study_week_bounds(week)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Учебная неделя {week} не найдена")
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as exception:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exception))
+
+        rows = await repository.get_range(
+            period_start, period_end,
+            group_id=await resolve_filter_id(group_repository, group, "Группа"),
+            teacher_id=await resolve_filter_id(teacher_repository, teacher, "Преподаватель"),
+            classroom_id=await resolve_filter_id(classroom_repository, classroom, "Аудитория"),
+            after=after, limit=limit
+        )
+        next_cursor = encode_cursor(rows[-1].start_datetime, rows[-1].id) if len(rows) == limit else None
+        return {"entries": rows, "next_cursor": next_cursor}
+
+    # Записи группы зависят только от её расписания, выборка по преподавателю или аудитории — от всех групп
+    key = cache.key("entries", group=group, teacher=teacher, classroom=classroom, date_from=date_from,
+                    date_to=date_to, week=week, cursor=cursor, limit=limit)
+    body = await cache.get_or_set(key, build_page, tags=[group_tag(group)] if group is not None else [ANY_GROUP_TAG])
+    return json_response(body)
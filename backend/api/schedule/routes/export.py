@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Annotated, Optional, AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from api.schedule.dependencies import get_group_repository, get_teacher_repository, get_classroom_repository
+from api.schedule.export import csv_chunks
+from api.schedule.routes.entry import resolve_filter_id
+from database.repositories import GroupRepository, TeacherRepository, ClassroomRepository, EntryRepository, EntryRow
+from database.session import session_factory
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+GROUP_COLUMNS = ["id", "name", "department", "level", "course"]
+
+
+GroupRepositoryDependency = Annotated[GroupRepository, Depends(get_group_repository)]
+TeacherRepositoryDependency = Annotated[TeacherRepository, Depends(get_teacher_repository)]
+ClassroomRepositoryDependency = Annotated[ClassroomRepository, Depends(get_classroom_repository)]
+
+
+def csv_response(content: AsyncIterator[str], filename: str) -> StreamingResponse:
+    return StreamingResponse(content, media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.get("/entries.csv")
+async def export_entries(
+        group_repository: GroupRepositoryDependency,
+        teacher_repository: TeacherRepositoryDependency,
+        classroom_repository: ClassroomRepositoryDependency,
+        group: Optional[str] = None,
+        teacher: Optional[str] = None,
+        classroom: Optional[str] = None,
+        date_from: Annotated[Optional[datetime], Query(alias="from")] = None,
+        date_to: Annotated[Optional[datetime], Query(alias="to")] = None,
+):
+    """
+    Выгрузка записей расписания в CSV.
+
+    Записи читаются из базы данных порциями через серверный курсор и сразу отправляются клиенту,
+    поэтому потребление памяти не зависит от объёма выгрузки.
+    """
+    group_id = await resolve_filter_id(group_repository, group, "Группа")
+    teacher_id = await resolve_filter_id(teacher_repository, teacher, "Преподаватель")
+    classroom_id = await resolve_filter_id(classroom_repository, classroom, "Аудитория")
+
+    async def content() -> AsyncIterator[str]:
+        # Сессия открывается внутри генератора: она должна жить, пока отправляется ответ
+        async with session_factory() as session:
+            rows = EntryRepository(session).stream_range(date_from, date_to, group_id=group_id,
+                                                         teacher_id=teacher_id, classroom_id=classroom_id)
+            async for chunk in csv_chunks(EntryRow._fields, rows):
+                yield chunk
+
+    return csv_response(content(), "entries.csv")
+
+
+@router.get("/groups.csv")
+async def export_groups():
+    """
+    Выгрузка всех групп в CSV.
+    """
+    async def content() -> AsyncIterator[str]:
+        async with session_factory() as session:
+            groups = GroupRepository(session).stream_all()
+            rows = ([getattr(group, column) for column in GROUP_COLUMNS] async for group in groups)
+            async for chunk in csv_chunks(GROUP_COLUMNS, rows):
+                yield chunk
+
+    return csv_response(content(), "groups.csv")
@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Annotated, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response, status
+from pydantic import TypeAdapter
+
+from api.schedule.dependencies import (get_group_repository, get_snapshot_repository, get_entry_repository,
+                                       get_search_repository)
+from api.schedule.etag import schedule_etag, etag_matches
+from api.schedule.model import WeekSchedule, ScheduleEntry, GroupSchedule
+from api.schedule.response_cache import ResponseCache, get_response_cache, group_tag
+from api.schedule.serialization import dumps, json_response
+from config import response_cache_config
+from database.columnar import snapshot_reader
+from database.pair_slots import pair_slots
+from database.repositories import (GroupRepository, ScheduleSnapshotRepository, EntryRepository, SearchRepository,
+                                  EntryRow)
+from database.study_calendar import study_calendar
+
+router = APIRouter(prefix="/groups", tags=["groups"])
+
+
+GroupRepositoryDependency = Annotated[GroupRepository, Depends(get_group_repository)]
+SnapshotRepositoryDependency = Annotated[ScheduleSnapshotRepository, Depends(get_snapshot_repository)]
+EntryRepositoryDependency = Annotated[EntryRepository, Depends(get_entry_repository)]
+SearchRepositoryDependency = Annotated[SearchRepository, Depends(get_search_repository)]
+ResponseCacheDependency = Annotated[ResponseCache, Depends(get_response_cache)]
+
+GROUP_VERSION = TypeAdapter(Tuple[UUID, UUID])
+
+
+def schedule_period(entry_repository: EntryRepository, date_from: Optional[datetime], date_to: Optional[datetime],
+                    week: Optional[int], semester: Optional[str]) -> Tuple[datetime, datetime]:
+    """
+    Определение периода расписания по учебной неделе или по границам from и to.
+    """
+    if week is not None:
+        if date_from is not None or date_to is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Укажите либо учебную неделю, либо период from и to")
+        study_week = study_calendar.get_week(week, semester)
+        if study_week is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Учебная неделя {week} не найдена")
+        return entry_repository.study_week_bounds(study_week.number, study_week.semester)
+    if date_from is not None and date_to is not None:
+        if date_from >= date_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Начало периода должно быть раньше конца")
+        return date_from, date_to
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Укажите учебную неделю или период from и to")
+
+
+def schedule_version_key(name: str) -> str:
+    return ResponseCache.key("group_schedule_version", name=name)
+
+
+def schedule_key(name: str, version: UUID, start: datetime, end: datetime) -> str:
+    # Версия входит в ключ, поэтому запись не может пережить изменение расписания даже без уведомления
+    return ResponseCache.key("group_schedule", name=name, version=version, start=start, end=end)
+
+
+def group_schedule(name: str, start: datetime, end: datetime, version: UUID, rows: List[EntryRow]) -> dict:
+    """
+    Сборка компактного расписания группы за период в форме GroupSchedule.
+    """
+    pairs = [[f"{slot.start:%H:%M}", f"{slot.end:%H:%M}"] for slot in pair_slots]
+    return {"group": name, "start": start, "end": end, "version": version, "pairs": pairs,
+            **ScheduleSnapshotRepository.build_payload(rows)}
+
+
+@router.get("/closest/{name}", response_model=str)
+async def get_closest_group(name: str, repository: SearchRepositoryDependency):
+    """
+    Получение названия группы, наиболее похожего на введённое с опечаткой.
+    """
+    matches = await repository.search(name, kinds=["group"], limit=1)
+    if not matches:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Группа, похожая на '{name}', не найдена")
+    return matches[0].name
+
+
+@router.get("/{name}/weeks/{number}", response_model=WeekSchedule)
+async def get_group_week(name: str, number: int, group_repository: GroupRepositoryDependency,
+                         snapshot_repository: SnapshotRepositoryDependency,
+                         entry_repository: EntryRepositoryDependency, cache: ResponseCacheDependency,
+                         semester: Optional[str] = None):
+    """
+    Получение расписания группы на учебную неделю из предварительно построенного снимка.
+    """
+    async def build_week():
+        group_id = await group_repository.resolve_id(name)
+        if group_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Группа '{name}' не найдена")
+        week = study_calendar.get_week(number, semester)
+        if week is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Учебная неделя {number} не найдена")
+
+        snapshot = await snapshot_repository.get(group_id, week.semester, week.number)
+        if snapshot is not None:
+            payload, version = snapshot.payload, snapshot.version
+        else:
+            # Снимок ещё не построен: собираем неделю из записей, не сохраняя результат
+            rows = await entry_repository.get_by_week(week.number, group_id=group_id, semester=week.semester)
+            payload, version = snapshot_repository.build_payload(rows), 0
+        pairs = [[f"{slot.start:%H:%M}", f"{slot.end:%H:%M}"] for slot in pair_slots]
+        return {"group": name, "semester": week.semester, "week": week.number, "version": version, "pairs": pairs,
+                **payload}
+
+    body = await cache.get_or_set(cache.key("group_week", name=name, number=number, semester=semester),
+                                  build_week, tags=[group_tag(name)])
+    return json_response(body)
+
+
+@router.get("/{name}/entries", response_model=list[ScheduleEntry])
+async def get_group_entries(name: str, group_repository: GroupRepositoryDependency,
+                            entry_repository: EntryRepositoryDependency,
+                            date_from: Annotated[Optional[datetime], Query(alias="from")] = None,
+                            date_to: Annotated[Optional[datetime], Query(alias="to")] = None):
+    """
+    Получение записей группы за период из общего для всех процессов столбцового снимка.
+    """
+    snapshot = snapshot_reader.get()
+    if snapshot is not None and snapshot.has_group(name):
+        return json_response(dumps(snapshot.get_range(name, date_from, date_to)))
+
+    # Снимок ещё не опубликован или группа появилась после его построения
+    group_id = await group_repository.resolve_id(name)
+    if group_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Группа '{name}' не найдена")
+    return json_response(dumps(await entry_repository.get_range(date_from, date_to, group_id=group_id)))
+
+
+@router.get("/{name}/schedule", response_model=GroupSchedule,
+            responses={status.HTTP_304_NOT_MODIFIED: {"description": "Расписание не изменилось"}})
+async def get_group_schedule(name: str, group_repository: GroupRepositoryDependency,
+                             entry_repository: EntryRepositoryDependency, cache: ResponseCacheDependency,
+                             date_from: Annotated[Optional[datetime], Query(alias="from")] = None,
+                             date_to: Annotated[Optional[datetime], Query(alias="to")] = None,
+                             week: Optional[int] = None, semester: Optional[str] = None,
+                             if_none_match: Annotated[Optional[str], Header()] = None):
+    """
+    Получение расписания группы за период (from и to) или учебную неделю (week) в компактном виде.
+
+    Ответ содержит сильный ETag, построенный из версии расписания группы и периода. Если клиент передал его
+    в If-None-Match и расписание не менялось, возвращается 304 без чтения занятий.
+    """
+    start, end = schedule_period(entry_repository, date_from, date_to, week, semester)
+
+    # Версия читается до занятий: если расписание изменится между запросами, клиент получит новые данные
+    # со старым ETag и просто повторно загрузит их при следующем опросе, а не наоборот
+    async def read_version():
+        group_version = await group_repository.get_schedule_version(name)
+        if group_version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Группа '{name}' не найдена")
+        return group_version
+
+    tags = [group_tag(name)]
+    group_id, version = GROUP_VERSION.validate_json(
+        await cache.get_or_set(schedule_version_key(name), read_version, tags=tags)
+    )
+    etag = schedule_etag(version, start, end)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    async def build_schedule():
+        rows = await entry_repository.get_range(start, end, group_id=group_id)
+        return group_schedule(name, start, end, version, rows)
+
+    body = await cache.get_or_set(schedule_key(name, version, start, end), build_schedule, tags=tags,
+                                  ttl=response_cache_config.versioned_ttl)
+    return json_response(body, headers)
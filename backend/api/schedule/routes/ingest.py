@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from api.schedule.model import IngestStatus
+from parser.scheduler import ingest_scheduler
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+
+@router.get("/status", response_model=IngestStatus)
+async def get_ingest_status():
+    """
+    Получение состояния планировщика парсера в этой реплике API.
+
+    Запуски парсера выполняет только ведущая реплика, у остальных поле leader равно false.
+    """
+    return ingest_scheduler.status()
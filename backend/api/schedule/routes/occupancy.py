@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from api.schedule.dependencies import get_entry_repository, get_teacher_repository
+from api.schedule.model import ScheduleEntry
+from api.schedule.routes.entry import resolve_filter_id
+from api.schedule.serialization import dumps, json_response
+from database.repositories import EntryRepository, TeacherRepository
+
+router = APIRouter(prefix="/occupancy", tags=["occupancy"])
+
+
+EntryRepositoryDependency = Annotated[EntryRepository, Depends(get_entry_repository)]
+TeacherRepositoryDependency = Annotated[TeacherRepository, Depends(get_teacher_repository)]
+
+
+def check_interval(date_from: datetime, date_to: datetime):
+    if date_from >= date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Начало интервала должно быть раньше его конца")
+
+
+@router.get("/classrooms/free", response_model=list[str])
+async def get_free_classrooms(repository: EntryRepositoryDependency,
+                              date_from: Annotated[datetime, Query(alias="from")],
+                              date_to: Annotated[datetime, Query(alias="to")]):
+    """
+    Получение аудиторий, свободных в течение всего интервала.
+    """
+    check_interval(date_from, date_to)
+    return await repository.get_free_classrooms(date_from, date_to)
+
+
+@router.get("/teachers/{name}", response_model=list[ScheduleEntry])
+async def get_teacher_occupancy(name: str, repository: EntryRepositoryDependency,
+                                teacher_repository: TeacherRepositoryDependency,
+                                date_from: Annotated[datetime, Query(alias="from")],
+                                date_to: Annotated[datetime, Query(alias="to")]):
+    """
+    Получение занятий преподавателя, пересекающихся с интервалом.
+    """
+    check_interval(date_from, date_to)
+    teacher_id = await resolve_filter_id(teacher_repository, name, "Преподаватель")
+    return json_response(dumps(await repository.get_overlapping(date_from, date_to, teacher_id=teacher_id)))
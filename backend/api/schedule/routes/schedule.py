@@ -0,0 +1,68 @@
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from api.schedule.model import ScheduleBatch, ScheduleBatchRequest
+from api.schedule.response_cache import group_tag
+from api.schedule.routes.group import (GROUP_VERSION, GroupRepositoryDependency, EntryRepositoryDependency,
+                                       ResponseCacheDependency, schedule_period, schedule_version_key, schedule_key,
+                                       group_schedule)
+from api.schedule.serialization import JSON_MEDIA_TYPE, dumps
+from config import response_cache_config, schedule_config
+
+router = APIRouter(prefix="/schedules", tags=["schedules"])
+
+
+async def stream_batch(bodies: List[bytes], not_found: List[str]) -> AsyncIterator[bytes]:
+    """
+    Передача ответа ScheduleBatch частями: готовые тела расписаний групп вставляются без повторного разбора.
+    """
+    yield b'{"schedules":['
+    for index, body in enumerate(bodies):
+        yield b"," + body if index else body
+    yield b'],"not_found":' + dumps(not_found) + b"}"
+
+
+@router.post("/batch", response_model=ScheduleBatch)
+async def get_schedules_batch(batch: ScheduleBatchRequest, group_repository: GroupRepositoryDependency,
+                              entry_repository: EntryRepositoryDependency, cache: ResponseCacheDependency):
+    """
+    Получение расписаний нескольких групп за период (start и end) или учебную неделю (week) одним вызовом.
+
+    Расписания групп берутся из кэша ответов теми же записями, что и в /groups/{name}/schedule. Версии
+    и занятия групп, которых нет в кэше, читаются двумя запросами на все группы сразу, и так же, одним обращением
+    на все группы, сохраняются в кэш. Ненайденные группы перечисляются в not_found.
+    """
+    names = list(dict.fromkeys(batch.groups))
+    if len(names) > schedule_config.batch_max_groups:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Можно запросить не больше {schedule_config.batch_max_groups} групп")
+    start, end = schedule_period(entry_repository, batch.start, batch.end, batch.week, batch.semester)
+    generation = cache.generation
+
+    version_keys = {name: schedule_version_key(name) for name in names}
+    cached_versions = await cache.get_many(version_keys.values())
+    versions = {name: GROUP_VERSION.validate_json(cached_versions[key])
+                for name, key in version_keys.items() if key in cached_versions}
+    missing = [name for name in names if name not in versions]
+    if missing:
+        fetched = await group_repository.get_schedule_versions(missing)
+        versions.update(fetched)
+        await cache.set_many([(version_keys[name], dumps(version), [group_tag(name)])
+                              for name, version in fetched.items()], generation=generation)
+
+    keys = {name: schedule_key(name, versions[name][1], start, end) for name in names if name in versions}
+    cached_schedules = await cache.get_many(keys.values())
+    bodies = {name: cached_schedules[key] for name, key in keys.items() if key in cached_schedules}
+    missing = [name for name in keys if name not in bodies]
+    if missing:
+        rows_by_group = await entry_repository.get_range_by_groups(start, end,
+                                                                   [versions[name][0] for name in missing])
+        for name in missing:
+            bodies[name] = dumps(group_schedule(name, start, end, versions[name][1], rows_by_group.get(name, [])))
+        await cache.set_many([(keys[name], bodies[name], [group_tag(name)]) for name in missing],
+                             ttl=response_cache_config.versioned_ttl, generation=generation)
+
+    not_found = [name for name in names if name not in versions]
+    return StreamingResponse(stream_batch([bodies[name] for name in keys], not_found), media_type=JSON_MEDIA_TYPE)
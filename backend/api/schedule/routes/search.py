@@ -0,0 +1,27 @@
+from typing import Annotated, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from api.schedule.dependencies import get_search_repository
+from api.schedule.model import SearchMatch
+from config import search_config
+from database.repositories import SearchRepository
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+SearchRepositoryDependency = Annotated[SearchRepository, Depends(get_search_repository)]
+
+
+@router.get("/", response_model=list[SearchMatch])
+async def search(
+        repository: SearchRepositoryDependency,
+        q: Annotated[str, Query(min_length=1, max_length=150)],
+        kind: Annotated[Optional[List[Literal["group", "teacher", "classroom", "subject"]]], Query()] = None,
+        limit: Annotated[int, Query(ge=1, le=search_config.max_limit)] = search_config.limit,
+):
+    """
+    Нечёткий поиск групп, преподавателей, аудиторий и предметов по названию с учётом опечаток.
+    """
+    matches = await repository.search(q, kinds=kind, limit=limit)
+    return [match._asdict() for match in matches]
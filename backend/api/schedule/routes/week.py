@@ -0,0 +1,29 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+
+from api.schedule.model import StudyWeek
+from database.study_calendar import study_calendar
+
+router = APIRouter(prefix="/weeks", tags=["weeks"])
+
+
+@router.get("/", response_model=list[StudyWeek])
+async def get_weeks(semester: Optional[str] = None):
+    """
+    Получение учебных недель семестра, по умолчанию текущего.
+    """
+    semester = semester or study_calendar.current_semester()
+    return [week._asdict() for week in study_calendar.weeks(semester)] if semester else []
+
+
+@router.get("/current", response_model=StudyWeek)
+async def get_current_week():
+    """
+    Получение текущей учебной недели.
+    """
+    week = study_calendar.week_of(date.today())
+    if week is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Сегодня не учебная неделя")
+    return week._asdict()
@@ -0,0 +1,39 @@
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Response
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    # orjson не сериализует подклассы tuple, а записи расписания — namedtuple (EntryRow, StudyWeek и т. п.)
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return value._asdict()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Сериализует данные ответа в JSON без проверки моделью pydantic.
+
+    Словари, списки, строки, числа, UUID, даты и namedtuple кодируются orjson напрямую, в том же виде,
+    что и стандартный путь FastAPI: naive datetime без часового пояса, UUID строкой. Данные должны уже
+    иметь форму модели ответа маршрута, лишние поля не отбрасываются.
+
+    :param data: Данные ответа.
+    :raises TypeError: Если в данных есть значение неподдерживаемого типа.
+    :returns: JSON в UTF-8.
+    """
+    return orjson.dumps(data, default=_default)
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Возвращает готовое тело JSON ответом, минуя проверку и сериализацию FastAPI.
+
+    :param body: JSON в UTF-8.
+    :param headers: (Необязательно) Заголовки ответа.
+    :returns: Ответ.
+    """
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Объединение одновременных одинаковых вычислений: пока вычисление по ключу выполняется,
+        остальные вызовы с тем же ключом ждут его результат, а не запускают своё.
+
+        Вычисление принадлежит первому вызову. Если этот вызов отменён (клиент закрыл соединение),
+        вычисление отменяется вместе с ним, а ожидающие вызовы запускают его заново.
+        """
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.computations = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Возвращает результат вычисления по ключу, запуская его, только если оно ещё не выполняется.
+
+        :param key: Ключ вычисления.
+        :param compute: Корутина-функция, выполняющая вычисление.
+        :returns: Результат compute. Исключение compute получают все ожидающие вызовы.
+        """
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = asyncio.ensure_future(compute())
+                self._flights[key] = flight
+                flight.add_done_callback(lambda done: self._finish(key, done))
+                self.computations += 1
+                return await flight
+
+            self.coalesced += 1
+            try:
+                # shield: отмена ожидающего вызова не должна отменять чужое вычисление
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if flight.cancelled():
+                    self.coalesced -= 1
+                    continue
+                raise
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает метрики объединения.
+
+        :returns: Словарь с количеством вычислений, объединённых вызовов, выполняющихся вычислений
+            и долей вызовов, получивших чужой результат.
+        """
+        calls = self.computations + self.coalesced
+        return {
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "coalescing_ratio": self.coalesced / calls if calls else 0.0,
+        }
+
+    def _finish(self, key: Hashable, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Исключение уже получили ожидающие вызовы, без этого asyncio предупреждает о непрочитанном
+            flight.exception()
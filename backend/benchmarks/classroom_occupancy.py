@@ -0,0 +1,98 @@
+"""
+Сравнение построения матрицы занятости аудиторий циклом по записям и векторизованно через NumPy.
+
+Генерирует синтетический семестр (по умолчанию 18 недель, 300 аудиторий, занятость около 60%),
+строит матрицу аудитория × день × пара обоими способами, проверяет совпадение результатов и выводит время
+построения, расчёта процента занятости и поиска свободных после обеда аудиторий.
+Цикл получает объекты datetime, как при чтении ORM-объектов, векторизованный вариант — секунды от эпохи,
+как их возвращает запрос load_classroom_occupancy; время преобразования в массивы входит в замер.
+База данных не нужна.
+
+Запуск из каталога backend:
+    python -m benchmarks.classroom_occupancy --classrooms 300 --weeks 18 --fill 0.6
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from database.analytics import PAIR_SLOTS, ClassroomOccupancy
+
+SEMESTER_START = date(2024, 9, 2)
+
+
+def make_semester(classrooms: int, weeks: int, fill: float, seed: int):
+    generator = np.random.default_rng(seed)
+    days = [SEMESTER_START + timedelta(days=index) for index in range(weeks * 7) if index % 7 != 6]
+    classroom_codes, starts, ends = [], [], []
+    for day in days:
+        busy = generator.random((classrooms, len(PAIR_SLOTS))) < fill
+        for code, slot_index in zip(*np.nonzero(busy)):
+            slot_start, slot_end = PAIR_SLOTS[slot_index]
+            classroom_codes.append(code)
+            starts.append(datetime.combine(day, slot_start))
+            ends.append(datetime.combine(day, slot_end))
+    names = [f"ГУК-{code:03d}" for code in range(classrooms)]
+    return names, classroom_codes, starts, ends, SEMESTER_START + timedelta(weeks=weeks) - timedelta(days=1)
+
+
+def build_naive(names, classroom_codes, starts, ends, last_day) -> np.ndarray:
+    occupancy = np.zeros((len(names), (last_day - SEMESTER_START).days + 1, len(PAIR_SLOTS)), dtype=bool)
+    for code, start, end in zip(classroom_codes, starts, ends):
+        day_index = (start.date() - SEMESTER_START).days
+        for slot_index, (slot_start, slot_end) in enumerate(PAIR_SLOTS):
+            if start.time() < slot_end and end.time() > slot_start:
+                occupancy[code, day_index, slot_index] = True
+    return occupancy
+
+
+def measure(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classrooms", type=int, default=300)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--fill", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    names, classroom_codes, starts, ends, last_day = make_semester(arguments.classrooms, arguments.weeks,
+                                                                   arguments.fill, arguments.seed)
+    print(f"Записей: {len(starts)}")
+
+    naive, naive_time = measure(build_naive, names, classroom_codes, starts, ends, last_day)
+
+    epoch = datetime(1970, 1, 1)
+    start_seconds = [int((start - epoch).total_seconds()) for start in starts]
+    end_seconds = [int((end - epoch).total_seconds()) for end in ends]
+
+    def build_vectorised():
+        count = len(start_seconds)
+        return ClassroomOccupancy.from_intervals(
+            names, np.fromiter(classroom_codes, dtype=np.int64, count=count),
+            np.fromiter(start_seconds, dtype=np.int64, count=count).astype("datetime64[s]"),
+            np.fromiter(end_seconds, dtype=np.int64, count=count).astype("datetime64[s]"),
+            SEMESTER_START, last_day
+        )
+
+    occupancy, vectorised_time = measure(build_vectorised)
+    assert np.array_equal(naive, occupancy.occupancy)
+
+    _, utilisation_time = measure(occupancy.utilisation)
+    _, heatmap_time = measure(occupancy.heatmap)
+    _, free_time = measure(occupancy.free_classrooms, SEMESTER_START, [2, 3, 4, 5])
+
+    print(f"Матрица циклом:           {naive_time * 1000:10.1f} мс")
+    print(f"Матрица векторизованно:   {vectorised_time * 1000:10.1f} мс")
+    print(f"Процент занятости:        {utilisation_time * 1000:10.1f} мс")
+    print(f"Тепловая карта:           {heatmap_time * 1000:10.1f} мс")
+    print(f"Свободные после обеда:    {free_time * 1000:10.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
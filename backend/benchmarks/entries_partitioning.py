@@ -0,0 +1,162 @@
+"""
+Сравнение запросов по периоду к несекционированной таблице занятий и к таблице, секционированной по месяцам.
+
+Создаёт в тестовой базе данных две временные таблицы со столбцами и индексами entries до и после
+секционирования, заполняет их одинаковыми синтетическими занятиями (по умолчанию 5 млн строк за 24 месяца)
+и выводит медиану и 95-й процентиль времени запросов за неделю — всех занятий и занятий одного
+преподавателя, — а также время удаления самого старого месяца через DELETE и через отсоединение секции.
+Для секционированной таблицы дополнительно выводится число секций в плане запроса за неделю.
+
+Запуск из каталога backend:
+    python -m benchmarks.entries_partitioning --rows 5000000 --months 24 --queries 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import test_database_config
+from database.partitions import months_between, next_month, partition_name
+
+FIRST_MONTH = date(2023, 9, 1)
+TEACHERS = 2000
+
+COLUMNS = """
+    id uuid NOT NULL,
+    start_datetime timestamp NOT NULL,
+    end_datetime timestamp NOT NULL,
+    subject_id uuid NOT NULL,
+    type_id uuid NOT NULL,
+    classroom_id uuid,
+    teacher_id uuid
+"""
+
+PLAIN_TABLE = f"""
+CREATE TEMPORARY TABLE bench_entries_plain ({COLUMNS}, PRIMARY KEY (id));
+CREATE INDEX ON bench_entries_plain (start_datetime, id);
+CREATE INDEX ON bench_entries_plain (teacher_id, start_datetime, id);
+"""
+
+PARTITIONED_TABLE = f"""
+CREATE TEMPORARY TABLE bench_entries_partitioned ({COLUMNS}, PRIMARY KEY (start_datetime, id))
+PARTITION BY RANGE (start_datetime);
+CREATE INDEX ON bench_entries_partitioned (teacher_id, start_datetime, id);
+"""
+
+# Занятия равномерно распределены по дням периода и шести парам в день
+FILL = """
+INSERT INTO {table} (id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id)
+SELECT gen_random_uuid(), start_datetime, start_datetime + interval '90 minutes',
+       md5((number % 500)::text)::uuid, md5((number % 7)::text)::uuid,
+       md5((number % 800)::text)::uuid, md5((number % {teachers})::text)::uuid
+FROM (
+    SELECT number, timestamp '{first_month}' + make_interval(days => CAST((number * 7919) % :days AS integer))
+           + interval '9 hours' + (number % 6) * interval '105 minutes' AS start_datetime
+    FROM generate_series(1, :rows) AS number
+) AS generated
+"""
+
+WEEK_QUERY = """
+SELECT id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id FROM {table}
+WHERE start_datetime >= :start AND start_datetime < :end
+ORDER BY start_datetime, id LIMIT 1000
+"""
+
+TEACHER_QUERY = """
+SELECT id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id FROM {table}
+WHERE teacher_id = md5(:teacher)::uuid AND start_datetime >= :start AND start_datetime < :end
+ORDER BY start_datetime, id
+"""
+
+
+def last_day(months: int) -> date:
+    month = FIRST_MONTH
+    for _ in range(months):
+        month = next_month(month)
+    return month
+
+
+async def create_tables(connection, months: int, rows: int):
+    for statement in (PLAIN_TABLE + PARTITIONED_TABLE).split(";"):
+        if statement.strip():
+            await connection.execute(text(statement))
+    for month in months_between(FIRST_MONTH, last_day(months)):
+        await connection.execute(text(
+            f"CREATE TEMPORARY TABLE {partition_name('bench_entries_partitioned', month)} "
+            f"PARTITION OF bench_entries_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        ))
+
+    days = (last_day(months) - FIRST_MONTH).days
+    for table in ("bench_entries_plain", "bench_entries_partitioned"):
+        started = time.perf_counter()
+        await connection.execute(text(FILL.format(table=table, teachers=TEACHERS, first_month=FIRST_MONTH)),
+                                 {"days": days, "rows": rows})
+        await connection.execute(text(f"ANALYZE {table}"))
+        print(f"{table}: заполнение {time.perf_counter() - started:.1f} с")
+
+
+async def measure(connection, query: str, parameters: list) -> tuple:
+    timings = []
+    for parameter in parameters:
+        started = time.perf_counter()
+        await connection.execute(text(query), parameter)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def scanned_partitions(connection, parameter: dict) -> int:
+    result = await connection.execute(
+        text("EXPLAIN " + WEEK_QUERY.format(table="bench_entries_partitioned")), parameter
+    )
+    return sum(1 for line in result.scalars() if "bench_entries_partitioned_y" in line)
+
+
+async def main(rows: int, months: int, queries: int, seed: int):
+    generator = random.Random(seed)
+    days = (last_day(months) - FIRST_MONTH).days
+    weeks = []
+    for _ in range(queries):
+        start = datetime.combine(FIRST_MONTH, datetime.min.time()) + timedelta(days=generator.randrange(days - 7))
+        weeks.append({"start": start, "end": start + timedelta(days=7),
+                      "teacher": str(generator.randrange(TEACHERS))})
+
+    engine = create_async_engine(test_database_config.url)
+    async with engine.begin() as connection:
+        await create_tables(connection, months, rows)
+        print(f"Секций в плане запроса за неделю: {await scanned_partitions(connection, weeks[0])} из {months}")
+
+        for table in ("bench_entries_plain", "bench_entries_partitioned"):
+            week_median, week_p95 = await measure(connection, WEEK_QUERY.format(table=table),
+                                                  [{"start": week["start"], "end": week["end"]} for week in weeks])
+            teacher_median, teacher_p95 = await measure(connection, TEACHER_QUERY.format(table=table), weeks)
+            print(f"{table}: неделя {week_median:.2f} / {week_p95:.2f} мс, "
+                  f"неделя преподавателя {teacher_median:.2f} / {teacher_p95:.2f} мс (медиана / p95)")
+
+        oldest = partition_name("bench_entries_partitioned", FIRST_MONTH)
+        started = time.perf_counter()
+        await connection.execute(text("DELETE FROM bench_entries_plain WHERE start_datetime < :end"),
+                                 {"end": datetime.combine(next_month(FIRST_MONTH), datetime.min.time())})
+        delete_time = time.perf_counter() - started
+        started = time.perf_counter()
+        await connection.execute(text(f"ALTER TABLE bench_entries_partitioned DETACH PARTITION {oldest}"))
+        await connection.execute(text(f"DROP TABLE {oldest}"))
+        detach_time = time.perf_counter() - started
+        print(f"Удаление месяца: DELETE {delete_time * 1000:.1f} мс, DETACH + DROP {detach_time * 1000:.1f} мс")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.rows, arguments.months, arguments.queries, arguments.seed))
@@ -0,0 +1,77 @@
+"""
+Моделирование утреннего всплеска запросов расписания: студенты групп одновременно открывают расписание
+сразу после истечения записей кэша ответов.
+
+Запрос к базе данных заменён паузой заданной длительности, одновременно выполняется не больше запросов,
+чем соединений в пуле. Для каждого варианта выводится число «запросов к базе данных», общее время
+и метрики кэша: без кэша каждый студент выполняет свой запрос, с кэшем ответов одновременные промахи
+по группе объединяются в одно вычисление, а со stale_ttl истёкшая запись отдаётся сразу, пока её
+обновляет один запрос. База данных не нужна.
+
+Запуск из каталога backend:
+    python -m benchmarks.response_coalescing --groups 200 --students 25 --query-ms 20 --pool 20
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from api.schedule.response_cache import MemoryCacheBackend, ResponseCache
+
+
+class Database:
+    def __init__(self, query_time: float, pool_size: int):
+        self.query_time = query_time
+        self.queries = 0
+        self._pool = asyncio.Semaphore(pool_size)
+
+    async def week(self, group: str) -> dict:
+        self.queries += 1
+        async with self._pool:
+            await asyncio.sleep(self.query_time)
+        return {"group": group, "entries": []}
+
+
+async def open_schedules(requests: list, handle) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*[handle(group) for group in requests])
+    return time.perf_counter() - started
+
+
+async def run(groups: int, students: int, query_time: float, pool_size: int, seed: int):
+    requests = [f"group-{index}" for index in range(groups) for _ in range(students)]
+    random.Random(seed).shuffle(requests)
+
+    database = Database(query_time, pool_size)
+    elapsed = await open_schedules(requests, database.week)
+    print(f"без кэша: запросов к БД {database.queries}, {elapsed * 1000:.0f} мс")
+
+    for stale_ttl in (0, 60):
+        database = Database(query_time, pool_size)
+        cache = ResponseCache(MemoryCacheBackend(groups * 2), ttl=0, stale_ttl=stale_ttl)
+
+        async def handle(group: str):
+            await cache.get_or_set(cache.key("group_week", name=group), lambda: database.week(group))
+
+        # Первый проход заполняет кэш, записи с ttl=0 истекают сразу, как в момент всплеска
+        await open_schedules(list(dict.fromkeys(requests)), handle)
+        database.queries = 0
+        # Счётчики кэша начинаются с нуля, записи остаются в том же хранилище
+        cache = ResponseCache(cache.backend, ttl=0, stale_ttl=stale_ttl)
+        elapsed = await open_schedules(requests, handle)
+        stats = cache.stats()
+        print(f"кэш ответов, stale_ttl={stale_ttl}: запросов к БД {database.queries}, {elapsed * 1000:.0f} мс, "
+              f"объединено {stats['coalesced']} (доля {stats['coalescing_ratio']:.3f}), "
+              f"отдано истёкших {stats['stale_hits']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--students", type=int, default=25)
+    parser.add_argument("--query-ms", type=float, default=20)
+    parser.add_argument("--pool", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.groups, arguments.students, arguments.query_ms / 1000, arguments.pool,
+                    arguments.seed))
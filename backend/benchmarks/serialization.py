@@ -0,0 +1,84 @@
+"""
+Сравнение времени сериализации ответов со списками занятий: стандартный путь FastAPI (проверка моделью
+pydantic, jsonable_encoder и json.dumps), сериализация моделью pydantic (TypeAdapter.dump_json)
+и быстрый путь api.schedule.serialization.dumps (orjson напрямую из EntryRow).
+
+Выводится время на 1000 занятий для страницы /entries/ и для компактного расписания /groups/{name}/schedule.
+База данных не нужна.
+
+Запуск из каталога backend:
+    python -m benchmarks.serialization --entries 1000 --repeat 50
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api.schedule.model import GroupSchedule, ScheduleEntryPage
+from api.schedule.serialization import dumps
+from database.repositories import ScheduleSnapshotRepository
+from database.repositories.schedule.entry import EntryRow
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2024, 9, 2, 9)
+    return [EntryRow(uuid.uuid4(), start + timedelta(hours=index), start + timedelta(hours=index, minutes=90),
+                     "Математический анализ", "ЛК", "М8О-101БВ-24", "ГУК Б-226", "Иванов Иван Иванович")
+            for index in range(count)]
+
+
+def fastapi_default(model):
+    # То, что делает FastAPI с возвращённым из маршрута словарём при указанном response_model
+    adapter = TypeAdapter(model)
+
+    def serialize(data):
+        content = jsonable_encoder(adapter.validate_python(data))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    return serialize
+
+
+def pydantic_dump(model):
+    adapter = TypeAdapter(model)
+    return lambda data: adapter.dump_json(adapter.validate_python(data))
+
+
+def measure(serialize, data, repeat: int) -> float:
+    serialize(data)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(data)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    arguments = parser.parse_args()
+
+    rows = make_rows(arguments.entries)
+    schedule = {"group": "М8О-101БВ-24", "start": rows[0].start_datetime, "end": rows[-1].end_datetime,
+                "version": uuid.uuid4(), "pairs": [["09:00", "10:30"]],
+                **ScheduleSnapshotRepository.build_payload(rows)}
+    # Для стандартного пути строки преобразуются в словари, как это делали маршруты раньше
+    cases = (
+        ("/entries/", ScheduleEntryPage, {"entries": [row._asdict() for row in rows], "next_cursor": None},
+         {"entries": rows, "next_cursor": None}),
+        ("/groups/{name}/schedule", GroupSchedule, schedule, schedule),
+    )
+    per_thousand = 1000 / arguments.entries * 1000
+
+    for name, model, model_data, fast_data in cases:
+        default_time = measure(fastapi_default(model), model_data, arguments.repeat) * per_thousand
+        pydantic_time = measure(pydantic_dump(model), model_data, arguments.repeat) * per_thousand
+        fast_time = measure(dumps, fast_data, arguments.repeat) * per_thousand
+        print(f"{name:26} FastAPI {default_time:7.2f} мс, pydantic dump_json {pydantic_time:6.2f} мс, "
+              f"orjson {fast_time:5.2f} мс на 1000 занятий, в {default_time / fast_time:.0f} раз быстрее")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Сравнение накладных расходов Python на выполнение запроса с построением select() на каждый вызов
+и с запросом, построенным один раз (database.repositories.statements).
+
+Для каждого запроса, который загрузка расписания выполняет тысячи раз, замеряется путь до обращения
+к драйверу: построение запроса, вычисление ключа кэша скомпилированных запросов SQLAlchemy и поиск в этом кэше.
+Компиляция происходит только при первом вызове в обоих вариантах, поэтому разница — это стоимость
+построения запроса и вычисления его ключа. База данных не нужна.
+
+Запуск из каталога backend:
+    python -m benchmarks.statement_cache --calls 20000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, bindparam
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from database.models import Group, Subject, Type, Classroom, Teacher, Entry, entry_groups
+from database.repositories import EntryRepository
+from database.repositories.statements import cached_statement
+
+DIALECT = asyncpg.dialect()
+WEEK_START = datetime(2024, 9, 2)
+
+
+def compile_cached(statement, compiled_cache: dict):
+    # Тот же путь, что проходит Connection.execute до обращения к драйверу
+    return statement._compile_w_cache(DIALECT, compiled_cache=compiled_cache, column_keys=[])
+
+
+def get_by_id_before():
+    return select(Subject).where(Subject.id == uuid.uuid4())
+
+
+def get_by_id_after():
+    return cached_statement((Subject, "get_by_id"), lambda: select(Subject).where(Subject.id == bindparam("uuid")))
+
+
+def get_by_lookup_before():
+    return select(Group).where(Group.name == "М8О-101БВ-24")
+
+
+def get_by_lookup_after():
+    return cached_statement((Group, "get_by_lookup"), lambda: select(Group).where(Group.name == bindparam("value")))
+
+
+def resolve_ids_before():
+    return select(Subject.name, Subject.id).where(Subject.name.in_(["Математический анализ", "Физика"]))
+
+
+def resolve_ids_after():
+    return cached_statement((Subject, "resolve_ids"), lambda: select(Subject.name, Subject.id)
+                            .where(Subject.name.in_(bindparam("values", expanding=True))))
+
+
+def range_before():
+    # Построение запроса на каждый вызов со значениями фильтров внутри запроса, как в EntryRepository._range_query
+    # до кэширования (ветви для фильтров группы и периода)
+    start, end, group_id = WEEK_START, WEEK_START + timedelta(days=7), uuid.uuid4()
+    link_condition = (entry_groups.c.entry_id == Entry.id) & (entry_groups.c.entry_start == Entry.start_datetime)
+    return (
+        select(Entry.id, Entry.start_datetime, Entry.end_datetime, Subject.name, Type.short_name, Group.name,
+               Classroom.name, Teacher.full_name)
+        .join(Subject, Entry.subject_id == Subject.id)
+        .join(Type, Entry.type_id == Type.id)
+        .outerjoin(Classroom, Entry.classroom_id == Classroom.id)
+        .outerjoin(Teacher, Entry.teacher_id == Teacher.id)
+        .order_by(Entry.start_datetime, Entry.id)
+        .where(Entry.start_datetime >= start)
+        .where(Entry.start_datetime < end)
+        .join(entry_groups, link_condition)
+        .join(Group, entry_groups.c.group_id == Group.id)
+        .where(entry_groups.c.entry_start >= start)
+        .where(entry_groups.c.entry_start < end)
+        .where(entry_groups.c.group_id == group_id)
+    )
+
+
+def range_after():
+    query, _ = EntryRepository.range_query(WEEK_START, WEEK_START + timedelta(days=7), uuid.uuid4(), None, None)
+    return query
+
+
+def measure(build, calls: int) -> float:
+    compiled_cache = {}
+    compile_cached(build(), compiled_cache)
+    started = time.perf_counter()
+    for _ in range(calls):
+        compile_cached(build(), compiled_cache)
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    arguments = parser.parse_args()
+
+    for name, before, after in (("get_by_id", get_by_id_before, get_by_id_after),
+                                ("get_by_lookup", get_by_lookup_before, get_by_lookup_after),
+                                ("resolve_ids", resolve_ids_before, resolve_ids_after),
+                                ("get_range (группа, неделя)", range_before, range_after)):
+        before_time = measure(before, arguments.calls)
+        after_time = measure(after, arguments.calls)
+        print(f"{name:28} построение каждый раз {before_time:8.1f} мкс, готовый запрос {after_time:6.1f} мкс, "
+              f"в {before_time / after_time:.0f} раз быстрее")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Сравнение вставки в таблицу с первичным ключом UUID версии 4 и версии 7.
+
+Создаёт в тестовой базе данных две временные таблицы с той же структурой, что и entries, вставляет
+в каждую одинаковое количество строк пакетами (по умолчанию — объём семестра) и выводит скорость вставки,
+размер индекса первичного ключа и его плотность.
+
+Запуск из каталога backend:
+    python -m benchmarks.uuid_primary_keys --rows 300000 --batch 5000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import test_database_config
+from database.models.base import uuid7
+
+CREATE_TABLE = """
+CREATE TEMPORARY TABLE {table} (
+    id uuid PRIMARY KEY,
+    start_datetime timestamp NOT NULL,
+    end_datetime timestamp NOT NULL,
+    subject_id uuid NOT NULL,
+    type_id uuid NOT NULL,
+    group_id uuid,
+    classroom_id uuid,
+    teacher_id uuid
+)
+"""
+
+INSERT = """
+INSERT INTO {table} (id, start_datetime, end_datetime, subject_id, type_id, group_id, classroom_id, teacher_id)
+SELECT * FROM unnest(
+    CAST(:ids AS uuid[]), CAST(:starts AS timestamp[]), CAST(:ends AS timestamp[]), CAST(:subjects AS uuid[]),
+    CAST(:types AS uuid[]), CAST(:groups AS uuid[]), CAST(:classrooms AS uuid[]), CAST(:teachers AS uuid[])
+)
+"""
+
+
+def make_batch(generate_id, size: int, offset: int) -> dict:
+    dimension_ids = [uuid.uuid4() for _ in range(50)]
+    semester_start = datetime(2024, 9, 2, 9, 0)
+    starts = [semester_start + timedelta(minutes=105 * ((offset + index) % 1000)) for index in range(size)]
+    return {
+        "ids": [generate_id() for _ in range(size)],
+        "starts": starts,
+        "ends": [start + timedelta(minutes=90) for start in starts],
+        "subjects": [dimension_ids[index % 50] for index in range(size)],
+        "types": [dimension_ids[index % 7] for index in range(size)],
+        "groups": [dimension_ids[index % 43] for index in range(size)],
+        "classrooms": [dimension_ids[index % 31] for index in range(size)],
+        "teachers": [dimension_ids[index % 47] for index in range(size)],
+    }
+
+
+async def run(table: str, generate_id, rows: int, batch: int, connection) -> dict:
+    await connection.execute(text(CREATE_TABLE.format(table=table)))
+    insert = text(INSERT.format(table=table))
+    elapsed = 0.0
+    for offset in range(0, rows, batch):
+        parameters = make_batch(generate_id, min(batch, rows - offset), offset)
+        started = time.perf_counter()
+        await connection.execute(insert, parameters)
+        elapsed += time.perf_counter() - started
+
+    await connection.execute(text(f"ANALYZE {table}"))
+    index_size = (await connection.execute(text(f"SELECT pg_relation_size('{table}_pkey')"))).scalar_one()
+    index_pages = index_size // 8192
+    return {
+        "rows_per_second": rows / elapsed,
+        "index_size_mb": index_size / 1024 / 1024,
+        "rows_per_index_page": rows / index_pages if index_pages else 0,
+    }
+
+
+async def main(rows: int, batch: int):
+    engine = create_async_engine(test_database_config.url)
+    async with engine.begin() as connection:
+        for table, generate_id in (("bench_uuid4", uuid.uuid4), ("bench_uuid7", uuid7)):
+            result = await run(table, generate_id, rows, batch, connection)
+            print(f"{table}: {result['rows_per_second']:.0f} строк/с, индекс {result['index_size_mb']:.1f} МБ, "
+                  f"{result['rows_per_index_page']:.0f} строк на страницу индекса")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.rows, arguments.batch))
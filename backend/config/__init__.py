@@ -1 +1,3 @@
-from .config import database_config, parsing_config, source_config, test_database_config
+from .config import (cache_config, database_config, instrumentation_config, notification_config, parsing_config,
+                     response_cache_config, schedule_config, search_config, snapshot_config, source_config,
+                     test_database_config)
@@ -1,3 +1,4 @@
+from datetime import date
 from pathlib import Path
 
 from dynaconf import Dynaconf
@@ -21,6 +22,61 @@ class ParsingConfig(BaseModel):
     chunk_size: int = 20
     chunk_delay: float = 1.0
     concurrent_requests: int = 15
+    scheduler_enabled: bool = False
+    scheduler_lock_key: int = 7310042
+    leader_check_interval: int = 60
+
+
+class CacheConfig(BaseModel):
+    lookup_max_size: int = 10000
+    lookup_ttl: int = 3600
+
+
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = True
+    backend: str = "memory"
+    max_size: int = 10000
+    ttl: int = 300
+    versioned_ttl: int = 3600
+    stale_ttl: int = 60
+    redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 50
+    redis_timeout: float = 1.0
+    key_prefix: str = "mai-info-bot:responses:"
+
+
+class ScheduleConfig(BaseModel):
+    semester_start: date = Field(..., json_schema_extra={"example": "2024-09-02"})
+    page_size: int = 100
+    max_page_size: int = 1000
+    stream_fetch_size: int = 1000
+    change_retention_days: int = 30
+    archive_after_days: int = 180
+    partitions_ahead_months: int = 3
+    batch_max_groups: int = 50
+
+
+class SearchConfig(BaseModel):
+    limit: int = 10
+    max_limit: int = 50
+    min_similarity: float = 0.3
+
+
+class SnapshotConfig(BaseModel):
+    path: Path = Field(..., json_schema_extra={"example": "data/schedule.snapshot"})
+
+
+class NotificationConfig(BaseModel):
+    enabled: bool = True
+    channel: str = "schedule_cache"
+    reconnect_delay: float = 5.0
+
+
+class InstrumentationConfig(BaseModel):
+    enabled: bool = True
+    slow_query_threshold: float = 0.2
+    n_plus_one_threshold: int = 10
+    explain_slow_queries: bool = True
 
 
 class SourceConfig(BaseModel):
@@ -67,6 +123,61 @@ parsing_config = ParsingConfig(
     chunk_size=_config.parsing.chunk_size,
     chunk_delay=_config.parsing.chunk_delay,
     concurrent_requests=_config.parsing.concurrent_requests,
+    scheduler_enabled=_config.parsing.scheduler_enabled,
+    scheduler_lock_key=_config.parsing.scheduler_lock_key,
+    leader_check_interval=_config.parsing.leader_check_interval,
+)
+
+cache_config = CacheConfig(
+    lookup_max_size=_config.cache.lookup_max_size,
+    lookup_ttl=_config.cache.lookup_ttl,
+)
+
+response_cache_config = ResponseCacheConfig(
+    enabled=_config.response_cache.enabled,
+    backend=_config.response_cache.backend,
+    max_size=_config.response_cache.max_size,
+    ttl=_config.response_cache.ttl,
+    versioned_ttl=_config.response_cache.versioned_ttl,
+    stale_ttl=_config.response_cache.stale_ttl,
+    redis_url=_config.response_cache.redis_url,
+    redis_max_connections=_config.response_cache.redis_max_connections,
+    redis_timeout=_config.response_cache.redis_timeout,
+    key_prefix=_config.response_cache.key_prefix,
+)
+
+schedule_config = ScheduleConfig(
+    semester_start=_config.schedule.semester_start,
+    page_size=_config.schedule.page_size,
+    max_page_size=_config.schedule.max_page_size,
+    stream_fetch_size=_config.schedule.stream_fetch_size,
+    change_retention_days=_config.schedule.change_retention_days,
+    archive_after_days=_config.schedule.archive_after_days,
+    partitions_ahead_months=_config.schedule.partitions_ahead_months,
+    batch_max_groups=_config.schedule.batch_max_groups,
+)
+
+search_config = SearchConfig(
+    limit=_config.search.limit,
+    max_limit=_config.search.max_limit,
+    min_similarity=_config.search.min_similarity,
+)
+
+snapshot_config = SnapshotConfig(
+    path=Path(__file__).parent.parent / _config.snapshot.path,
+)
+
+notification_config = NotificationConfig(
+    enabled=_config.notifications.enabled,
+    channel=_config.notifications.channel,
+    reconnect_delay=_config.notifications.reconnect_delay,
+)
+
+instrumentation_config = InstrumentationConfig(
+    enabled=_config.instrumentation.enabled,
+    slow_query_threshold=_config.instrumentation.slow_query_threshold,
+    n_plus_one_threshold=_config.instrumentation.n_plus_one_threshold,
+    explain_slow_queries=_config.instrumentation.explain_slow_queries,
 )
 
 source_config = SourceConfig(
@@ -0,0 +1,172 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, func, cast, BigInteger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Entry, Classroom
+from database.pair_slots import PAIR_SLOTS
+
+STUDY_WEEKDAYS = (0, 1, 2, 3, 4, 5)
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+class ClassroomOccupancy:
+    def __init__(self, classrooms: List[str], first_day: date, occupancy: np.ndarray,
+                 slots: Sequence[Tuple[time, time]] = PAIR_SLOTS):
+        """
+        Матрица занятости аудиторий: аудитория × день × пара.
+
+        :param classrooms: Названия аудиторий в порядке первой оси матрицы.
+        :param first_day: Дата, соответствующая нулевому индексу второй оси.
+        :param occupancy: Булев массив формы (аудитории, дни, пары).
+        :param slots: Границы пар в порядке третьей оси.
+        """
+        self.classrooms = classrooms
+        self.first_day = first_day
+        self.occupancy = occupancy
+        self.slots = list(slots)
+        self._classroom_codes = {name: code for code, name in enumerate(classrooms)}
+
+    @property
+    def days(self) -> List[date]:
+        return [self.first_day + timedelta(days=index) for index in range(self.occupancy.shape[1])]
+
+    @classmethod
+    def from_intervals(cls, classrooms: List[str], classroom_codes: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                       first_day: date, last_day: date,
+                       slots: Sequence[Tuple[time, time]] = PAIR_SLOTS) -> "ClassroomOccupancy":
+        """
+        Строит матрицу занятости по интервалам занятий без циклов по записям.
+
+        Занятие занимает все пары, с которыми пересекается его интервал, поэтому сдвоенные и нестандартные
+        по времени занятия учитываются корректно. Занятия вне периода отбрасываются.
+
+        :param classrooms: Названия аудиторий.
+        :param classroom_codes: Индексы аудиторий занятий в списке classrooms (int).
+        :param starts: Начала занятий (datetime64).
+        :param ends: Окончания занятий (datetime64).
+        :param first_day: Первый день периода.
+        :param last_day: Последний день периода включительно.
+        :param slots: (Необязательно) Границы пар, по умолчанию расписание МАИ.
+        :returns: Экземпляр ClassroomOccupancy.
+        """
+        days_count = (last_day - first_day).days + 1
+        occupancy = np.zeros((len(classrooms), max(days_count, 0), len(slots)), dtype=bool)
+
+        starts = starts.astype("datetime64[m]")
+        ends = ends.astype("datetime64[m]")
+        start_days = starts.astype("datetime64[D]")
+        day_indexes = (start_days - np.datetime64(first_day, "D")).astype(np.int64)
+        start_minutes = (starts - start_days).astype(np.int64)
+        end_minutes = (ends - start_days).astype(np.int64)
+
+        slot_starts = np.array([_minutes(slot_start) for slot_start, _ in slots])
+        slot_ends = np.array([_minutes(slot_end) for _, slot_end in slots])
+        # (занятия × пары): пересекается ли интервал занятия с парой
+        overlaps = (start_minutes[:, None] < slot_ends[None, :]) & (end_minutes[:, None] > slot_starts[None, :])
+        overlaps &= ((day_indexes >= 0) & (day_indexes < days_count))[:, None]
+
+        entry_indexes, slot_indexes = np.nonzero(overlaps)
+        occupancy[classroom_codes[entry_indexes], day_indexes[entry_indexes], slot_indexes] = True
+        return cls(classrooms, first_day, occupancy, slots)
+
+    def _study_day_mask(self, weekdays: Sequence[int]) -> np.ndarray:
+        first_weekday = self.first_day.weekday()
+        day_weekdays = (np.arange(self.occupancy.shape[1]) + first_weekday) % 7
+        return np.isin(day_weekdays, weekdays)
+
+    def utilisation(self, weekdays: Sequence[int] = STUDY_WEEKDAYS) -> Dict[str, float]:
+        """
+        Возвращает долю занятых пар каждой аудитории за период в процентах.
+
+        :param weekdays: (Необязательно) Учитываемые дни недели (0 — понедельник), по умолчанию понедельник – суббота.
+        :returns: Словарь название аудитории → процент занятости.
+        """
+        occupancy = self.occupancy[:, self._study_day_mask(weekdays), :]
+        if occupancy.size == 0:
+            return {classroom: 0.0 for classroom in self.classrooms}
+        percentages = occupancy.mean(axis=(1, 2)) * 100
+        return dict(zip(self.classrooms, percentages.round(2).tolist()))
+
+    def heatmap(self, weekdays: Sequence[int] = STUDY_WEEKDAYS) -> np.ndarray:
+        """
+        Возвращает тепловую карту занятости: день недели × пара, в процентах занятых аудиторий.
+
+        :param weekdays: (Необязательно) Дни недели строк карты, по умолчанию понедельник – суббота.
+        :returns: Массив формы (len(weekdays), пары).
+        """
+        first_weekday = self.first_day.weekday()
+        day_weekdays = (np.arange(self.occupancy.shape[1]) + first_weekday) % 7
+        # Доля занятых аудиторий для каждого дня и пары, затем среднее по одинаковым дням недели
+        busy_share = self.occupancy.mean(axis=0) if self.classrooms else np.zeros(self.occupancy.shape[1:])
+        heatmap = np.zeros((len(weekdays), len(self.slots)))
+        for row, weekday in enumerate(weekdays):
+            mask = day_weekdays == weekday
+            if mask.any():
+                heatmap[row] = busy_share[mask].mean(axis=0) * 100
+        return heatmap.round(2)
+
+    def free_classrooms(self, day: date, slot_indexes: Sequence[int]) -> List[str]:
+        """
+        Возвращает аудитории, свободные во все указанные пары дня.
+
+        :param day: День.
+        :param slot_indexes: Индексы пар, начиная с 0.
+        :raises ValueError: Если день вне периода матрицы или указан неизвестный индекс пары.
+        :returns: Список названий аудиторий.
+        """
+        day_index = (day - self.first_day).days
+        if not 0 <= day_index < self.occupancy.shape[1]:
+            raise ValueError(f"День {day} вне периода {self.first_day} – {self.days[-1] if self.days else '-'}")
+        if any(not 0 <= slot_index < len(self.slots) for slot_index in slot_indexes):
+            raise ValueError(f"Номера пар должны быть от 1 до {len(self.slots)}")
+        busy = self.occupancy[:, day_index, list(slot_indexes)].any(axis=1)
+        return [self.classrooms[code] for code in np.flatnonzero(~busy).tolist()]
+
+    def free_slots(self, classroom: str) -> np.ndarray:
+        """
+        Возвращает свободные пары аудитории.
+
+        :param classroom: Название аудитории.
+        :raises KeyError: Если аудитории нет в матрице.
+        :returns: Булев массив формы (дни, пары), True — пара свободна.
+        """
+        return ~self.occupancy[self._classroom_codes[classroom]]
+
+
+async def load_classroom_occupancy(session: AsyncSession, first_day: date, last_day: date,
+                                   slots: Optional[Sequence[Tuple[time, time]]] = None) -> ClassroomOccupancy:
+    """
+    Загружает интервалы занятий аудиторий за период и строит матрицу занятости.
+
+    Читаются только три столбца записей, ORM-объекты не создаются, время передаётся секундами от эпохи,
+    поэтому массивы NumPy собираются из целых чисел без разбора объектов datetime.
+
+    :param session: Сессия БД.
+    :param first_day: Первый день периода.
+    :param last_day: Последний день периода включительно.
+    :param slots: (Необязательно) Границы пар, по умолчанию расписание МАИ.
+    :returns: Экземпляр ClassroomOccupancy.
+    """
+    classroom_result = await session.execute(select(Classroom.id, Classroom.name).order_by(Classroom.name))
+    classrooms = classroom_result.all()
+    classroom_codes = {classroom_id: code for code, (classroom_id, _) in enumerate(classrooms)}
+
+    query = (select(Entry.classroom_id, cast(func.extract("epoch", Entry.start_datetime), BigInteger),
+                    cast(func.extract("epoch", Entry.end_datetime), BigInteger))
+             .where(Entry.classroom_id.is_not(None))
+             .where(Entry.start_datetime >= datetime.combine(first_day, time.min))
+             .where(Entry.start_datetime < datetime.combine(last_day + timedelta(days=1), time.min)))
+    result = await session.execute(query)
+    rows = result.all()
+
+    codes = np.fromiter((classroom_codes[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+    starts = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)).astype("datetime64[s]")
+    ends = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows)).astype("datetime64[s]")
+    return ClassroomOccupancy.from_intervals([name for _, name in classrooms], codes, starts, ends,
+                                             first_day, last_day, slots or PAIR_SLOTS)
@@ -0,0 +1,312 @@
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import AsyncIterable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import snapshot_config
+from database.repositories.schedule.entry import EntryRepository, EntryRow
+
+MAGIC = b"MAISNAP2"
+_HEADER_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 64
+_NO_VALUE = -1
+
+DIMENSIONS = ["group", "subject", "type", "classroom", "teacher"]
+_ARRAY_DTYPES = {
+    "ids": ("u1", 16),
+    "day": ("<i4", None),
+    "start_minute": ("<i2", None),
+    "end_minute": ("<i2", None),
+    "group": ("<i4", None),
+    "subject": ("<i4", None),
+    "type": ("<i4", None),
+    "classroom": ("<i4", None),
+    "teacher": ("<i4", None),
+    "group_offsets": ("<i8", None),
+}
+
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def _to_minutes(value: datetime) -> int:
+    return int(np.datetime64(value, "m").astype(np.int64))
+
+
+class ColumnarSnapshot:
+    def __init__(self, path: Path):
+        """
+        Неизменяемый столбцовый снимок всех записей расписания, отображённый в память.
+
+        Файл состоит из заголовка (JSON со словарями строк и смещениями массивов) и выровненных массивов:
+        UUID записей, день (int32, дни от эпохи), минуты начала и окончания от начала дня (int16) и коды измерений
+        (int32, -1 — нет значения). Время занятия восстанавливается только при выдаче записей.
+        Записи отсортированы по (группа, день, начало), group_offsets хранит границы записей каждой группы,
+        поэтому выборка группы за период — это срез и бинарный поиск без копирования данных: минуты начала
+        от эпохи для поиска вычисляются один раз при открытии снимка.
+        Процессы, открывшие один и тот же файл, разделяют его страницы в кэше ОС.
+
+        :param path: Путь к файлу снимка.
+        :raises ValueError: Если файл не является снимком.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _HEADER_PREFIX.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"Файл {path} не является снимком расписания")
+        header = json.loads(self._mmap[_HEADER_PREFIX.size:_HEADER_PREFIX.size + header_length])
+        data_offset = _align(_HEADER_PREFIX.size + header_length)
+
+        self.version: int = header["version"]
+        self.built_at = datetime.fromisoformat(header["built_at"])
+        self.dictionaries: Dict[str, List[str]] = header["dictionaries"]
+        self._group_codes = {name: code for code, name in enumerate(self.dictionaries["group"])}
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, (dtype, width) in _ARRAY_DTYPES.items():
+            offset, length = header["arrays"][name]
+            array = np.frombuffer(self._mmap, dtype=dtype, count=length * (width or 1), offset=data_offset + offset)
+            self._arrays[name] = array.reshape(length, width) if width else array
+        # Записи группы упорядочены по этому столбцу, по нему идёт бинарный поиск границ периода
+        self._start_minutes = self._arrays["day"].astype(np.int64) * _MINUTES_PER_DAY + self._arrays["start_minute"]
+
+    def __len__(self) -> int:
+        return len(self._arrays["day"])
+
+    @property
+    def groups(self) -> List[str]:
+        return self.dictionaries["group"]
+
+    def has_group(self, group: str) -> bool:
+        """
+        Проверяет, есть ли в снимке записи группы.
+
+        :param group: Название группы.
+        :returns: True, если группа есть в словаре снимка.
+        """
+        return group in self._group_codes
+
+    @staticmethod
+    def read_version(path: Path) -> int:
+        """
+        Читает версию снимка из заголовка файла без отображения файла в память.
+
+        :param path: Путь к файлу снимка.
+        :raises ValueError: Если файл не является снимком.
+        :returns: Версия снимка.
+        """
+        with open(path, "rb") as file:
+            prefix = file.read(_HEADER_PREFIX.size)
+            if len(prefix) < _HEADER_PREFIX.size or prefix[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Файл {path} не является снимком расписания")
+            _, header_length = _HEADER_PREFIX.unpack(prefix)
+            return json.loads(file.read(header_length))["version"]
+
+    def group_range(self, group: str, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Возвращает границы записей группы за период в массивах снимка.
+
+        :param group: Название группы.
+        :param start: (Необязательно) Начало периода включительно.
+        :param end: (Необязательно) Конец периода не включительно.
+        :raises KeyError: Если группы нет в снимке.
+        :returns: Пара индексов (первая запись, запись после последней).
+        """
+        code = self._group_codes[group]
+        offsets = self._arrays["group_offsets"]
+        group_first, group_last = int(offsets[code]), int(offsets[code + 1])
+        first, last = group_first, group_last
+        if start is None and end is None:
+            return first, last
+        starts = self._start_minutes[group_first:group_last]
+        if start is not None:
+            first = group_first + int(np.searchsorted(starts, _to_minutes(start), side="left"))
+        if end is not None:
+            last = group_first + int(np.searchsorted(starts, _to_minutes(end), side="left"))
+        return first, max(first, last)
+
+    def get_range(self, group: str, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> List[EntryRow]:
+        """
+        Возвращает записи группы за период в том же виде, что и EntryRepository.get_range.
+
+        :param group: Название группы.
+        :param start: (Необязательно) Начало периода включительно.
+        :param end: (Необязательно) Конец периода не включительно.
+        :raises KeyError: Если группы нет в снимке.
+        :returns: Список EntryRow в порядке start_datetime.
+        """
+        first, last = self.group_range(group, start, end)
+        arrays = {name: array[first:last] for name, array in self._arrays.items() if name != "group_offsets"}
+        days = arrays["day"].astype("datetime64[D]")
+        starts = (days + arrays["start_minute"].astype("timedelta64[m]")).astype("datetime64[s]").tolist()
+        ends = (days + arrays["end_minute"].astype("timedelta64[m]")).astype("datetime64[s]").tolist()
+        columns = {dimension: self._decode(dimension, arrays[dimension]) for dimension in DIMENSIONS}
+        return [
+            EntryRow(UUID(bytes=arrays["ids"][index].tobytes()), starts[index], ends[index],
+                     columns["subject"][index], columns["type"][index], columns["group"][index],
+                     columns["classroom"][index], columns["teacher"][index])
+            for index in range(last - first)
+        ]
+
+    def _decode(self, dimension: str, codes: np.ndarray) -> List[Optional[str]]:
+        names = self.dictionaries[dimension]
+        return [names[code] if code != _NO_VALUE else None for code in codes.tolist()]
+
+    @staticmethod
+    async def write(path: Path, rows: AsyncIterable[EntryRow], version: int) -> int:
+        """
+        Строит снимок из записей и атомарно публикует его по указанному пути.
+
+        Файл сначала пишется рядом под временным именем и затем переименовывается, поэтому читатели
+        видят либо старую, либо новую версию целиком. Уже открытые старые версии остаются доступны
+        читателям до закрытия.
+
+        :param path: Путь к файлу снимка.
+        :param rows: Асинхронный итератор записей, например EntryRepository.stream_range.
+        :param version: Версия снимка.
+        :returns: Количество записей в снимке, записи без группы не сохраняются.
+        """
+        dictionaries: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        columns: Dict[str, list] = {name: [] for name in ["ids", "day", "start_minute", "end_minute", *DIMENSIONS]}
+        async for row in rows:
+            start_minutes = _to_minutes(row.start_datetime)
+            day = start_minutes // _MINUTES_PER_DAY
+            columns["ids"].append(row.id.bytes)
+            columns["day"].append(day)
+            columns["start_minute"].append(start_minutes - day * _MINUTES_PER_DAY)
+            columns["end_minute"].append(_to_minutes(row.end_datetime) - day * _MINUTES_PER_DAY)
+            for dimension in DIMENSIONS:
+                value = getattr(row, dimension)
+                codes = dictionaries[dimension]
+                columns[dimension].append(codes.setdefault(value, len(codes)) if value is not None else _NO_VALUE)
+        return ColumnarSnapshot._write_arrays(path, columns, dictionaries, version)
+
+    @staticmethod
+    def _write_arrays(path: Path, columns: Dict[str, list], dictionaries: Dict[str, Dict[str, int]],
+                      version: int) -> int:
+        count = len(columns["day"])
+        arrays = {
+            "ids": np.frombuffer(b"".join(columns["ids"]), dtype="u1").reshape(count, 16),
+            "day": np.array(columns["day"], dtype="<i4"),
+            "start_minute": np.array(columns["start_minute"], dtype="<i2"),
+            "end_minute": np.array(columns["end_minute"], dtype="<i2"),
+        }
+        for dimension in DIMENSIONS:
+            arrays[dimension] = np.array(columns[dimension], dtype="<i4")
+
+        # Записи без группы в снимок не попадают: выборка из снимка всегда идёт по группе
+        has_group = arrays["group"] != _NO_VALUE
+        order = np.lexsort((arrays["start_minute"], arrays["day"], arrays["group"]))
+        order = order[has_group[order]]
+        arrays = {name: np.ascontiguousarray(array[order]) for name, array in arrays.items()}
+        group_names = list(dictionaries["group"])
+        arrays["group_offsets"] = np.searchsorted(
+            arrays["group"], np.arange(len(group_names) + 1), side="left"
+        ).astype("<i8")
+
+        header = {
+            "version": version,
+            "built_at": datetime.now().isoformat(),
+            "dictionaries": {dimension: list(codes) for dimension, codes in dictionaries.items()},
+            "arrays": {},
+        }
+        # Смещения массивов отсчитываются от начала области данных, которая идёт за заголовком
+        offset = 0
+        for name in _ARRAY_DTYPES:
+            header["arrays"][name] = [offset, len(arrays[name])]
+            offset = _align(offset + arrays[name].nbytes)
+        header_bytes = json.dumps(header, ensure_ascii=False).encode()
+        data_offset = _align(_HEADER_PREFIX.size + len(header_bytes))
+
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_path, "wb") as file:
+            file.write(_HEADER_PREFIX.pack(MAGIC, len(header_bytes)))
+            file.write(header_bytes)
+            for name in _ARRAY_DTYPES:
+                file.seek(data_offset + header["arrays"][name][0])
+                file.write(arrays[name].tobytes())
+            file.truncate(data_offset + offset)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+        return len(order)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SnapshotReader:
+    def __init__(self, path: Path):
+        """
+        Доступ к последней опубликованной версии снимка для процесса API.
+
+        При каждом обращении проверяется inode файла, новая версия открывается после её публикации.
+        Запросы, уже получившие старую версию, дорабатывают с ней.
+
+        :param path: Путь к файлу снимка.
+        """
+        self._path = path
+        self._snapshot: Optional[ColumnarSnapshot] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._lock = Lock()
+
+    def get(self) -> Optional[ColumnarSnapshot]:
+        """
+        Возвращает актуальный снимок.
+
+        :returns: Экземпляр ColumnarSnapshot или None, если снимок ещё не опубликован.
+        """
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        if identity == self._identity:
+            return self._snapshot
+        with self._lock:
+            if identity != self._identity:
+                try:
+                    self._snapshot = ColumnarSnapshot(self._path)
+                except (OSError, ValueError) as exception:
+                    logger.error(f"Не удалось открыть снимок расписания {self._path}: {exception}")
+                    return self._snapshot
+                self._identity = identity
+                logger.info(f"Открыт снимок расписания версии {self._snapshot.version}: "
+                            f"{len(self._snapshot)} записей")
+        return self._snapshot
+
+
+snapshot_reader = SnapshotReader(snapshot_config.path)
+
+
+async def publish_snapshot(session: AsyncSession, path: Optional[Path] = None) -> ColumnarSnapshot:
+    """
+    Строит снимок из всех записей базы данных и публикует его с версией на единицу больше текущей.
+
+    :param session: Сессия БД.
+    :param path: (Необязательно) Путь к файлу снимка, по умолчанию из конфигурации.
+    :returns: Опубликованный снимок.
+    """
+    path = path or snapshot_config.path
+    version = 1
+    if path.exists():
+        try:
+            version = ColumnarSnapshot.read_version(path) + 1
+        except (OSError, ValueError) as exception:
+            logger.warning(f"Текущий снимок расписания не читается и будет перезаписан: {exception}")
+    count = await ColumnarSnapshot.write(path, EntryRepository(session).stream_range(per_group=True), version)
+    logger.success(f"Опубликован снимок расписания версии {version}: {count} записей")
+    return ColumnarSnapshot(path)
@@ -0,0 +1,219 @@
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from greenlet import getcurrent
+from loguru import logger
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import instrumentation_config
+
+QueryRecord = namedtuple("QueryRecord", ["statement", "duration", "row_count", "call_site", "plan"])
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_THIS_FILE = Path(__file__).resolve()
+_BIND_LIST_PATTERN = re.compile(r"\$\d+(?:::\w+)?(?:\s*,\s*\$\d+(?:::\w+)?)*")
+_EXPLAIN_SAVEPOINT = "instrumentation_explain"
+
+_current_recorder: ContextVar[Optional["QueryRecorder"]] = ContextVar("query_recorder", default=None)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Приводит SQL-запрос к виду, не зависящему от количества параметров в IN (...) и VALUES (...).
+
+    :param statement: Текст запроса.
+    :returns: Нормализованный текст запроса.
+    """
+    return _BIND_LIST_PATTERN.sub("?", " ".join(statement.split()))
+
+
+class QueryRecorder:
+    def __init__(self, name: str, slow_threshold: Optional[float] = None, n_plus_one_threshold: Optional[int] = None,
+                 explain_slow_queries: Optional[bool] = None):
+        """
+        Журнал SQL-запросов, выполненных в рамках одного HTTP-запроса, запуска парсера или теста.
+
+        :param name: Название записываемого участка кода.
+        :param slow_threshold: (Необязательно) Порог длительности медленного запроса в секундах.
+        :param n_plus_one_threshold: (Необязательно) Количество одинаковых запросов из одного места,
+                                     начиная с которого они считаются N+1.
+        :param explain_slow_queries: (Необязательно) Сохранять ли план выполнения медленных запросов.
+        """
+        self.name = name
+        self.slow_threshold = slow_threshold if slow_threshold is not None \
+            else instrumentation_config.slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold if n_plus_one_threshold is not None \
+            else instrumentation_config.n_plus_one_threshold
+        self.explain_slow_queries = explain_slow_queries if explain_slow_queries is not None \
+            else instrumentation_config.explain_slow_queries
+        self.records: List[QueryRecord] = []
+
+    @property
+    def query_count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_duration(self) -> float:
+        return sum(record.duration for record in self.records)
+
+    def add(self, record: QueryRecord):
+        self.records.append(record)
+
+    def slow_queries(self) -> List[QueryRecord]:
+        """
+        Возвращает запросы, длительность которых превысила порог.
+
+        :returns: Список QueryRecord.
+        """
+        return [record for record in self.records if record.duration >= self.slow_threshold]
+
+    def n_plus_one(self) -> List[Tuple[str, str, int]]:
+        """
+        Находит запросы, повторённые из одного и того же места кода не меньше порогового количества раз.
+
+        :returns: Список кортежей (место вызова, нормализованный запрос, количество повторов).
+        """
+        counter = Counter((record.call_site, normalize_statement(record.statement)) for record in self.records)
+        return [(call_site, statement, count) for (call_site, statement), count in counter.most_common()
+                if count >= self.n_plus_one_threshold]
+
+    def summary(self) -> Dict[str, Union[str, int, float]]:
+        """
+        Возвращает сводку по записанным запросам.
+
+        :returns: Словарь с количеством запросов, суммарной длительностью, количеством строк и находок.
+        """
+        return {
+            "name": self.name,
+            "queries": self.query_count,
+            "duration": round(self.total_duration, 6),
+            "rows": sum(record.row_count or 0 for record in self.records),
+            "slow_queries": len(self.slow_queries()),
+            "n_plus_one": len(self.n_plus_one()),
+        }
+
+    def report(self) -> str:
+        """
+        Возвращает текстовый отчёт: сводку, N+1 и медленные запросы с планами выполнения.
+
+        :returns: Текст отчёта.
+        """
+        lines = [f"{self.name}: {self.query_count} запросов за {self.total_duration * 1000:.1f} мс"]
+        for call_site, statement, count in self.n_plus_one():
+            lines.append(f"N+1: {count} раз из {call_site}: {statement[:200]}")
+        for record in self.slow_queries():
+            lines.append(f"Медленный запрос ({record.duration * 1000:.1f} мс) из {record.call_site}: "
+                         f"{normalize_statement(record.statement)[:200]}")
+            if record.plan:
+                lines.append(record.plan)
+        return "\n".join(lines)
+
+    def log_report(self):
+        if self.n_plus_one() or self.slow_queries():
+            logger.warning(self.report())
+        else:
+            logger.debug(self.report())
+
+
+@contextmanager
+def record_queries(name: str, **options) -> Iterator[QueryRecorder]:
+    """
+    Записывает SQL-запросы, выполненные внутри блока, на всех инструментированных движках.
+
+    По выходу из блока в лог выводится отчёт, найденные N+1 и медленные запросы выводятся как предупреждения.
+
+    :param name: Название записываемого участка кода.
+    :param options: Параметры QueryRecorder.
+    :returns: QueryRecorder с записанными запросами.
+    """
+    recorder = QueryRecorder(name, **options)
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+        recorder.log_report()
+
+
+def instrument_engine(engine: Union[Engine, AsyncEngine]):
+    """
+    Подключает обработчики событий выполнения запросов к движку. Повторный вызов ничего не делает.
+
+    Пока нет активного record_queries, обработчики не выполняют никакой работы.
+
+    :param engine: Синхронный или асинхронный движок SQLAlchemy.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_recorder.get() is None:
+        return
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _current_recorder.get()
+    start_times = conn.info.get("query_start_time")
+    if recorder is None or not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+
+    plan = None
+    if recorder.explain_slow_queries and duration >= recorder.slow_threshold and not executemany:
+        plan = _explain(conn, statement, parameters)
+
+    row_count = cursor.rowcount if cursor.rowcount >= 0 else None
+    recorder.add(QueryRecord(statement, duration, row_count, _call_site(), plan))
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    # EXPLAIN ANALYZE выполняет запрос повторно, поэтому для изменяющих данные запросов берётся только план.
+    # Отдельный курсор не затирает результат исходного запроса, точка сохранения защищает транзакцию от ошибки.
+    analyze = statement.lstrip().upper().startswith("SELECT")
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            return plan
+        except Exception as exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            logger.warning(f"Не удалось получить план выполнения запроса: {exception}")
+            return None
+    except Exception as exception:
+        logger.warning(f"Не удалось получить план выполнения запроса: {exception}")
+        return None
+    finally:
+        cursor.close()
+
+
+def _call_site(depth: int = 3) -> str:
+    # При асинхронной работе запрос выполняется в дочернем greenlet, а вызывающие корутины
+    # находятся в стеке родительского greenlet, поэтому стек обходится по всей цепочке.
+    frames = []
+    current = getcurrent()
+    greenlet = current
+    while greenlet is not None and len(frames) < depth:
+        frame = sys._getframe(1) if greenlet is current else greenlet.gr_frame
+        while frame is not None and len(frames) < depth:
+            filename = Path(frame.f_code.co_filename)
+            if (filename != _THIS_FILE and _PROJECT_ROOT in filename.parents
+                    and "site-packages" not in filename.parts):
+                frames.append(f"{filename.relative_to(_PROJECT_ROOT)}:{frame.f_lineno} ({frame.f_code.co_name})")
+            frame = frame.f_back
+        greenlet = greenlet.parent
+    return " <- ".join(frames) if frames else "<unknown>"
@@ -0,0 +1,76 @@
+"""entry groups
+
+Collapses entries that differ only in group_id (stream lectures) into a single entry and moves the group
+membership into the entry_groups link table.
+
+Revision ID: 0f8c2b6d4a19
+Revises: b6d0f4a2c815
+Create Date: 2026-10-19 19:41:05.552180
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0f8c2b6d4a19'
+down_revision: Union[str, None] = 'b6d0f4a2c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entry_groups',
+        sa.Column('entry_id', sa.UUID(), nullable=False),
+        sa.Column('group_id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id', 'group_id')
+    )
+    op.create_index('ix_entry_groups_group_entry', 'entry_groups', ['group_id', 'entry_id'], unique=False)
+
+    # Для каждой группы одинаковых занятий остаётся запись с наименьшим id, остальные становятся связями
+    op.execute("""
+        CREATE TEMPORARY TABLE entry_canonical ON COMMIT DROP AS
+        SELECT id, group_id, first_value(id) OVER (
+            PARTITION BY start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id ORDER BY id
+        ) AS canonical_id
+        FROM entries
+    """)
+    op.execute("""
+        INSERT INTO entry_groups (entry_id, group_id)
+        SELECT DISTINCT canonical_id, group_id FROM entry_canonical WHERE group_id IS NOT NULL
+    """)
+    op.execute("""
+        DELETE FROM entries USING entry_canonical
+        WHERE entries.id = entry_canonical.id AND entry_canonical.id <> entry_canonical.canonical_id
+    """)
+
+    op.drop_index('ix_entries_group_start', table_name='entries')
+    op.drop_constraint('entries_group_id_fkey', 'entries', type_='foreignkey')
+    op.drop_column('entries', 'group_id')
+
+
+def downgrade() -> None:
+    op.add_column('entries', sa.Column('group_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('entries_group_id_fkey', 'entries', 'groups', ['group_id'], ['id'])
+
+    # Первая группа остаётся у исходной записи, для остальных групп создаются копии
+    op.execute("""
+        UPDATE entries SET group_id = links.group_id
+        FROM (SELECT DISTINCT ON (entry_id) entry_id, group_id FROM entry_groups ORDER BY entry_id, group_id) AS links
+        WHERE entries.id = links.entry_id
+    """)
+    op.execute("""
+        INSERT INTO entries (id, start_datetime, end_datetime, subject_id, type_id, group_id, classroom_id, teacher_id)
+        SELECT gen_random_uuid(), entries.start_datetime, entries.end_datetime, entries.subject_id, entries.type_id,
+               entry_groups.group_id, entries.classroom_id, entries.teacher_id
+        FROM entry_groups JOIN entries ON entries.id = entry_groups.entry_id
+        WHERE entry_groups.group_id <> entries.group_id
+    """)
+
+    op.create_index('ix_entries_group_start', 'entries', ['group_id', 'start_datetime', 'id'], unique=False)
+    op.drop_index('ix_entry_groups_group_entry', table_name='entry_groups')
+    op.drop_table('entry_groups')
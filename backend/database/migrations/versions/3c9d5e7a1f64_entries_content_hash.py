@@ -0,0 +1,38 @@
+"""entries content hash
+
+Adds a content hash of every entry (time, subject, type, classroom, teacher) with a unique index. The ingest looks
+entries up by the hash and skips rows whose content has not changed.
+
+Revision ID: 3c9d5e7a1f64
+Revises: 0f8c2b6d4a19
+Create Date: 2026-10-19 21:12:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d5e7a1f64'
+down_revision: Union[str, None] = '0f8c2b6d4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('entries', sa.Column('content_hash', sa.UUID(), nullable=True))
+    # Строка хэша должна совпадать с database.models.schedule.entry_content_hash
+    op.execute("""
+        UPDATE entries SET content_hash = md5(concat_ws('|',
+            to_char(start_datetime, 'YYYY-MM-DD HH24:MI:SS'), to_char(end_datetime, 'YYYY-MM-DD HH24:MI:SS'),
+            subject_id::text, type_id::text, coalesce(classroom_id::text, ''), coalesce(teacher_id::text, '')
+        ))::uuid
+    """)
+    op.alter_column('entries', 'content_hash', nullable=False)
+    op.create_index('ix_entries_content_hash', 'entries', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entries_content_hash', table_name='entries')
+    op.drop_column('entries', 'content_hash')
@@ -0,0 +1,164 @@
+"""entries monthly partitions
+
+Recreates entries and entry_groups as tables range-partitioned by month of the entry start. entry_groups gets
+an entry_start column so that both tables share the partition key and a month can be detached as a whole.
+
+Revision ID: 5b8e1f3a7c29
+Revises: d47a2e9c5b16
+Create Date: 2026-10-19 23:57:41.208316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f3a7c29'
+down_revision: Union[str, None] = 'd47a2e9c5b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENTRY_COLUMNS = 'id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id, content_hash'
+# Секции создаются от первого месяца с занятиями до трёх месяцев вперёд, дальше их создаёт парсер
+CREATE_PARTITIONS = """
+    DO $$
+    DECLARE
+        month timestamp;
+        bounds text;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc('month', coalesce(min(start_datetime), localtimestamp)),
+                date_trunc('month', greatest(max(start_datetime), localtimestamp)) + interval '3 months',
+                interval '1 month'
+            ) FROM entries_unpartitioned
+        LOOP
+            bounds := ' FOR VALUES FROM (' || quote_literal(month) || ') TO ('
+                      || quote_literal(month + interval '1 month') || ')';
+            EXECUTE 'CREATE TABLE ' || quote_ident('entries_' || to_char(month, '"y"YYYY"m"MM'))
+                    || ' PARTITION OF entries' || bounds;
+            EXECUTE 'CREATE TABLE ' || quote_ident('entry_groups_' || to_char(month, '"y"YYYY"m"MM'))
+                    || ' PARTITION OF entry_groups' || bounds;
+        END LOOP;
+    END
+    $$
+"""
+
+
+def _entry_columns():
+    return [
+        sa.Column('start_datetime', sa.DateTime(), nullable=False),
+        sa.Column('end_datetime', sa.DateTime(), nullable=False),
+        sa.Column('period', postgresql.TSRANGE(),
+                  sa.Computed("tsrange(start_datetime, end_datetime, '[)')", persisted=True), nullable=False),
+        sa.Column('subject_id', sa.Uuid(), nullable=False),
+        sa.Column('type_id', sa.Uuid(), nullable=False),
+        sa.Column('classroom_id', sa.Uuid(), nullable=True),
+        sa.Column('teacher_id', sa.Uuid(), nullable=True),
+        sa.Column('content_hash', sa.Uuid(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['classroom_id'], ['classrooms.id'], ),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.ForeignKeyConstraint(['type_id'], ['types.id'], ),
+    ]
+
+
+def _create_entry_indexes(content_hash_columns):
+    op.create_index('ix_entries_teacher_start', 'entries', ['teacher_id', 'start_datetime', 'id'], unique=False)
+    op.create_index('ix_entries_classroom_start', 'entries', ['classroom_id', 'start_datetime', 'id'], unique=False)
+    op.create_index('ix_entries_classroom_period', 'entries', ['classroom_id', 'period'], unique=False,
+                    postgresql_using='gist')
+    op.create_index('ix_entries_teacher_period', 'entries', ['teacher_id', 'period'], unique=False,
+                    postgresql_using='gist')
+    op.create_index('ix_entries_content_hash', 'entries', content_hash_columns, unique=True)
+
+
+def _rename_old_tables():
+    # Индексы и ограничения переименованной таблицы сохраняют имена, поэтому освобождаются до создания новых
+    op.rename_table('entry_groups', 'entry_groups_unpartitioned')
+    op.rename_table('entries', 'entries_unpartitioned')
+    for index in ('ix_entries_teacher_start', 'ix_entries_classroom_start', 'ix_entries_start',
+                  'ix_entries_classroom_period', 'ix_entries_teacher_period', 'ix_entries_content_hash'):
+        op.execute(f'DROP INDEX IF EXISTS {index}')
+    op.execute('DROP INDEX IF EXISTS ix_entry_groups_group_entry')
+    op.execute('ALTER INDEX entries_pkey RENAME TO entries_unpartitioned_pkey')
+    op.execute('ALTER INDEX entry_groups_pkey RENAME TO entry_groups_unpartitioned_pkey')
+
+
+def upgrade() -> None:
+    _rename_old_tables()
+
+    op.create_table('entries', *_entry_columns(), sa.PrimaryKeyConstraint('start_datetime', 'id'),
+                    postgresql_partition_by='RANGE (start_datetime)')
+    _create_entry_indexes(['content_hash', 'start_datetime'])
+    op.create_table(
+        'entry_groups',
+        sa.Column('entry_id', sa.Uuid(), nullable=False),
+        sa.Column('entry_start', sa.DateTime(), nullable=False),
+        sa.Column('group_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id', 'entry_start'], ['entries.id', 'entries.start_datetime'],
+                                ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id', 'entry_start', 'group_id'),
+        postgresql_partition_by='RANGE (entry_start)'
+    )
+    op.create_index('ix_entry_groups_group_entry', 'entry_groups', ['group_id', 'entry_start', 'entry_id'],
+                    unique=False)
+
+    op.execute(CREATE_PARTITIONS)
+    op.execute(f'INSERT INTO entries ({ENTRY_COLUMNS}) SELECT {ENTRY_COLUMNS} FROM entries_unpartitioned')
+    op.execute("""
+        INSERT INTO entry_groups (entry_id, entry_start, group_id)
+        SELECT links.entry_id, entries_unpartitioned.start_datetime, links.group_id
+        FROM entry_groups_unpartitioned AS links
+        JOIN entries_unpartitioned ON entries_unpartitioned.id = links.entry_id
+    """)
+    op.drop_table('entry_groups_unpartitioned')
+    op.drop_table('entries_unpartitioned')
+
+    op.add_column('entry_groups_archive', sa.Column('entry_start', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE entry_groups_archive SET entry_start = entries_archive.start_datetime
+        FROM entries_archive WHERE entries_archive.id = entry_groups_archive.entry_id
+    """)
+    op.alter_column('entry_groups_archive', 'entry_start', nullable=False)
+    op.drop_index('ix_entry_groups_archive_group_entry', table_name='entry_groups_archive')
+    op.create_index('ix_entry_groups_archive_group_entry', 'entry_groups_archive',
+                    ['group_id', 'entry_start', 'entry_id'], unique=False)
+
+    op.execute('ANALYZE entries')
+    op.execute('ANALYZE entry_groups')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entry_groups_archive_group_entry', table_name='entry_groups_archive')
+    op.create_index('ix_entry_groups_archive_group_entry', 'entry_groups_archive', ['group_id', 'entry_id'],
+                    unique=False)
+    op.drop_column('entry_groups_archive', 'entry_start')
+
+    _rename_old_tables()
+
+    op.create_table('entries', *_entry_columns(), sa.PrimaryKeyConstraint('id'))
+    _create_entry_indexes(['content_hash'])
+    op.create_index('ix_entries_start', 'entries', ['start_datetime', 'id'], unique=False)
+    op.create_table(
+        'entry_groups',
+        sa.Column('entry_id', sa.Uuid(), nullable=False),
+        sa.Column('group_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id', 'group_id')
+    )
+    op.create_index('ix_entry_groups_group_entry', 'entry_groups', ['group_id', 'entry_id'], unique=False)
+
+    op.execute(f'INSERT INTO entries ({ENTRY_COLUMNS}) SELECT {ENTRY_COLUMNS} FROM entries_unpartitioned')
+    op.execute("""
+        INSERT INTO entry_groups (entry_id, group_id)
+        SELECT entry_id, group_id FROM entry_groups_unpartitioned
+    """)
+    # Секции удаляются вместе с секционированными таблицами
+    op.drop_table('entry_groups_unpartitioned')
+    op.drop_table('entries_unpartitioned')
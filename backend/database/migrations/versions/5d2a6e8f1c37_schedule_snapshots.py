@@ -0,0 +1,37 @@
+"""schedule snapshots
+
+Revision ID: 5d2a6e8f1c37
+Revises: c4e7a91b3f20
+Create Date: 2026-10-19 14:02:51.104882
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a6e8f1c37'
+down_revision: Union[str, None] = 'c4e7a91b3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('schedule_snapshots',
+    sa.Column('group_id', sa.Uuid(), nullable=False),
+    sa.Column('semester', sa.String(length=7), nullable=False),
+    sa.Column('week_number', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('group_id', 'semester', 'week_number')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schedule_snapshots')
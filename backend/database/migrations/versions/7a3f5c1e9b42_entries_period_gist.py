@@ -0,0 +1,36 @@
+"""entries period gist
+
+Revision ID: 7a3f5c1e9b42
+Revises: e91c3b7a5d08
+Create Date: 2026-10-19 17:48:12.906311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3f5c1e9b42'
+down_revision: Union[str, None] = 'e91c3b7a5d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.add_column('entries', sa.Column(
+        'period', postgresql.TSRANGE(),
+        sa.Computed("tsrange(start_datetime, end_datetime, '[)')", persisted=True), nullable=False
+    ))
+    op.create_index('ix_entries_classroom_period', 'entries', ['classroom_id', 'period'], unique=False,
+                    postgresql_using='gist')
+    op.create_index('ix_entries_teacher_period', 'entries', ['teacher_id', 'period'], unique=False,
+                    postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entries_teacher_period', table_name='entries', postgresql_using='gist')
+    op.drop_index('ix_entries_classroom_period', table_name='entries', postgresql_using='gist')
+    op.drop_column('entries', 'period')
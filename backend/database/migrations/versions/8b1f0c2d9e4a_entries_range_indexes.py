@@ -0,0 +1,32 @@
+"""entries range indexes
+
+Revision ID: 8b1f0c2d9e4a
+Revises: 43a04a69fba9
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1f0c2d9e4a'
+down_revision: Union[str, None] = '43a04a69fba9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_entries_group_start', 'entries', ['group_id', 'start_datetime', 'id'], unique=False)
+    op.create_index('ix_entries_teacher_start', 'entries', ['teacher_id', 'start_datetime', 'id'], unique=False)
+    op.create_index('ix_entries_classroom_start', 'entries', ['classroom_id', 'start_datetime', 'id'], unique=False)
+    op.create_index('ix_entries_start', 'entries', ['start_datetime', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entries_start', table_name='entries')
+    op.drop_index('ix_entries_classroom_start', table_name='entries')
+    op.drop_index('ix_entries_teacher_start', table_name='entries')
+    op.drop_index('ix_entries_group_start', table_name='entries')
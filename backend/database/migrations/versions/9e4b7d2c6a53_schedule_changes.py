@@ -0,0 +1,36 @@
+"""schedule changes
+
+Revision ID: 9e4b7d2c6a53
+Revises: 3c9d5e7a1f64
+Create Date: 2026-10-19 22:03:51.274610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7d2c6a53'
+down_revision: Union[str, None] = '3c9d5e7a1f64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('schedule_changes',
+    sa.Column('group_id', sa.Uuid(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('old_version', sa.Uuid(), nullable=True),
+    sa.Column('new_version', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_schedule_changes_group_day', 'schedule_changes', ['group_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedule_changes_group_day', table_name='schedule_changes')
+    op.drop_table('schedule_changes')
@@ -0,0 +1,27 @@
+"""groups schedule version
+
+Revision ID: a6f3c8d1e2b7
+Revises: 5b8e1f3a7c29
+Create Date: 2026-10-20 00:41:17.593024
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f3c8d1e2b7'
+down_revision: Union[str, None] = '5b8e1f3a7c29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('groups', sa.Column('schedule_version', sa.Uuid(), nullable=True))
+    op.execute('UPDATE groups SET schedule_version = gen_random_uuid()')
+    op.alter_column('groups', 'schedule_version', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('groups', 'schedule_version')
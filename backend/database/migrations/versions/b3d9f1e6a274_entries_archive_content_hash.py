@@ -0,0 +1,42 @@
+"""entries archive content hash
+
+Revision ID: b3d9f1e6a274
+Revises: a6f3c8d1e2b7
+Create Date: 2026-10-20 09:12:44.218371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f1e6a274'
+down_revision: Union[str, None] = 'a6f3c8d1e2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Дубликаты, появившиеся при переносе заново загруженных недель, сводятся к одной записи:
+    # её связи с группами дополняются связями дубликатов, сами дубликаты удаляются вместе со своими связями
+    op.execute("""
+        CREATE TEMPORARY TABLE entries_archive_duplicates ON COMMIT DROP AS
+        SELECT id, kept_id FROM (
+            SELECT id, first_value(id) OVER (PARTITION BY content_hash, start_datetime ORDER BY id) AS kept_id
+            FROM entries_archive
+        ) ranked
+        WHERE id <> kept_id
+    """)
+    op.execute("""
+        INSERT INTO entry_groups_archive (entry_id, group_id, entry_start)
+        SELECT duplicates.kept_id, links.group_id, links.entry_start
+        FROM entry_groups_archive links JOIN entries_archive_duplicates duplicates ON duplicates.id = links.entry_id
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("DELETE FROM entries_archive WHERE id IN (SELECT id FROM entries_archive_duplicates)")
+    op.create_index('ix_entries_archive_content_hash', 'entries_archive', ['content_hash', 'start_datetime'],
+                    unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entries_archive_content_hash', table_name='entries_archive')
@@ -0,0 +1,35 @@
+"""name trigram indexes
+
+Revision ID: b6d0f4a2c815
+Revises: 7a3f5c1e9b42
+Create Date: 2026-10-19 18:32:40.118027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d0f4a2c815'
+down_revision: Union[str, None] = '7a3f5c1e9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_subjects_name_trgm', 'subjects', 'name'),
+    ('ix_classrooms_name_trgm', 'classrooms', 'name'),
+    ('ix_teachers_full_name_trgm', 'teachers', 'full_name'),
+    ('ix_groups_name_trgm', 'groups', 'name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(index_name, table_name, [column_name], unique=False, postgresql_using='gin',
+                        postgresql_ops={column_name: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name, postgresql_using='gin')
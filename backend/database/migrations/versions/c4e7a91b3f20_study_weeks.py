@@ -0,0 +1,36 @@
+"""study weeks
+
+Revision ID: c4e7a91b3f20
+Revises: 8b1f0c2d9e4a
+Create Date: 2026-10-19 12:40:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a91b3f20'
+down_revision: Union[str, None] = '8b1f0c2d9e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('study_weeks',
+    sa.Column('number', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('semester', sa.String(length=7), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('semester', 'number')
+    )
+    op.create_index(op.f('ix_study_weeks_start_date'), 'study_weeks', ['start_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_study_weeks_start_date'), table_name='study_weeks')
+    op.drop_table('study_weeks')
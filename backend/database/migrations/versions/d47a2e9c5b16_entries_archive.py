@@ -0,0 +1,74 @@
+"""entries archive
+
+Revision ID: d47a2e9c5b16
+Revises: 9e4b7d2c6a53
+Create Date: 2026-10-19 22:48:10.631942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd47a2e9c5b16'
+down_revision: Union[str, None] = '9e4b7d2c6a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('entries_archive',
+    sa.Column('semester', sa.String(length=7), nullable=False),
+    sa.Column('start_datetime', sa.DateTime(), nullable=False),
+    sa.Column('end_datetime', sa.DateTime(), nullable=False),
+    sa.Column('subject_id', sa.Uuid(), nullable=False),
+    sa.Column('type_id', sa.Uuid(), nullable=False),
+    sa.Column('classroom_id', sa.Uuid(), nullable=True),
+    sa.Column('teacher_id', sa.Uuid(), nullable=True),
+    sa.Column('content_hash', sa.Uuid(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['classroom_id'], ['classrooms.id'], ),
+    sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+    sa.ForeignKeyConstraint(['type_id'], ['types.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_entries_archive_semester_start', 'entries_archive', ['semester', 'start_datetime', 'id'],
+                    unique=False)
+    op.create_index('ix_entries_archive_teacher_start', 'entries_archive', ['teacher_id', 'start_datetime', 'id'],
+                    unique=False)
+    op.create_index('ix_entries_archive_classroom_start', 'entries_archive', ['classroom_id', 'start_datetime', 'id'],
+                    unique=False)
+    op.create_table('entry_groups_archive',
+    sa.Column('entry_id', sa.Uuid(), nullable=False),
+    sa.Column('group_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries_archive.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('entry_id', 'group_id')
+    )
+    op.create_index('ix_entry_groups_archive_group_entry', 'entry_groups_archive', ['group_id', 'entry_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    # Архивные занятия возвращаются в entries, чтобы откат не терял данные
+    op.execute("""
+        INSERT INTO entries (id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id,
+                             content_hash)
+        SELECT id, start_datetime, end_datetime, subject_id, type_id, classroom_id, teacher_id, content_hash
+        FROM entries_archive
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        INSERT INTO entry_groups (entry_id, group_id)
+        SELECT entry_groups_archive.entry_id, entry_groups_archive.group_id
+        FROM entry_groups_archive JOIN entries ON entries.id = entry_groups_archive.entry_id
+        ON CONFLICT DO NOTHING
+    """)
+    op.drop_index('ix_entry_groups_archive_group_entry', table_name='entry_groups_archive')
+    op.drop_table('entry_groups_archive')
+    op.drop_index('ix_entries_archive_classroom_start', table_name='entries_archive')
+    op.drop_index('ix_entries_archive_teacher_start', table_name='entries_archive')
+    op.drop_index('ix_entries_archive_semester_start', table_name='entries_archive')
+    op.drop_table('entries_archive')
@@ -0,0 +1,34 @@
+"""uuid7 primary keys
+
+Новые строки получают UUID версии 7, генерируемые в Python (database.models.base.uuid7), тип столбцов
+id не меняется. Существующие UUID версии 4 не переписываются: они остаются корректными ключами, а на них
+ссылаются внешние ключи и внешние клиенты. Новые ключи растут монотонно и занимают узкий диапазон значений,
+поэтому вставки идут в правый край индекса, а не в случайные страницы. Чтобы убрать уже накопленное
+разрастание индексов, миграция один раз перестраивает их без блокировки записи.
+
+Revision ID: e91c3b7a5d08
+Revises: 5d2a6e8f1c37
+Create Date: 2026-10-19 16:21:37.540196
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91c3b7a5d08'
+down_revision: Union[str, None] = '5d2a6e8f1c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # REINDEX CONCURRENTLY не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.execute('REINDEX TABLE CONCURRENTLY entries')
+
+
+def downgrade() -> None:
+    pass
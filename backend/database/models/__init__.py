@@ -1 +1,2 @@
-from .schedule import Entry, Subject, Group, Classroom, Teacher, Type
+from .schedule import (Entry, Subject, Group, Classroom, Teacher, Type, StudyWeek, ScheduleSnapshot, ScheduleChange,
+                       ArchivedEntry, entry_groups, archived_entry_groups, entry_content_hash)
@@ -1,7 +1,39 @@
+import os
+import time
 import uuid
+from threading import Lock
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+_uuid7_lock = Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Генерирует упорядоченный по времени UUID версии 7 (RFC 9562).
+
+    Старшие 48 бит содержат время в миллисекундах, следующие 12 бит — долю миллисекунды, поэтому новые ключи
+    попадают в конец индекса первичного ключа, а не в случайное место B-дерева. В пределах процесса значения
+    строго возрастают, даже если системное время не изменилось.
+
+    :returns: UUID версии 7.
+    """
+    global _uuid7_last
+    timestamp_ms, sub_ms = divmod(time.time_ns(), 1_000_000)
+    sub_ms_fraction = sub_ms * 4096 // 1_000_000
+    with _uuid7_lock:
+        if (timestamp_ms, sub_ms_fraction) <= _uuid7_last:
+            timestamp_ms, sub_ms_fraction = _uuid7_last[0], _uuid7_last[1] + 1
+            if sub_ms_fraction > 0xFFF:
+                timestamp_ms, sub_ms_fraction = timestamp_ms + 1, 0
+        _uuid7_last = (timestamp_ms, sub_ms_fraction)
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = ((timestamp_ms & ((1 << 48) - 1)) << 80) | (0x7 << 76) | (sub_ms_fraction << 64) | (0b10 << 62) \
+        | random_bits
+    return uuid.UUID(int=value)
+
 
 class Base(DeclarativeBase):
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
@@ -1,15 +1,65 @@
+import hashlib
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 from typing import List, Optional
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import (String, Integer, Date, DateTime, ForeignKey, ForeignKeyConstraint, Index, UniqueConstraint,
+                        Computed, DDL, event, Table, Column, Uuid)
+from sqlalchemy.dialects.postgresql import JSONB, TSRANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from database.models.base import Base
+from database.models.base import Base, uuid7
+
+
+# Связь занятия с группами: потоковая лекция хранится одной записью entries, связанной со всеми группами потока.
+# Таблица секционирована по месяцам так же, как entries: entry_start повторяет начало занятия, поэтому связи
+# старого месяца отсоединяются вместе с секцией занятий
+entry_groups = Table(
+    "entry_groups",
+    Base.metadata,
+    Column("entry_id", Uuid(), primary_key=True),
+    Column("entry_start", DateTime(), primary_key=True),
+    Column("group_id", ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True),
+    ForeignKeyConstraint(["entry_id", "entry_start"], ["entries.id", "entries.start_datetime"], ondelete="CASCADE"),
+    Index("ix_entry_groups_group_entry", "group_id", "entry_start", "entry_id"),
+    postgresql_partition_by="RANGE (entry_start)",
+)
+
+
+def entry_content_hash(start_datetime: datetime, end_datetime: datetime, subject_id: uuid.UUID, type_id: uuid.UUID,
+                       classroom_id: Optional[uuid.UUID] = None, teacher_id: Optional[uuid.UUID] = None) -> uuid.UUID:
+    """
+    Вычисляет хэш содержимого занятия: MD5 от времени, предмета, типа, аудитории и преподавателя.
+
+    Формат строки совпадает с выражением в миграции 3c9d5e7a1f64, поэтому хэши, посчитанные в Python и в SQL,
+    одинаковы.
+
+    :param start_datetime: Время начала.
+    :param end_datetime: Время окончания.
+    :param subject_id: ID предмета.
+    :param type_id: ID типа занятия.
+    :param classroom_id: (Необязательно) ID аудитории.
+    :param teacher_id: (Необязательно) ID преподавателя.
+    :returns: Хэш в виде UUID.
+    """
+    content = "|".join([
+        f"{start_datetime:%Y-%m-%d %H:%M:%S}", f"{end_datetime:%Y-%m-%d %H:%M:%S}", str(subject_id), str(type_id),
+        str(classroom_id) if classroom_id is not None else "", str(teacher_id) if teacher_id is not None else ""
+    ])
+    return uuid.UUID(bytes=hashlib.md5(content.encode(), usedforsecurity=False).digest())
+
+
+def _default_content_hash(context) -> uuid.UUID:
+    parameters = context.get_current_parameters()
+    return entry_content_hash(parameters["start_datetime"], parameters["end_datetime"], parameters["subject_id"],
+                              parameters["type_id"], parameters.get("classroom_id"), parameters.get("teacher_id"))
 
 
 class Subject(Base):
     __tablename__ = "subjects"
+    __table_args__ = (
+        Index("ix_subjects_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     name: Mapped[str] = mapped_column(String(150), unique=True)
     short_name: Mapped[str] = mapped_column(String(25), nullable=True)
 
@@ -18,6 +68,9 @@ class Subject(Base):
 
 class Classroom(Base):
     __tablename__ = "classrooms"
+    __table_args__ = (
+        Index("ix_classrooms_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     name: Mapped[str] = mapped_column(String(25), unique=True)
 
     entries: Mapped[List["Entry"]] = relationship(back_populates="classroom", lazy="subquery")
@@ -25,6 +78,9 @@ class Classroom(Base):
 
 class Teacher(Base):
     __tablename__ = "teachers"
+    __table_args__ = (
+        Index("ix_teachers_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
     full_name: Mapped[str] = mapped_column(String(50), unique=True)
 
     entries: Mapped[List["Entry"]] = relationship(back_populates="teacher", lazy="subquery")
@@ -40,27 +96,122 @@ class Type(Base):
 
 class Group(Base):
     __tablename__ = "groups"
+    __table_args__ = (
+        Index("ix_groups_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     name: Mapped[str] = mapped_column(String(20), unique=True)
     department: Mapped[str] = mapped_column(String(15), nullable=True)
     level: Mapped[str] = mapped_column(String(40), nullable=True)
     course: Mapped[int] = mapped_column(Integer(), nullable=True)
+    # Меняется при каждом изменении расписания группы, из неё строится ETag ответов с расписанием
+    schedule_version: Mapped[uuid.UUID] = mapped_column(default=uuid7)
 
-    entries: Mapped[List["Entry"]] = relationship(back_populates="group", lazy="subquery")
+    entries: Mapped[List["Entry"]] = relationship(secondary=entry_groups, back_populates="groups", lazy="subquery")
 
 
 class Entry(Base):
     __tablename__ = "entries"
-    start_datetime: Mapped[datetime] = mapped_column(DateTime())
+    __table_args__ = (
+        # Индексы под keyset-пагинацию по (start_datetime, id) в пределах преподавателя и аудитории
+        Index("ix_entries_teacher_start", "teacher_id", "start_datetime", "id"),
+        Index("ix_entries_classroom_start", "classroom_id", "start_datetime", "id"),
+        # GiST-индексы для поиска пересечений интервалов занятости аудиторий и преподавателей
+        Index("ix_entries_classroom_period", "classroom_id", "period", postgresql_using="gist"),
+        Index("ix_entries_teacher_period", "teacher_id", "period", postgresql_using="gist"),
+        # Одинаковое занятие хранится один раз: хэш служит ключом поиска и проверки изменений при загрузке.
+        # Уникальный индекс секционированной таблицы обязан включать ключ секционирования
+        Index("ix_entries_content_hash", "content_hash", "start_datetime", unique=True),
+        # Секции по месяцам создаются database.partitions перед записью занятий
+        {"postgresql_partition_by": "RANGE (start_datetime)"},
+    )
+    start_datetime: Mapped[datetime] = mapped_column(DateTime(), primary_key=True)
     end_datetime: Mapped[datetime] = mapped_column(DateTime())
+    period: Mapped[Range[datetime]] = mapped_column(
+        TSRANGE(), Computed("tsrange(start_datetime, end_datetime, '[)')", persisted=True)
+    )
 
     subject_id: Mapped[uuid] = mapped_column(ForeignKey("subjects.id"))
     type_id: Mapped[uuid] = mapped_column(ForeignKey("types.id"))
-    group_id: Mapped[Optional[uuid]] = mapped_column(ForeignKey("groups.id"))
     classroom_id: Mapped[Optional[uuid]] = mapped_column(ForeignKey("classrooms.id"), nullable=True)
     teacher_id: Mapped[Optional[uuid]] = mapped_column(ForeignKey("teachers.id"), nullable=True)
+    content_hash: Mapped[uuid.UUID] = mapped_column(default=_default_content_hash)
 
     subject: Mapped["Subject"] = relationship(back_populates="entries", lazy="subquery")
-    group: Mapped["Group"] = relationship(back_populates="entries", lazy="subquery")
+    groups: Mapped[List["Group"]] = relationship(secondary=entry_groups, back_populates="entries", lazy="subquery")
     classroom: Mapped["Classroom"] = relationship(back_populates="entries", lazy="subquery")
     teacher: Mapped["Teacher"] = relationship(back_populates="entries", lazy="subquery")
     type: Mapped["Type"] = relationship(back_populates="entries", lazy="subquery")
+
+
+# Занятия прошедших семестров переносятся в архив, чтобы не раздувать индексы таблицы entries.
+# Связи архивного занятия с группами хранятся так же, как у текущих
+archived_entry_groups = Table(
+    "entry_groups_archive",
+    Base.metadata,
+    Column("entry_id", ForeignKey("entries_archive.id", ondelete="CASCADE"), primary_key=True),
+    Column("group_id", ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True),
+    Column("entry_start", DateTime(), nullable=False),
+    Index("ix_entry_groups_archive_group_entry", "group_id", "entry_start", "entry_id"),
+)
+
+
+class ArchivedEntry(Base):
+    __tablename__ = "entries_archive"
+    __table_args__ = (
+        Index("ix_entries_archive_semester_start", "semester", "start_datetime", "id"),
+        Index("ix_entries_archive_teacher_start", "teacher_id", "start_datetime", "id"),
+        Index("ix_entries_archive_classroom_start", "classroom_id", "start_datetime", "id"),
+        # Как и в entries, одно занятие хранится один раз, даже если прошедшая неделя была загружена заново
+        # и получила новые UUID
+        Index("ix_entries_archive_content_hash", "content_hash", "start_datetime", unique=True),
+    )
+    semester: Mapped[str] = mapped_column(String(7))
+    start_datetime: Mapped[datetime] = mapped_column(DateTime())
+    end_datetime: Mapped[datetime] = mapped_column(DateTime())
+    subject_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("subjects.id"))
+    type_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("types.id"))
+    classroom_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("classrooms.id"), nullable=True)
+    teacher_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("teachers.id"), nullable=True)
+    content_hash: Mapped[uuid.UUID] = mapped_column()
+
+
+# btree_gist нужен для GiST-индексов, совмещающих UUID и интервал, pg_trgm — для триграммного поиска по названиям
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+class StudyWeek(Base):
+    __tablename__ = "study_weeks"
+    __table_args__ = (
+        UniqueConstraint("semester", "number"),
+    )
+    number: Mapped[int] = mapped_column(Integer())
+    start_date: Mapped[date] = mapped_column(Date(), index=True)
+    end_date: Mapped[date] = mapped_column(Date())
+    semester: Mapped[str] = mapped_column(String(7))
+
+
+class ScheduleSnapshot(Base):
+    __tablename__ = "schedule_snapshots"
+    __table_args__ = (
+        UniqueConstraint("group_id", "semester", "week_number"),
+    )
+    group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"))
+    semester: Mapped[str] = mapped_column(String(7))
+    week_number: Mapped[int] = mapped_column(Integer())
+    version: Mapped[int] = mapped_column(Integer(), default=1)
+    built_at: Mapped[datetime] = mapped_column(DateTime(), default=datetime.now)
+    payload: Mapped[dict] = mapped_column(JSONB())
+
+
+class ScheduleChange(Base):
+    __tablename__ = "schedule_changes"
+    __table_args__ = (
+        Index("ix_schedule_changes_group_day", "group_id", "day"),
+    )
+    # ID — UUIDv7, поэтому порядок ID совпадает с порядком записи изменений и служит курсором ленты
+    group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"))
+    day: Mapped[date] = mapped_column(Date())
+    old_version: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    new_version: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(), default=datetime.now)
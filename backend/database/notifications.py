@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+import json
+from collections import namedtuple
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from config import notification_config
+
+CacheInvalidation = namedtuple("CacheInvalidation", ["entity", "key", "version"])
+InvalidationHandler = Callable[[CacheInvalidation], Optional[Awaitable[None]]]
+
+# Полезная нагрузка NOTIFY ограничена 8000 байтами, остаток оставлен под служебные символы
+MAX_PAYLOAD_SIZE = 7900
+
+_handlers: Dict[str, List[InvalidationHandler]] = {}
+
+
+def encode_payloads(invalidations: Iterable[CacheInvalidation]) -> List[str]:
+    """
+    Упаковывает инвалидации в JSON-массивы [[entity, key, version], ...], каждый не длиннее MAX_PAYLOAD_SIZE байт.
+
+    :param invalidations: Инвалидации.
+    :returns: Список полезных нагрузок NOTIFY.
+    """
+    payloads, batch, batch_size = [], [], 2
+    for invalidation in invalidations:
+        item = json.dumps([invalidation.entity, _text(invalidation.key), _text(invalidation.version)],
+                          ensure_ascii=False, separators=(",", ":"))
+        item_size = len(item.encode()) + 1
+        if batch and batch_size + item_size > MAX_PAYLOAD_SIZE:
+            payloads.append(f"[{','.join(batch)}]")
+            batch, batch_size = [], 2
+        batch.append(item)
+        batch_size += item_size
+    if batch:
+        payloads.append(f"[{','.join(batch)}]")
+    return payloads
+
+
+def decode_payload(payload: str) -> List[CacheInvalidation]:
+    """
+    Распаковывает полезную нагрузку, полученную от encode_payloads.
+
+    :param payload: Полезная нагрузка NOTIFY.
+    :raises ValueError: Если полезная нагрузка повреждена.
+    :returns: Список CacheInvalidation.
+    """
+    try:
+        return [CacheInvalidation(entity, key, version) for entity, key, version in json.loads(payload)]
+    except (TypeError, ValueError) as exception:
+        raise ValueError(f"Некорректное уведомление об инвалидации: {payload[:200]}") from exception
+
+
+def _text(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+async def notify(session: AsyncSession, invalidations: Iterable[CacheInvalidation]):
+    """
+    Отправляет уведомления об инвалидации в транзакции сессии.
+
+    PostgreSQL доставляет уведомления только после фиксации транзакции, а при откате отбрасывает их,
+    поэтому процессы не узнают об изменениях, которых нет в базе данных.
+
+    :param session: Сессия БД, в транзакции которой записаны изменения.
+    :param invalidations: Инвалидации.
+    """
+    if not notification_config.enabled:
+        return
+    for payload in encode_payloads(invalidations):
+        await session.execute(select(func.pg_notify(notification_config.channel, payload)))
+
+
+def register_handler(entity: str, handler: InvalidationHandler):
+    """
+    Регистрирует обработчик инвалидаций сущности. Обработчик может быть корутиной.
+
+    :param entity: Сущность, например имя таблицы.
+    :param handler: Функция, принимающая CacheInvalidation.
+    """
+    _handlers.setdefault(entity, []).append(handler)
+
+
+def dispatch(invalidation: CacheInvalidation) -> List[Awaitable[None]]:
+    """
+    Вызывает обработчики сущности инвалидации. Пустой key означает, что устарели все записи сущности.
+
+    :param invalidation: Инвалидация.
+    :returns: Корутины асинхронных обработчиков, которые нужно дождаться.
+    """
+    pending = []
+    for handler in _handlers.get(invalidation.entity, []):
+        result = handler(invalidation)
+        if inspect.isawaitable(result):
+            pending.append(result)
+    return pending
+
+
+class InvalidationListener:
+    def __init__(self, engine: AsyncEngine, channel: Optional[str] = None, reconnect_delay: Optional[float] = None):
+        """
+        Слушатель уведомлений об инвалидации в процессе API.
+
+        Держит отдельное соединение с LISTEN на канал. После потери соединения уведомления за время
+        переподключения теряются, поэтому при переподключении все зарегистрированные сущности
+        инвалидируются целиком.
+
+        :param engine: Асинхронный движок SQLAlchemy.
+        :param channel: (Необязательно) Канал уведомлений, по умолчанию из конфигурации.
+        :param reconnect_delay: (Необязательно) Пауза перед переподключением в секундах.
+        """
+        self._engine = engine
+        self._channel = channel or notification_config.channel
+        self._reconnect_delay = reconnect_delay if reconnect_delay is not None \
+            else notification_config.reconnect_delay
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        self.received = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="invalidation-listener")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        connected_before = False
+        while True:
+            try:
+                async with self._engine.connect() as connection:
+                    raw_connection = await connection.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+                    closed = asyncio.Event()
+                    driver_connection.add_termination_listener(lambda _: closed.set())
+                    await driver_connection.add_listener(self._channel, self._on_notification)
+                    try:
+                        if connected_before:
+                            self._handle([CacheInvalidation(entity, None, None) for entity in list(_handlers)])
+                        connected_before = True
+                        logger.info(f"Подписка на уведомления об инвалидации кэшей: {self._channel}")
+                        await closed.wait()
+                    finally:
+                        # Соединение возвращается в пул, поэтому подписка снимается явно
+                        if not driver_connection.is_closed():
+                            await driver_connection.remove_listener(self._channel, self._on_notification)
+                logger.warning("Соединение слушателя уведомлений об инвалидации закрыто")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logger.error(f"Ошибка слушателя уведомлений об инвалидации: {exception}")
+            await asyncio.sleep(self._reconnect_delay)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            invalidations = decode_payload(payload)
+        except ValueError as exception:
+            logger.warning(str(exception))
+            return
+        self.received += len(invalidations)
+        self._handle(invalidations)
+
+    def _handle(self, invalidations: List[CacheInvalidation]):
+        for invalidation in invalidations:
+            for awaitable in dispatch(invalidation):
+                task = asyncio.ensure_future(awaitable)
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
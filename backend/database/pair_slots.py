@@ -0,0 +1,107 @@
+from collections import namedtuple
+from datetime import date, datetime, time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+PairSlot = namedtuple("PairSlot", ["number", "start", "end"])
+
+# Расписание пар МАИ: (начало, конец)
+PAIR_SLOTS: List[Tuple[time, time]] = [
+    (time(9, 0), time(10, 30)),
+    (time(10, 45), time(12, 15)),
+    (time(13, 0), time(14, 30)),
+    (time(14, 45), time(16, 15)),
+    (time(16, 30), time(18, 0)),
+    (time(18, 15), time(19, 45)),
+    (time(19, 55), time(21, 25)),
+    (time(21, 35), time(23, 5)),
+]
+
+
+class PairSlots:
+    def __init__(self, slots: Iterable[Tuple[time, time]] = PAIR_SLOTS):
+        """
+        Таблица пар в памяти процесса: номер пары (с 1) ↔ время начала и окончания.
+
+        Занятие в стандартное время кодируется парой (дата, номер пары), полное время восстанавливается
+        по таблице. Занятия в нестандартное время номера пары не имеют.
+
+        :param slots: Границы пар по порядку.
+        """
+        self._slots = [PairSlot(number, start, end) for number, (start, end) in enumerate(slots, start=1)]
+        self._by_times: Dict[Tuple[time, time], int] = {(slot.start, slot.end): slot.number for slot in self._slots}
+        self._by_start_text: Dict[str, PairSlot] = {f"{slot.start:%H:%M:%S}": slot for slot in self._slots}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self) -> Iterator[PairSlot]:
+        return iter(self._slots)
+
+    def get(self, number: int) -> PairSlot:
+        """
+        Возвращает пару по номеру.
+
+        :param number: Номер пары, начиная с 1.
+        :raises ValueError: Если пары с таким номером нет.
+        :returns: PairSlot.
+        """
+        if not 1 <= number <= len(self._slots):
+            raise ValueError(f"Номер пары должен быть от 1 до {len(self._slots)}: {number}")
+        return self._slots[number - 1]
+
+    def number_of(self, start: Union[datetime, time], end: Union[datetime, time]) -> Optional[int]:
+        """
+        Возвращает номер пары, если занятие идёт ровно в её время.
+
+        :param start: Время начала.
+        :param end: Время окончания.
+        :returns: Номер пары или None для занятия в нестандартное время.
+        """
+        if isinstance(start, datetime):
+            if isinstance(end, datetime) and end.date() != start.date():
+                return None
+            start = start.time()
+        if isinstance(end, datetime):
+            end = end.time()
+        return self._by_times.get((start, end))
+
+    def encode(self, start: datetime, end: datetime) -> Tuple[date, Optional[int]]:
+        """
+        Кодирует время занятия парой (дата, номер пары).
+
+        :param start: Начало занятия.
+        :param end: Окончание занятия.
+        :returns: Кортеж (дата, номер пары или None для нестандартного времени).
+        """
+        return start.date(), self.number_of(start, end)
+
+    def bounds(self, day: date, number: int) -> Tuple[datetime, datetime]:
+        """
+        Восстанавливает начало и окончание занятия по дате и номеру пары.
+
+        :param day: Дата.
+        :param number: Номер пары, начиная с 1.
+        :raises ValueError: Если пары с таким номером нет.
+        :returns: Кортеж (начало, окончание).
+        """
+        slot = self.get(number)
+        return datetime.combine(day, slot.start), datetime.combine(day, slot.end)
+
+    def parse(self, day: date, start_text: str, end_text: str) -> Tuple[datetime, datetime]:
+        """
+        Возвращает начало и окончание занятия по строкам времени из расписания ("09:00:00").
+
+        Для стандартных пар строки сопоставляются с таблицей без разбора формата.
+
+        :param day: Дата.
+        :param start_text: Время начала.
+        :param end_text: Время окончания.
+        :returns: Кортеж (начало, окончание).
+        """
+        slot = self._by_start_text.get(start_text)
+        if slot is not None and end_text == f"{slot.end:%H:%M:%S}":
+            return datetime.combine(day, slot.start), datetime.combine(day, slot.end)
+        return datetime.combine(day, time.fromisoformat(start_text)), datetime.combine(day, time.fromisoformat(end_text))
+
+
+pair_slots = PairSlots()
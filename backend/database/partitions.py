@@ -0,0 +1,142 @@
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple, Union
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import schedule_config
+
+# Таблицы, секционированные по месяцам. Связи идут первыми: секция занятий не отсоединяется,
+# пока на неё ссылаются строки entry_groups
+PARTITIONED_TABLES: Tuple[str, ...] = ("entry_groups", "entries")
+
+
+def month_start(day: Union[date, datetime]) -> date:
+    return date(day.year, day.month, 1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def months_between(start: Union[date, datetime], end: Union[date, datetime]) -> List[date]:
+    """
+    Возвращает первые дни месяцев, пересекающихся с периодом [start, end).
+
+    :param start: Начало периода включительно.
+    :param end: Конец периода не включительно.
+    :returns: Список дат по возрастанию.
+    """
+    if not isinstance(end, datetime):
+        end = datetime.combine(end, datetime.min.time())
+    months = []
+    month = month_start(start)
+    while datetime.combine(month, datetime.min.time()) < end:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Возвращает имя месячной секции таблицы, например entries_y2024m09.
+
+    :param table: Имя секционированной таблицы.
+    :param month: Первый день месяца.
+    :returns: Имя секции.
+    """
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+class PartitionManager:
+    def __init__(self, session: AsyncSession):
+        """
+        Управление месячными секциями таблиц entries и entry_groups.
+
+        :param session: Сессия БД.
+        """
+        self._session = session
+
+    async def months(self) -> List[date]:
+        """
+        Возвращает месяцы, для которых созданы секции таблицы entries.
+
+        :returns: Список первых дней месяцев по возрастанию.
+        """
+        result = await self._session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'entries'"
+        ))
+        months = []
+        for name in result.scalars().all():
+            try:
+                months.append(datetime.strptime(name.removeprefix("entries_"), "y%Ym%m").date())
+            except ValueError:
+                continue
+        return sorted(months)
+
+    async def ensure(self, months: Iterable[date]) -> List[date]:
+        """
+        Создаёт недостающие секции всех секционированных таблиц для указанных месяцев.
+
+        Вызывается перед записью занятий, поэтому вставка никогда не попадает в месяц без секции.
+        Существующие секции проверяются одним запросом к каталогу.
+
+        :param months: Первые дни месяцев.
+        :returns: Список месяцев, секции которых были созданы.
+        """
+        missing = sorted(set(months) - set(await self.months()))
+        for month in missing:
+            for table in reversed(PARTITIONED_TABLES):
+                await self._session.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month)}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+                ))
+        if missing:
+            logger.info(f"Созданы секции расписания: {', '.join(f'{month:%Y-%m}' for month in missing)}")
+        return missing
+
+    async def ensure_range(self, start: Union[date, datetime], end: Union[date, datetime]) -> List[date]:
+        """
+        Создаёт недостающие секции для месяцев периода [start, end).
+
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :returns: Список месяцев, секции которых были созданы.
+        """
+        return await self.ensure(months_between(start, end))
+
+    async def ensure_upcoming(self, months_ahead: Optional[int] = None) -> List[date]:
+        """
+        Создаёт секции текущего месяца и следующих за ним, чтобы запись расписания на них
+        не создавала секции посреди загрузки.
+
+        :param months_ahead: (Необязательно) Количество месяцев вперёд, по умолчанию из конфигурации.
+        :returns: Список месяцев, секции которых были созданы.
+        """
+        if months_ahead is None:
+            months_ahead = schedule_config.partitions_ahead_months
+        months = [month_start(datetime.now())]
+        for _ in range(months_ahead):
+            months.append(next_month(months[-1]))
+        return await self.ensure(months)
+
+    async def detach(self, month: date) -> bool:
+        """
+        Отсоединяет и удаляет секции месяца. В отличие от DELETE, не оставляет мёртвых строк
+        и не требует очистки таблицы.
+
+        :param month: Первый день месяца.
+        :returns: True, если секции месяца существовали.
+        """
+        if month not in await self.months():
+            return False
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, month)
+            await self._session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            await self._session.execute(text(f'DROP TABLE "{name}"'))
+        logger.info(f"Удалены секции расписания за {month:%Y-%m}")
+        return True
@@ -1,2 +1,4 @@
 from .schedule import (SubjectRepository, TeacherRepository, TypeRepository,
-                       GroupRepository, ClassroomRepository, EntryRepository)
+                       GroupRepository, ClassroomRepository, EntryRepository, EntryRow, EntryConflict,
+                       StudyWeekRepository, ScheduleSnapshotRepository, SearchRepository,
+                       SearchMatch, ScheduleChangeRepository, ScheduleChangeRow, ArchiveRepository)
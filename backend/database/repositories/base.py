@@ -1,19 +1,32 @@
-from typing import Generic, Optional, List, TypeVar, Dict, Any, AsyncGenerator
+from typing import Generic, Optional, List, TypeVar, Dict, Any, AsyncGenerator, AsyncIterator, Iterable, Callable
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select, ColumnExpressionArgument, inspect, and_
+from sqlalchemy import select, ColumnExpressionArgument, inspect, and_, bindparam, Executable
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from config import schedule_config
 from database.models.base import Base
+from database.notifications import CacheInvalidation, notify
+from database.repositories.cache import LookupCache, get_lookup_cache
+from database.repositories.statements import cached_statement
 
 Model = TypeVar("Model", bound=Base)
 
 
 class BaseRepository(Generic[Model]):
+    # Уникальное поле, по которому объекты ищутся по названию. Для таких репозиториев соответствия
+    # «название → UUID» кэшируются в общем для процесса LookupCache.
+    _lookup_field: Optional[str] = None
+
     def __init__(self, session: AsyncSession, model: type[Model]):
         self._session = session
         self._model = model
+        self._lookup_cache: Optional[LookupCache] = (
+            get_lookup_cache(model.__tablename__) if self._lookup_field else None
+        )
 
     async def create(self, **data) -> Model:
         """
@@ -52,8 +65,8 @@ class BaseRepository(Generic[Model]):
         :param uuid: UUID экземпляра.
         :returns: Экземпляр модели или None.
         """
-        query = select(self._model).where(self._model.id == uuid)
-        result = await self._session.execute(query)
+        query = self._statement("get_by_id", lambda: select(self._model).where(self._model.id == bindparam("uuid")))
+        result = await self._session.execute(query, {"uuid": uuid})
         return result.scalar_one_or_none()
 
     async def get_by_filters(self, **filters) -> Optional[Model]:
@@ -78,6 +91,23 @@ class BaseRepository(Generic[Model]):
         result = await self._session.execute(query)
         return list(result.scalars().all())
 
+    async def stream_all(self, fetch_size: Optional[int] = None) -> AsyncIterator[Model]:
+        """
+        Возвращает все экземпляры модели асинхронным итератором, читая их через серверный курсор порциями.
+
+        В отличие от get_all, в памяти одновременно находится не больше fetch_size объектов. Связи при этом
+        не загружаются: обращение к ним вызывает исключение.
+
+        :param fetch_size: (Необязательно) Размер порции, по умолчанию из конфигурации.
+        :returns: Асинхронный итератор экземпляров модели.
+        """
+        query = (select(self._model)
+                 .options(raiseload("*"))
+                 .execution_options(yield_per=fetch_size or schedule_config.stream_fetch_size))
+        result = await self._session.stream_scalars(query)
+        async for instance in result:
+            yield instance
+
     async def get_or_create(self, **data) -> Model:
         """
         Возвращает экземпляр модели по заданным параметрам, если он существует, иначе создаёт новый.
@@ -118,6 +148,8 @@ class BaseRepository(Generic[Model]):
 
         Аргументы, переданные со значением `Ellipsis`, будут проигнорированы, и соответствующие
         поля останутся неизменными в базе данных.
+        Если ни одно поле не меняется, запись в базу данных не выполняется: UPDATE без изменений всё равно
+        создаёт новую версию строки и запись в WAL.
 
         :param uuid: UUID экземпляра.
         :param data: Данные для обновления, где ключи - имена полей модели, а значения - новые значения.
@@ -127,14 +159,33 @@ class BaseRepository(Generic[Model]):
         data = {key: parameter for key, parameter in data.items() if parameter is not Ellipsis}
         instance = await self.get_by_id(uuid)
         if instance:
-            for key, value in data.items():
-                setattr(instance, key, value)
+            changes = self._changed_values(instance, data)
+            if not changes:
+                return instance
+            # Нарушение ограничения откатывает только точку сохранения, транзакция вызывающего не теряется
+            async with self._session.begin_nested() as nested:
+                for key, value in changes.items():
+                    setattr(instance, key, value)
+                await self._notify_changed(instance)
+                await nested.commit()
             await self._session.commit()
             await self._session.refresh(instance)
+            if self._lookup_cache is not None:
+                self._lookup_cache.invalidate_id(uuid)
         else:
             logger.warning(f"Объект {self._model.__name__} для обновления не найден")
         return instance
 
+    async def _notify_changed(self, instance: Model):
+        # Кэши справочников других процессов узнают об изменении после фиксации транзакции.
+        # Вызывается до удаления объекта, поэтому наследники ещё видят его связи
+        if self._lookup_cache is not None:
+            await notify(self._session, [CacheInvalidation(self._model.__tablename__, instance.id, None)])
+
+    def _changed_values(self, instance: Model, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Значения, совпадающие с текущими, не присваиваются, чтобы не помечать объект изменённым
+        return {key: value for key, value in data.items() if getattr(instance, key) != value}
+
     async def delete(self, uuid: UUID) -> bool:
         """
         Удаляет экземпляр модели по UUID.
@@ -144,13 +195,110 @@ class BaseRepository(Generic[Model]):
         """
         instance = await self.get_by_id(uuid)
         if instance:
+            await self._notify_changed(instance)
             await self._session.delete(instance)
             await self._session.commit()
+            if self._lookup_cache is not None:
+                self._lookup_cache.invalidate_id(uuid)
             return True
         return False
 
+    async def get_by_lookup(self, value: str) -> Optional[Model]:
+        """
+        Возвращает экземпляр модели по значению поля поиска, используя кэш UUID.
+
+        При попадании в кэш объект берётся из identity map сессии или загружается по первичному ключу.
+
+        :param value: Значение поля поиска.
+        :returns: Экземпляр модели или None.
+        """
+        lookup_column = self._get_lookup_column()
+        uuid = self._lookup_cache.get(value)
+        if uuid is not None:
+            instance = await self._session.get(self._model, uuid)
+            if instance is not None and getattr(instance, self._lookup_field) == value:
+                return instance
+            self._lookup_cache.invalidate(value)
+
+        query = self._statement("get_by_lookup", lambda: select(self._model).where(lookup_column == bindparam("value")))
+        result = await self._session.execute(query, {"value": value})
+        instance = result.scalar_one_or_none()
+        if instance is not None:
+            self._lookup_cache.set(value, instance.id)
+        return instance
+
+    async def resolve_id(self, value: str) -> Optional[UUID]:
+        """
+        Возвращает UUID объекта по значению поля поиска без загрузки самого объекта.
+
+        :param value: Значение поля поиска.
+        :returns: UUID или None, если объект не найден.
+        """
+        return (await self.resolve_ids([value])).get(value)
+
+    async def resolve_ids(self, values: Iterable[Optional[str]], create_missing: bool = False) -> Dict[str, UUID]:
+        """
+        Возвращает UUID объектов по значениям поля поиска за один запрос для всех отсутствующих в кэше значений.
+
+        :param values: Значения поля поиска, None и повторы игнорируются.
+        :param create_missing: Если True, ненайденные объекты создаются одним INSERT.
+        :returns: Словарь значение → UUID для найденных (и созданных) объектов.
+        """
+        lookup_column = self._get_lookup_column()
+        unique_values = list(dict.fromkeys(value for value in values if value is not None))
+        resolved = self._lookup_cache.get_many(unique_values)
+        missing = [value for value in unique_values if value not in resolved]
+
+        if missing:
+            query = self._statement("resolve_ids", lambda: select(lookup_column, self._model.id)
+                                    .where(lookup_column.in_(bindparam("values", expanding=True))))
+            result = await self._session.execute(query, {"values": missing})
+            fetched = {value: uuid for value, uuid in result.all()}
+
+            not_found = [value for value in missing if value not in fetched]
+            if create_missing and not_found:
+                statement = (
+                    insert(self._model)
+                    .values([{self._lookup_field: value} for value in not_found])
+                    .on_conflict_do_nothing(index_elements=[lookup_column])
+                    .returning(lookup_column, self._model.id)
+                )
+                result = await self._session.execute(statement)
+                fetched.update({value: uuid for value, uuid in result.all()})
+
+                # Строки, вставленные параллельно другим процессом, не возвращаются через RETURNING
+                still_missing = [value for value in not_found if value not in fetched]
+                if still_missing:
+                    result = await self._session.execute(query, {"values": still_missing})
+                    fetched.update({value: uuid for value, uuid in result.all()})
+
+            self._lookup_cache.set_many(fetched)
+            resolved.update(fetched)
+
+        return resolved
+
+    async def get_or_create_id(self, value: str) -> UUID:
+        """
+        Возвращает UUID объекта по значению поля поиска, создавая объект при его отсутствии.
+
+        :param value: Значение поля поиска.
+        :returns: UUID объекта.
+        """
+        return (await self.resolve_ids([value], create_missing=True))[value]
+
+    def _statement(self, name: str, build: Callable[[], Executable]) -> Executable:
+        # Запросы, которые выполняются тысячи раз за загрузку, строятся один раз для модели
+        return cached_statement((self._model, name), build)
+
+    def _get_lookup_column(self):
+        if self._lookup_field is None:
+            raise TypeError(f"Репозиторий {type(self).__name__} не поддерживает поиск по названию")
+        return getattr(self._model, self._lookup_field)
+
 
 class NamedBaseRepository(Generic[Model], BaseRepository[Model]):
+    _lookup_field = "name"
+
     def __init__(self, session: AsyncSession, model: type[Model]):
         """
         Repository for models with a name field.
@@ -171,6 +319,4 @@ class NamedBaseRepository(Generic[Model], BaseRepository[Model]):
         :param name: Name of the model.
         :returns: Model with the given name or None if not found.
         """
-        query = select(self._model).where(self._model.name == name)
-        result = await self._session.execute(query)
-        return result.scalar_one_or_none()
+        return await self.get_by_lookup(name)
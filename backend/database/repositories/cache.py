@@ -0,0 +1,230 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from config import cache_config
+from database.notifications import register_handler
+
+
+class LookupCache:
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Ограниченный LRU-кэш соответствий «ключ → UUID» с временем жизни записей.
+
+        :param max_size: Максимальное количество записей, при превышении вытесняются самые старые по использованию.
+        :param ttl: Время жизни записи в секундах.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, Tuple[UUID, float]] = OrderedDict()
+        self._keys_by_id: Dict[UUID, Set[Hashable]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[UUID]:
+        """
+        Возвращает UUID по ключу, если запись есть в кэше и не устарела.
+
+        :param key: Ключ записи.
+        :returns: UUID или None.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            uuid, expires_at = cached
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return uuid
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, UUID]:
+        """
+        Возвращает найденные в кэше UUID для нескольких ключей.
+
+        :param keys: Ключи записей.
+        :returns: Словарь ключ → UUID только для найденных ключей.
+        """
+        found = {}
+        for key in keys:
+            uuid = self.get(key)
+            if uuid is not None:
+                found[key] = uuid
+        return found
+
+    def set(self, key: Hashable, uuid: UUID):
+        """
+        Сохраняет UUID по ключу.
+
+        :param key: Ключ записи.
+        :param uuid: UUID объекта в базе данных.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (uuid, time.monotonic() + self._ttl)
+            self._keys_by_id.setdefault(uuid, set()).add(key)
+            while len(self._entries) > self._max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def set_many(self, mapping: Dict[Hashable, UUID]):
+        """
+        Сохраняет несколько соответствий ключ → UUID.
+
+        :param mapping: Словарь ключ → UUID.
+        """
+        for key, uuid in mapping.items():
+            self.set(key, uuid)
+
+    def invalidate(self, key: Hashable):
+        """
+        Удаляет запись по ключу.
+
+        :param key: Ключ записи.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_id(self, uuid: UUID):
+        """
+        Удаляет все записи, указывающие на объект с данным UUID.
+
+        :param uuid: UUID объекта.
+        """
+        with self._lock:
+            for key in list(self._keys_by_id.get(uuid, ())):
+                self._remove(key)
+
+    def clear(self):
+        """
+        Полностью очищает кэш, счётчики при этом сохраняются.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает метрики кэша.
+
+        :returns: Словарь с количеством попаданий, промахов, вытеснений, размером и долей попаданий.
+        """
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+        }
+
+    def _remove(self, key: Hashable):
+        uuid, _ = self._entries.pop(key)
+        keys = self._keys_by_id.get(uuid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[uuid]
+
+
+_lookup_caches: Dict[str, LookupCache] = {}
+
+
+def get_lookup_cache(name: str) -> LookupCache:
+    """
+    Возвращает общий для всех репозиториев процесса кэш по имени таблицы, создавая его при необходимости.
+
+    :param name: Имя таблицы.
+    :returns: Экземпляр LookupCache.
+    """
+    if name not in _lookup_caches:
+        _lookup_caches[name] = LookupCache(cache_config.lookup_max_size, cache_config.lookup_ttl)
+        # Изменения справочника в других процессах приходят уведомлениями с именем таблицы
+        register_handler(name, lambda invalidation: invalidate_lookup_cache(name, invalidation.key))
+    return _lookup_caches[name]
+
+
+def clear_lookup_caches():
+    """
+    Очищает все кэши справочников. Вызывается автоматически, если транзакция, изменявшая данные,
+    откатилась или закончилась без фиксации.
+    """
+    for cache in _lookup_caches.values():
+        cache.clear()
+
+
+# Ключ Session.info: транзакция изменяла данные, и UUID, закэшированные за время её работы,
+# могут указывать на ещё не зафиксированные строки
+_UNCOMMITTED_WRITES = "lookup_cache_uncommitted_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _remember_flush(session: Session, flush_context):
+    session.info[_UNCOMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _remember_statement(orm_execute_state: ORMExecuteState):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_UNCOMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_writes(session: Session):
+    # Освобождение точки сохранения ещё ничего не фиксирует
+    if not session.in_nested_transaction():
+        session.info.pop(_UNCOMMITTED_WRITES, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_after_rollback(session: Session, previous_transaction: SessionTransaction):
+    # Откат точки сохранения тоже удаляет вставленные в ней строки
+    if session.info.get(_UNCOMMITTED_WRITES):
+        clear_lookup_caches()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_after_uncommitted_end(session: Session, transaction: SessionTransaction):
+    # Сессия закрыта без фиксации, например парсер упал внутри async with session_factory()
+    if transaction.parent is None and session.info.pop(_UNCOMMITTED_WRITES, False):
+        clear_lookup_caches()
+
+
+def invalidate_lookup_cache(name: str, uuid: Optional[Union[UUID, str]] = None):
+    """
+    Удаляет из кэша справочника записи, указывающие на объект, или очищает кэш целиком.
+
+    :param name: Имя таблицы.
+    :param uuid: (Необязательно) UUID объекта, по умолчанию очищается весь кэш.
+    """
+    cache = _lookup_caches[name]
+    if uuid is None:
+        cache.clear()
+    else:
+        cache.invalidate_id(UUID(str(uuid)))
+
+
+def lookup_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Возвращает метрики всех кэшей справочников.
+
+    :returns: Словарь имя таблицы → метрики кэша.
+    """
+    return {name: cache.stats() for name, cache in _lookup_caches.items()}
@@ -3,4 +3,9 @@ from .group import GroupRepository
 from .classroom import ClassroomRepository
 from .teacher import TeacherRepository
 from .type import TypeRepository
-from .entry import EntryRepository
+from .entry import EntryRepository, EntryRow, EntryConflict
+from .week import StudyWeekRepository
+from .snapshot import ScheduleSnapshotRepository
+from .search import SearchRepository, SearchMatch
+from .change import ScheduleChangeRepository, ScheduleChangeRow
+from .archive import ArchiveRepository
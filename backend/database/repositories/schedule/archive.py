@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Optional, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import ArchivedEntry, Entry, entry_groups, archived_entry_groups
+from database.notifications import CacheInvalidation, notify
+from database.partitions import PartitionManager, months_between
+from database.repositories.base import BaseRepository
+from database.study_calendar import semester_bounds, semester_of
+
+from . import GroupRepository
+from .entry import EntryRepository, EntryRow
+
+ARCHIVED_FIELDS = ("id", "start_datetime", "end_datetime", "subject_id", "type_id", "classroom_id", "teacher_id",
+                   "content_hash")
+
+
+class ArchiveRepository(BaseRepository[ArchivedEntry]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ArchivedEntry)
+
+    async def archive_semester(self, semester: str) -> int:
+        """
+        Переносит занятия семестра вместе со связями с группами из entries в архив.
+
+        Строки копируются запросами INSERT ... SELECT в транзакции сессии. Занятия сопоставляются с архивом
+        по хэшу содержимого и времени начала, поэтому ни повторный перенос семестра, ни перенос заново
+        загруженной прошедшей недели с новыми UUID не создают дубликатов. Границы семестров совпадают с границами
+        месяцев, поэтому перенесённые строки удаляются отсоединением месячных секций целиком, без DELETE
+        и последующей очистки таблицы.
+
+        :param semester: Обозначение семестра.
+        :returns: Количество перенесённых занятий.
+        """
+        start, end = semester_bounds(semester)
+        in_semester = (Entry.start_datetime >= start) & (Entry.start_datetime < end)
+
+        result = await self._session.execute(select(func.count()).select_from(Entry).where(in_semester))
+        archived = result.scalar_one()
+        await self._session.execute(
+            insert(ArchivedEntry)
+            .from_select(["semester", *ARCHIVED_FIELDS],
+                         select(literal(semester), *[getattr(Entry, field) for field in ARCHIVED_FIELDS])
+                         .where(in_semester))
+            .on_conflict_do_nothing(index_elements=[ArchivedEntry.content_hash, ArchivedEntry.start_datetime])
+        )
+        # Занятие, уже лежащее в архиве под другим UUID, находится по хэшу содержимого,
+        # и связи с группами переносятся к архивной записи
+        await self._session.execute(
+            insert(archived_entry_groups)
+            .from_select(["entry_id", "entry_start", "group_id"],
+                         select(ArchivedEntry.id, entry_groups.c.entry_start, entry_groups.c.group_id)
+                         .join(Entry, (Entry.id == entry_groups.c.entry_id)
+                               & (Entry.start_datetime == entry_groups.c.entry_start))
+                         .join(ArchivedEntry, (ArchivedEntry.content_hash == Entry.content_hash)
+                               & (ArchivedEntry.start_datetime == Entry.start_datetime))
+                         .where(in_semester)
+                         .where(entry_groups.c.entry_start >= start)
+                         .where(entry_groups.c.entry_start < end))
+            .on_conflict_do_nothing()
+        )
+
+        partitions = PartitionManager(self._session)
+        for month in months_between(start, end):
+            await partitions.detach(month)
+        # Строки вне секций семестра (если границы не совпали с месяцами) удаляются обычным образом
+        await self._session.execute(delete(Entry).where(in_semester))
+        if archived:
+            await GroupRepository(self._session).touch_schedule()
+            await notify(self._session, [CacheInvalidation("schedule", None, None)])
+        return archived
+
+    async def archivable_semesters(self, horizon: datetime) -> List[str]:
+        """
+        Возвращает семестры с занятиями в entries, закончившиеся не позже указанного момента.
+
+        :param horizon: Момент, раньше которого занятия считаются устаревшими.
+        :returns: Список обозначений семестров по возрастанию.
+        """
+        cutoff, _ = semester_bounds(semester_of(horizon))
+        result = await self._session.execute(
+            select(func.min(Entry.start_datetime)).where(Entry.start_datetime < cutoff)
+        )
+        first_start = result.scalar_one_or_none()
+        semesters = []
+        semester = semester_of(first_start) if first_start is not None else None
+        while semester is not None and semester_bounds(semester)[1] <= cutoff:
+            semesters.append(semester)
+            semester = semester_of(semester_bounds(semester)[1])
+        return semesters
+
+    async def archived_semesters(self) -> List[str]:
+        """
+        Возвращает семестры, занятия которых есть в архиве.
+
+        :returns: Список обозначений семестров по возрастанию.
+        """
+        result = await self._session.execute(
+            select(ArchivedEntry.semester).distinct().order_by(ArchivedEntry.semester)
+        )
+        return list(result.scalars().all())
+
+    async def get_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        group_id: Optional[UUID] = None, teacher_id: Optional[UUID] = None,
+                        classroom_id: Optional[UUID] = None, after: Optional[Tuple[datetime, UUID]] = None,
+                        limit: Optional[int] = None) -> List[EntryRow]:
+        """
+        Возвращает архивные записи за период, параметры и результат такие же, как у EntryRepository.get_range.
+
+        :param start: (Необязательно) Начало периода включительно.
+        :param end: (Необязательно) Конец периода не включительно.
+        :param group_id: (Необязательно) ID группы.
+        :param teacher_id: (Необязательно) ID преподавателя.
+        :param classroom_id: (Необязательно) ID аудитории.
+        :param after: (Необязательно) Пара (start_datetime, id) последней записи предыдущей страницы.
+        :param limit: (Необязательно) Максимальное количество записей.
+        :returns: Список EntryRow.
+        """
+        query, query_parameters = EntryRepository.range_query(start, end, group_id, teacher_id, classroom_id, after,
+                                                              limit, entry_model=ArchivedEntry,
+                                                              links=archived_entry_groups)
+        result = await self._session.execute(query, query_parameters)
+        return [EntryRow(*row) for row in result.all()]
@@ -0,0 +1,107 @@
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Optional, List, Dict
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, cast, literal_column, Date, String, Uuid
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import ScheduleChange, Entry, Group, entry_groups
+from database.models.base import uuid7
+from database.repositories.base import BaseRepository
+
+ScheduleChangeRow = namedtuple("ScheduleChangeRow", ["id", "group", "day", "old_version", "new_version",
+                                                     "created_at"])
+
+
+class ScheduleChangeRepository(BaseRepository[ScheduleChange]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ScheduleChange)
+
+    async def day_versions(self, group_id: UUID, start: datetime, end: datetime) -> Dict[date, UUID]:
+        """
+        Возвращает версии расписания группы по дням периода.
+
+        Версия дня — MD5 от отсортированных хэшей содержимого его занятий, поэтому она меняется
+        только при изменении расписания дня и не зависит от порядка записи занятий.
+
+        :param group_id: ID группы.
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :returns: Словарь день → версия, дни без занятий отсутствуют.
+        """
+        day = cast(Entry.start_datetime, Date)
+        content_hash = cast(Entry.content_hash, String)
+        version = cast(func.md5(func.string_agg(content_hash, aggregate_order_by(literal_column("','"), content_hash))),
+                       Uuid)
+        query = (select(day, version)
+                 .join(entry_groups, (entry_groups.c.entry_id == Entry.id)
+                       & (entry_groups.c.entry_start == Entry.start_datetime))
+                 .where(entry_groups.c.group_id == group_id)
+                 .where(entry_groups.c.entry_start >= start)
+                 .where(entry_groups.c.entry_start < end)
+                 .where(Entry.start_datetime >= start)
+                 .where(Entry.start_datetime < end)
+                 .group_by(day))
+        result = await self._session.execute(query)
+        return {day: version for day, version in result.all()}
+
+    async def record(self, group_id: UUID, old_versions: Dict[date, UUID],
+                     new_versions: Dict[date, UUID]) -> List[date]:
+        """
+        Записывает в ленту изменений дни, версии которых различаются.
+
+        Вызывается в той же транзакции, что и запись расписания, поэтому изменение попадает в ленту
+        тогда и только тогда, когда зафиксировано само расписание.
+
+        :param group_id: ID группы.
+        :param old_versions: Версии дней до изменения, результат day_versions.
+        :param new_versions: Версии дней после изменения, результат day_versions.
+        :returns: Список изменившихся дней по возрастанию.
+        """
+        changed_days = sorted(day for day in old_versions.keys() | new_versions.keys()
+                              if old_versions.get(day) != new_versions.get(day))
+        if changed_days:
+            # ID генерируются здесь, а не в базе данных, чтобы изменения одной группы шли в порядке дней
+            await self._session.execute(insert(ScheduleChange).values([
+                {"id": uuid7(), "group_id": group_id, "day": day, "old_version": old_versions.get(day),
+                 "new_version": new_versions.get(day), "created_at": datetime.now()}
+                for day in changed_days
+            ]))
+        return changed_days
+
+    async def get_after(self, after: Optional[UUID] = None, limit: Optional[int] = None,
+                        group_id: Optional[UUID] = None) -> List[ScheduleChangeRow]:
+        """
+        Возвращает изменения, записанные после указанного, в порядке записи.
+
+        Потребитель хранит ID последнего обработанного изменения и передаёт его в следующем запросе.
+
+        :param after: (Необязательно) ID последнего обработанного изменения, по умолчанию с начала ленты.
+        :param limit: (Необязательно) Максимальное количество изменений.
+        :param group_id: (Необязательно) ID группы.
+        :returns: Список ScheduleChangeRow.
+        """
+        query = (select(ScheduleChange.id, Group.name, ScheduleChange.day, ScheduleChange.old_version,
+                        ScheduleChange.new_version, ScheduleChange.created_at)
+                 .join(Group, ScheduleChange.group_id == Group.id)
+                 .order_by(ScheduleChange.id))
+        if after is not None:
+            query = query.where(ScheduleChange.id > after)
+        if group_id is not None:
+            query = query.where(ScheduleChange.group_id == group_id)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self._session.execute(query)
+        return [ScheduleChangeRow(*row) for row in result.all()]
+
+    async def delete_before(self, moment: datetime) -> int:
+        """
+        Удаляет изменения, записанные раньше указанного момента.
+
+        :param moment: Граница хранения ленты.
+        :returns: Количество удалённых изменений.
+        """
+        result = await self._session.execute(delete(ScheduleChange).where(ScheduleChange.created_at < moment))
+        return result.rowcount
@@ -3,14 +3,21 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Classroom
+from database.models import Classroom, Entry
 from database.repositories.base import NamedBaseRepository
 
+from .group import GroupRepository
+
 
 class ClassroomRepository(NamedBaseRepository[Classroom]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Classroom)
 
+    async def _notify_changed(self, classroom: Classroom):
+        # Название аудитории выводится в расписании групп, занимающихся в ней
+        await super()._notify_changed(classroom)
+        await GroupRepository(self._session).touch_schedule_of_entries(Entry.classroom_id == classroom.id)
+
     async def create(self, name: str) -> Classroom:
         """
         Создаёт новый объект аудитории.
@@ -1,16 +1,42 @@
+from collections import namedtuple
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Iterable
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (select, tuple_, delete, Select, Table, func, literal, literal_column, or_, and_, bindparam,
+                        DateTime, Integer, Uuid, exc)
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Entry
+from config import schedule_config
+from database.models import Entry, Subject, Type, Group, Classroom, Teacher, entry_groups, entry_content_hash
+from database.models.base import uuid7
+from database.partitions import PartitionManager, month_start
 from database.repositories.base import BaseRepository
+from database.repositories.statements import cached_statement
+from database.study_calendar import study_calendar
 
 from . import SubjectRepository, TypeRepository, ClassroomRepository, TeacherRepository, GroupRepository
 
 
+EntryRow = namedtuple("EntryRow", ["id", "start_datetime", "end_datetime", "subject", "type", "group",
+                                   "classroom", "teacher"])
+# Поля, совпадение которых означает одно и то же занятие (например, потоковую лекцию нескольких групп).
+# Порядок совпадает с аргументами entry_content_hash
+EVENT_FIELDS = ("start_datetime", "end_datetime", "subject_id", "type_id", "classroom_id", "teacher_id")
+
+EntryConflict = namedtuple("EntryConflict", ["entry_id", "conflicting_entry_id", "start_datetime", "resource",
+                                             "group", "conflicting_group"])
+
+
+def _duplicates_event(exception: exc.IntegrityError) -> bool:
+    # Месячные секции получают собственные копии ix_entries_content_hash с именами
+    # вида entries_y2024m09_content_hash_start_datetime_idx, и PostgreSQL сообщает имя копии
+    constraint = getattr(exception.orig.__cause__, "constraint_name", None) or ""
+    return constraint == "ix_entries_content_hash" or constraint.endswith("_content_hash_start_datetime_idx")
+
+
 class EntryRepository(BaseRepository[Entry]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Entry)
@@ -18,7 +44,7 @@ class EntryRepository(BaseRepository[Entry]):
     async def create(self, start_datetime: datetime, end_datetime: datetime, subject_id: int, type_id: int,
                      group_id: int, classroom_id: Optional[int] = None, teacher_id: Optional[int] = None) -> Entry:
         """
-        Создаёт новую запись.
+        Создаёт новую запись для группы. Если такое же занятие уже есть у другой группы, группа добавляется к нему.
 
         :param start_datetime: Время начала.
         :param end_datetime: Время окончания.
@@ -29,17 +55,19 @@ class EntryRepository(BaseRepository[Entry]):
         :param teacher_id: (Необязательно) ID преподавателя.
         :returns: Экземпляр Entry.
         """
-        unique_selector_query = (select(Entry).where(self._model.start_datetime == start_datetime)
-                                 .where(self._model.group_id == group_id))
+        unique_selector_query = (select(entry_groups.c.entry_id)
+                                 .where(entry_groups.c.entry_start == start_datetime)
+                                 .where(entry_groups.c.group_id == group_id))
         unique_selector_result = await self._session.execute(unique_selector_query)
-        if unique_selector_result.scalars().all():
+        if unique_selector_result.first() is not None:
             group = await GroupRepository(self._session).get_by_id(group_id)
             raise ValueError(f"Запись с параметрами (группа: {group.name}, дата: {start_datetime}) уже существует")
 
-        return await super().create(
-            start_datetime=start_datetime, end_datetime=end_datetime, subject_id=subject_id, type_id=type_id,
-            classroom_id=classroom_id, teacher_id=teacher_id, group_id=group_id
-        )
+        entries = await self.create_all([{
+            "start_datetime": start_datetime, "end_datetime": end_datetime, "subject_id": subject_id,
+            "type_id": type_id, "classroom_id": classroom_id, "teacher_id": teacher_id, "group_id": group_id
+        }])
+        return entries[0]
 
     async def create_all(self, parameters: List[Dict[str, Any]]) -> List[Entry]:
         """
@@ -53,10 +81,74 @@ class EntryRepository(BaseRepository[Entry]):
             - **teacher_id** (*int*): ID преподавателя.
             - **group_id** (*int*): ID группы.
 
+        Одинаковые занятия разных групп сохраняются одной записью, связанной со всеми группами.
+
         :param parameters: Список словарей с параметрами для каждого создаваемого объекта
-        :returns: Список созданных объектов Entry.
+        :returns: Список объектов Entry в порядке параметров, у потоковых занятий объекты совпадают.
         """
-        return await super().create_all(parameters)
+        entry_ids = await self._resolve_events(parameters)
+        await self._insert_links(self._links(entry_ids, parameters))
+        query = (select(Entry)
+                 .where(Entry.id.in_(set(entry_ids)))
+                 .where(Entry.start_datetime.in_({entry_data["start_datetime"] for entry_data in parameters}))
+                 .execution_options(populate_existing=True))
+        result = await self._session.execute(query)
+        entries = {entry.id: entry for entry in result.scalars().all()}
+        return [entries[entry_id] for entry_id in entry_ids]
+
+    async def _resolve_events(self, parameters: List[Dict[str, Any]]) -> List[UUID]:
+        # Занятие ищется по хэшу содержимого: существующие находятся одним запросом по уникальному индексу,
+        # новые создаются одним INSERT, уже сохранённые занятия не перезаписываются.
+        # Условие по времени начала отсекает секции месяцев, в которые занятия не попадают
+        hashes = [entry_content_hash(*(entry_data.get(field) for field in EVENT_FIELDS)) for entry_data in parameters]
+        if not hashes:
+            return []
+        starts = list({entry_data["start_datetime"] for entry_data in parameters})
+        query = self._statement("resolve_events", lambda: select(Entry.content_hash, Entry.id)
+                                .where(Entry.content_hash.in_(bindparam("hashes", expanding=True)))
+                                .where(Entry.start_datetime.in_(bindparam("starts", expanding=True))))
+        result = await self._session.execute(query, {"hashes": list(set(hashes)), "starts": starts})
+        resolved = {content_hash: entry_id for content_hash, entry_id in result.all()}
+
+        new_events = {}
+        for content_hash, entry_data in zip(hashes, parameters):
+            if content_hash not in resolved and content_hash not in new_events:
+                new_events[content_hash] = {"id": uuid7(), "content_hash": content_hash,
+                                            **{field: entry_data.get(field) for field in EVENT_FIELDS}}
+        if new_events:
+            # Строка, для месяца которой нет секции, не может быть вставлена в секционированную таблицу
+            await PartitionManager(self._session).ensure(
+                {month_start(event["start_datetime"]) for event in new_events.values()}
+            )
+            statement = (insert(Entry)
+                         .values(list(new_events.values()))
+                         .on_conflict_do_nothing(index_elements=[Entry.content_hash, Entry.start_datetime])
+                         .returning(Entry.content_hash, Entry.id))
+            result = await self._session.execute(statement)
+            resolved.update({content_hash: entry_id for content_hash, entry_id in result.all()})
+
+            # Занятия, вставленные параллельно другим процессом, не возвращаются через RETURNING
+            still_missing = [content_hash for content_hash in new_events if content_hash not in resolved]
+            if still_missing:
+                result = await self._session.execute(query, {"hashes": still_missing, "starts": starts})
+                resolved.update({content_hash: entry_id for content_hash, entry_id in result.all()})
+        return [resolved[content_hash] for content_hash in hashes]
+
+    @staticmethod
+    def _links(entry_ids: List[UUID], parameters: List[Dict[str, Any]]) -> List[Tuple[UUID, datetime, UUID]]:
+        # Время начала входит в хэш содержимого, поэтому у найденного занятия оно совпадает с параметрами
+        return list(dict.fromkeys((entry_id, entry_data["start_datetime"], entry_data["group_id"])
+                                  for entry_id, entry_data in zip(entry_ids, parameters)
+                                  if entry_data.get("group_id") is not None))
+
+    async def _insert_links(self, links: List[Tuple[UUID, datetime, UUID]]):
+        if links:
+            await self._session.execute(
+                insert(entry_groups)
+                .values([{"entry_id": entry_id, "entry_start": entry_start, "group_id": group_id}
+                         for entry_id, entry_start, group_id in links])
+                .on_conflict_do_nothing()
+            )
 
     async def create_with_relations(self, start_datetime: datetime, end_datetime: datetime,
                                     subject_name: str, type_short_name: str, group_name: str,
@@ -73,38 +165,14 @@ class EntryRepository(BaseRepository[Entry]):
         :param group_name: Название группы.
         :returns: Экземпляр Entry.
         """
-        subject = await SubjectRepository(self._session).get_by_name(subject_name)
-        if not subject:
-            subject = await SubjectRepository(self._session).create(subject_name)
-
-        entry_type = await TypeRepository(self._session).get_by_short_name(type_short_name)
-        if not entry_type:
-            entry_type = await TypeRepository(self._session).create(type_short_name)
+        subject_id = await SubjectRepository(self._session).get_or_create_id(subject_name)
+        type_id = await TypeRepository(self._session).get_or_create_id(type_short_name)
+        classroom_id = await ClassroomRepository(self._session).get_or_create_id(classroom) if classroom else None
+        teacher_id = (await TeacherRepository(self._session).get_or_create_id(teacher_full_name)
+                      if teacher_full_name else None)
+        group_id = await GroupRepository(self._session).get_or_create_id(group_name)
 
-        if classroom:
-            database_classroom = await ClassroomRepository(self._session).get_by_name(classroom)
-            if not database_classroom:
-                database_classroom = await ClassroomRepository(self._session).create(classroom)
-            database_classroom_id = database_classroom.id
-        else:
-            database_classroom_id = None
-
-        if teacher_full_name:
-            database_teacher = await TeacherRepository(self._session).get_by_full_name(teacher_full_name)
-            if not database_teacher:
-                database_teacher = await TeacherRepository(self._session).create(teacher_full_name)
-            database_teacher_id = database_teacher.id
-        else:
-            database_teacher_id = None
-
-        group = await GroupRepository(self._session).get_by_name(group_name)
-        if not group:
-            group = await GroupRepository(self._session).create(group_name)
-
-        await self._session.flush()
-
-        return await self.create(start_datetime, end_datetime, subject.id,
-                                 entry_type.id, group.id, database_classroom_id, database_teacher_id)
+        return await self.create(start_datetime, end_datetime, subject_id, type_id, group_id, classroom_id, teacher_id)
 
     async def create_all_relations(self, subject_names: List[str], type_short_names: List[str],
                                    classroom_names: List[str], teacher_full_names: List[str],
@@ -128,36 +196,21 @@ class EntryRepository(BaseRepository[Entry]):
         :returns: Словарь с ключом имени отношения и списком ID объектов в базе данных в том же порядке,
         что и были переданы.
         """
-        subjects = await SubjectRepository(self._session).get_or_create_all(
-            [{"name": subject_name} for subject_name in subject_names]
-        )
-        subject_ids = [subject.id for subject in subjects if subject]
-
-        types = await TypeRepository(self._session).get_or_create_all(
-            [{"short_name": type_short_name} for type_short_name in type_short_names]
-        )
-        type_ids = [entry_type.id for entry_type in types if type]
-
-        classroom_ids = []
-        for classroom_name in classroom_names:
-            if classroom_name:
-                classroom = await ClassroomRepository(self._session).get_or_create(name=classroom_name)
-                classroom_ids.append(classroom.id if classroom else None)
-            else:
-                classroom_ids.append(None)
-
-        teacher_ids = []
-        for teacher_full_name in teacher_full_names:
-            if teacher_full_name:
-                teacher = await TeacherRepository(self._session).get_or_create(full_name=teacher_full_name)
-                teacher_ids.append(teacher.id if teacher else None)
-            else:
-                teacher_ids.append(None)
-
-        groups = await GroupRepository(self._session).get_or_create_all(
-            [{"name": group_name} for group_name in group_names]
-        )
-        group_ids = [group.id for group in groups if group]
+        # Каждый справочник разрешается одним запросом (и одним INSERT для новых значений),
+        # уже известные значения берутся из общего кэша
+        subjects = await SubjectRepository(self._session).resolve_ids(subject_names, create_missing=True)
+        types = await TypeRepository(self._session).resolve_ids(type_short_names, create_missing=True)
+        classrooms = await ClassroomRepository(self._session).resolve_ids(classroom_names, create_missing=True)
+        teachers = await TeacherRepository(self._session).resolve_ids(teacher_full_names, create_missing=True)
+        groups = await GroupRepository(self._session).resolve_ids(group_names, create_missing=True)
+
+        subject_ids = [subjects[subject_name] for subject_name in subject_names]
+        type_ids = [types[type_short_name] for type_short_name in type_short_names]
+        classroom_ids = [classrooms.get(classroom_name) if classroom_name else None
+                         for classroom_name in classroom_names]
+        teacher_ids = [teachers.get(teacher_full_name) if teacher_full_name else None
+                       for teacher_full_name in teacher_full_names]
+        group_ids = [groups[group_name] for group_name in group_names]
 
         return {
             "subject_ids": subject_ids,
@@ -209,6 +262,9 @@ class EntryRepository(BaseRepository[Entry]):
 
         :returns: Список созданных объектов Entry.
         """
+        return await self.create_all(await self._resolve_relations(parameters))
+
+    async def _resolve_relations(self, parameters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         relation_parameters = await self.parse_relations(parameters)
         relations = await self.create_all_relations(**relation_parameters)
 
@@ -224,15 +280,18 @@ class EntryRepository(BaseRepository[Entry]):
                 relations["classroom_ids"], relations["teacher_ids"], relations["group_ids"]
             )
         ]
-
-        return await self.create_all(entry_parameters)
+        return entry_parameters
 
     async def update(self, uuid: UUID, start_datetime: Optional[datetime] = ..., end_datetime: Optional[datetime] = ...,
                      subject_id: Optional[int] = ..., type_id: Optional[int] = ...,
-                     classroom_id: Optional[int] = ..., teacher_id: Optional[int] = ..., group_id: Optional[int] = ...):
+                     classroom_id: Optional[int] = ..., teacher_id: Optional[int] = ...):
         """
         Обновляет запись по ID.
 
+        Время начала входит в первичный ключ секционированной таблицы, поэтому при его изменении запись
+        вставляется заново с тем же ID (в секцию нового месяца, которая создаётся при необходимости)
+        вместе со связями с группами, а старая строка удаляется.
+
         :param uuid: ID записи для обновления.
         :param start_datetime: (Необязательно) Новое время начала.
         :param end_datetime: (Необязательно) Новое время окончания.
@@ -240,14 +299,79 @@ class EntryRepository(BaseRepository[Entry]):
         :param type_id: (Необязательно) Новый ID типа занятия.
         :param classroom_id: (Необязательно) Новый ID аудитории.
         :param teacher_id: (Необязательно) Новый ID преподавателя.
-        :param group_id: (Необязательно) Новый ID группы.
+        :raises ValueError: Если после изменения запись совпадает с уже существующим занятием.
         :returns: Обновлённый объект Entry.
         """
-        return await super().update(
-            uuid, start_datetime=start_datetime, end_datetime=end_datetime,
-            subject_id=subject_id, type_id=type_id, classroom_id=classroom_id,
-            teacher_id=teacher_id, group_id=group_id
+        data = {"start_datetime": start_datetime, "end_datetime": end_datetime, "subject_id": subject_id,
+                "type_id": type_id, "classroom_id": classroom_id, "teacher_id": teacher_id}
+        try:
+            if start_datetime is not Ellipsis:
+                entry = await self.get_by_id(uuid)
+                if entry is not None and entry.start_datetime != start_datetime:
+                    return await self._move(entry, {key: value for key, value in data.items() if value is not Ellipsis})
+            return await super().update(uuid, **data)
+        except exc.IntegrityError as exception:
+            # Остальные нарушения, например ссылка на несуществующий предмет, к совпадению занятий не относятся
+            if not _duplicates_event(exception):
+                raise
+            entry = await self.get_by_id(uuid)
+            groups = ", ".join(group.name for group in entry.groups)
+            start = entry.start_datetime if start_datetime is Ellipsis else start_datetime
+            raise ValueError(f"Запись с параметрами (группа: {groups}, дата: {start}) уже существует") from exception
+
+    async def _move(self, entry: Entry, data: Dict[str, Any]) -> Entry:
+        # Время начала входит в первичный ключ и в ключ секционирования, а связи entry_groups ссылаются на него.
+        # Поэтому занятие вставляется заново с тем же ID (при необходимости в новую месячную секцию),
+        # связи переносятся к новой строке, а старая строка удаляется вместе со своими связями
+        old_start = entry.start_datetime
+        values = {field: data.get(field, getattr(entry, field)) for field in EVENT_FIELDS}
+        result = await self._session.execute(
+            select(entry_groups.c.group_id)
+            .where(entry_groups.c.entry_id == entry.id)
+            .where(entry_groups.c.entry_start == old_start)
         )
+        group_ids = list(result.scalars().all())
+
+        await PartitionManager(self._session).ensure([month_start(values["start_datetime"])])
+        async with self._session.begin_nested():
+            await self._session.execute(insert(Entry).values(id=entry.id, content_hash=entry_content_hash(**values),
+                                                             **values))
+            await self._insert_links([(entry.id, values["start_datetime"], group_id) for group_id in group_ids])
+            await GroupRepository(self._session).touch_schedule_of_entries(Entry.id == entry.id)
+            await self._session.execute(delete(Entry).where(Entry.id == entry.id)
+                                        .where(Entry.start_datetime == old_start))
+        self._session.expunge(entry)
+        await self._session.commit()
+        return await self.get_by_id(entry.id)
+
+    async def _notify_changed(self, entry: Entry):
+        # Изменённое или удаляемое занятие меняет расписание всех групп, с которыми оно связано
+        await GroupRepository(self._session).touch_schedule_of_entries(
+            Entry.id == entry.id, Entry.start_datetime == entry.start_datetime
+        )
+
+    def _changed_values(self, instance: Entry, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Запись меняется, только если изменился хэш содержимого, и тогда хэш обновляется вместе с полями
+        values = {field: data.get(field, getattr(instance, field)) for field in EVENT_FIELDS}
+        content_hash = entry_content_hash(**values)
+        if content_hash == instance.content_hash:
+            return {}
+        return {**super()._changed_values(instance, data), "content_hash": content_hash}
+
+    async def get_by_group_id(self, group_id: UUID) -> List[Entry]:
+        """
+        Возвращает все записи группы.
+
+        :param group_id: ID группы.
+        :returns: Список объектов Entry в порядке start_datetime.
+        """
+        query = (select(Entry)
+                 .join(entry_groups, (entry_groups.c.entry_id == Entry.id)
+                       & (entry_groups.c.entry_start == Entry.start_datetime))
+                 .where(entry_groups.c.group_id == group_id)
+                 .order_by(Entry.start_datetime, Entry.id))
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
 
     # TODO: Добавить фильтры по которым можно получить записи
 
@@ -255,7 +379,7 @@ class EntryRepository(BaseRepository[Entry]):
                             classroom_id: Optional[int] = None, teacher_id: Optional[int] = None,
                             group_id: int = None) -> Entry:
         """
-        Возвращает экземпляр записи по начальной дате, если она существует, иначе создаёт новую.
+        Возвращает экземпляр записи группы по начальной дате, если она существует, иначе создаёт новую.
 
         :param start_datetime: Время начала.
         :param end_datetime: Время окончания.
@@ -266,10 +390,17 @@ class EntryRepository(BaseRepository[Entry]):
         :param group_id: ID группы.
         :returns: Экземпляр Entry.
         """
-        return await super().get_or_create(
-            start_datetime=start_datetime, end_datetime=end_datetime, subject_id=subject_id, type_id=type_id,
-            classroom_id=classroom_id, teacher_id=teacher_id, group_id=group_id
-        )
+        query = (select(Entry)
+                 .join(entry_groups, (entry_groups.c.entry_id == Entry.id)
+                       & (entry_groups.c.entry_start == Entry.start_datetime))
+                 .where(Entry.start_datetime == start_datetime)
+                 .where(entry_groups.c.entry_start == start_datetime)
+                 .where(entry_groups.c.group_id == group_id))
+        result = await self._session.execute(query)
+        entry = result.scalars().first()
+        if entry is not None:
+            return entry
+        return await self.create(start_datetime, end_datetime, subject_id, type_id, group_id, classroom_id, teacher_id)
 
     async def get_or_create_all(self, parameters: List[Dict[str, Any]]) -> List[Entry]:
         """
@@ -287,14 +418,341 @@ class EntryRepository(BaseRepository[Entry]):
 
         :returns: Список экземпляров Entry.
         """
-        return await super().get_or_create_all(parameters)
+        return [await self.get_or_create(**entry_data) for entry_data in parameters]
+
+    async def get_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        group_id: Optional[UUID] = None, teacher_id: Optional[UUID] = None,
+                        classroom_id: Optional[UUID] = None, after: Optional[Tuple[datetime, UUID]] = None,
+                        limit: Optional[int] = None) -> List[EntryRow]:
+        """
+        Возвращает записи за период в виде лёгких кортежей без загрузки ORM-объектов.
+
+        Записи упорядочены по (start_datetime, id), следующая страница запрашивается через параметр after
+        (keyset-пагинация), поэтому стоимость запроса не зависит от номера страницы.
+        С фильтром по группе поле group содержит её название, иначе — названия всех групп занятия через запятую,
+        так что потоковое занятие в расписании преподавателя или аудитории встречается один раз.
+
+        :param start: (Необязательно) Начало периода включительно.
+        :param end: (Необязательно) Конец периода не включительно.
+        :param group_id: (Необязательно) ID группы.
+        :param teacher_id: (Необязательно) ID преподавателя.
+        :param classroom_id: (Необязательно) ID аудитории.
+        :param after: (Необязательно) Пара (start_datetime, id) последней записи предыдущей страницы.
+        :param limit: (Необязательно) Максимальное количество записей.
+        :returns: Список EntryRow.
+        """
+        query, query_parameters = self.range_query(start, end, group_id, teacher_id, classroom_id, after, limit)
+        result = await self._session.execute(query, query_parameters)
+        return [EntryRow(*row) for row in result.all()]
 
-    async def get_by_week(self, study_week_number: int) -> List[Entry]:
+    async def get_range_by_groups(self, start: datetime, end: datetime,
+                                  group_ids: Iterable[UUID]) -> Dict[str, List[EntryRow]]:
+        """
+        Возвращает записи нескольких групп за период одним запросом.
+
+        Потоковое занятие нескольких групп попадает в записи каждой из них, поле group содержит название группы.
+
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :param group_ids: ID групп.
+        :returns: Словарь название группы → список EntryRow в порядке start_datetime. Группы без занятий
+            в словарь не попадают.
+        """
+        group_ids = list(group_ids)
+        if not group_ids:
+            return {}
+        query, query_parameters = self.range_query(start, end, None, None, None, group_ids=group_ids)
+        result = await self._session.execute(query, query_parameters)
+        rows_by_group: Dict[str, List[EntryRow]] = {}
+        for row in result.all():
+            entry = EntryRow(*row)
+            rows_by_group.setdefault(entry.group, []).append(entry)
+        return rows_by_group
+
+    async def stream_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                           group_id: Optional[UUID] = None, teacher_id: Optional[UUID] = None,
+                           classroom_id: Optional[UUID] = None, fetch_size: Optional[int] = None,
+                           per_group: bool = False) -> AsyncIterator[EntryRow]:
+        """
+        Возвращает записи за период асинхронным итератором, читая их через серверный курсор порциями.
+
+        Фильтры и порядок записей такие же, как в get_range, но в памяти одновременно находится
+        не больше fetch_size строк.
+
+        :param start: (Необязательно) Начало периода включительно.
+        :param end: (Необязательно) Конец периода не включительно.
+        :param group_id: (Необязательно) ID группы.
+        :param teacher_id: (Необязательно) ID преподавателя.
+        :param classroom_id: (Необязательно) ID аудитории.
+        :param fetch_size: (Необязательно) Размер порции, по умолчанию из конфигурации.
+        :param per_group: (Необязательно) Возвращать потоковое занятие отдельной строкой для каждой группы.
+        :returns: Асинхронный итератор EntryRow.
+        """
+        query, query_parameters = self.range_query(start, end, group_id, teacher_id, classroom_id,
+                                                    per_group=per_group)
+        result = await self._session.stream(
+            query, query_parameters, execution_options={"yield_per": fetch_size or schedule_config.stream_fetch_size}
+        )
+        async for row in result:
+            yield EntryRow(*row)
+
+    @staticmethod
+    def range_query(start: Optional[datetime], end: Optional[datetime], group_id: Optional[UUID],
+                    teacher_id: Optional[UUID], classroom_id: Optional[UUID],
+                    after: Optional[Tuple[datetime, UUID]] = None, limit: Optional[int] = None,
+                    per_group: bool = False, entry_model: type = Entry, links: Table = entry_groups,
+                    group_ids: Optional[List[UUID]] = None) -> Tuple[Select, Dict[str, Any]]:
+        """
+        Возвращает запрос записей за период, общий для текущих занятий и архива, и параметры его выполнения.
+
+        Запрос строится один раз для каждого набора фильтров, значения передаются параметрами выполнения.
+        Фильтры и столбцы результата такие же, как в get_range.
+
+        :param start: Начало периода включительно или None.
+        :param end: Конец периода не включительно или None.
+        :param group_id: ID группы или None.
+        :param teacher_id: ID преподавателя или None.
+        :param classroom_id: ID аудитории или None.
+        :param after: (Необязательно) Пара (start_datetime, id) последней записи предыдущей страницы.
+        :param limit: (Необязательно) Максимальное количество записей.
+        :param per_group: (Необязательно) Возвращать потоковое занятие отдельной строкой для каждой группы.
+        :param entry_model: (Необязательно) Модель занятий, Entry или ArchivedEntry.
+        :param links: (Необязательно) Таблица связей занятий модели с группами.
+        :param group_ids: (Необязательно) ID нескольких групп.
+        :returns: Пара (запрос, словарь параметров выполнения).
+        """
+        parameters = {"start": start, "end": end, "group_id": group_id, "group_ids": group_ids,
+                      "teacher_id": teacher_id, "classroom_id": classroom_id, "limit": limit}
+        if after is not None:
+            parameters["after_start"], parameters["after_id"] = after
+        parameters = {name: value for name, value in parameters.items() if value is not None}
+        filters = frozenset(parameters)
+        query = cached_statement(
+            ("range", entry_model, links, filters, per_group),
+            lambda: EntryRepository._build_range_query(filters, per_group, entry_model, links)
+        )
+        return query, parameters
+
+    @staticmethod
+    def _build_range_query(filters: frozenset, per_group: bool, entry_model: type, links: Table) -> Select:
+        # Запрос строится и для таблицы entries, и для архива прошедших семестров с теми же столбцами.
+        # Связи соединяются и по времени начала, а условия периода повторяются для entry_groups,
+        # чтобы планировщик отсекал лишние месячные секции обеих таблиц
+        link_condition = (links.c.entry_id == entry_model.id) & (links.c.entry_start == entry_model.start_datetime)
+        by_group = "group_id" in filters or "group_ids" in filters
+        if by_group or per_group:
+            group_name = Group.name
+        else:
+            group_name = (
+                select(func.string_agg(Group.name, aggregate_order_by(literal_column("', '"), Group.name)))
+                .join(links, links.c.group_id == Group.id)
+                .where(link_condition)
+                .scalar_subquery()
+            )
+        query = (
+            select(entry_model.id, entry_model.start_datetime, entry_model.end_datetime, Subject.name, Type.short_name,
+                   group_name, Classroom.name, Teacher.full_name)
+            .join(Subject, entry_model.subject_id == Subject.id)
+            .join(Type, entry_model.type_id == Type.id)
+            .outerjoin(Classroom, entry_model.classroom_id == Classroom.id)
+            .outerjoin(Teacher, entry_model.teacher_id == Teacher.id)
+            .order_by(entry_model.start_datetime, entry_model.id)
+        )
+        if "start" in filters:
+            query = query.where(entry_model.start_datetime >= bindparam("start"))
+        if "end" in filters:
+            query = query.where(entry_model.start_datetime < bindparam("end"))
+        if by_group or per_group:
+            query = (query
+                     .join(links, link_condition)
+                     .join(Group, links.c.group_id == Group.id))
+            if "start" in filters:
+                query = query.where(links.c.entry_start >= bindparam("start"))
+            if "end" in filters:
+                query = query.where(links.c.entry_start < bindparam("end"))
+        if "group_id" in filters:
+            query = query.where(links.c.group_id == bindparam("group_id"))
+        if "group_ids" in filters:
+            query = query.where(links.c.group_id.in_(bindparam("group_ids", expanding=True)))
+        if "teacher_id" in filters:
+            query = query.where(entry_model.teacher_id == bindparam("teacher_id"))
+        if "classroom_id" in filters:
+            query = query.where(entry_model.classroom_id == bindparam("classroom_id"))
+        if "after_start" in filters:
+            after = tuple_(bindparam("after_start", type_=DateTime()), bindparam("after_id", type_=Uuid()))
+            query = query.where(tuple_(entry_model.start_datetime, entry_model.id) > after)
+        if "limit" in filters:
+            query = query.limit(bindparam("limit", type_=Integer))
+        return query
+
+    async def get_by_week(self, study_week_number: int, group_id: Optional[UUID] = None,
+                          teacher_id: Optional[UUID] = None, classroom_id: Optional[UUID] = None,
+                          after: Optional[Tuple[datetime, UUID]] = None, limit: Optional[int] = None,
+                          semester: Optional[str] = None) -> List[EntryRow]:
         """
         Возвращает записи по номеру учебной недели.
 
+        Границы недели берутся из учебного календаря в памяти процесса без обращения к базе данных.
+
         :param study_week_number: Номер учебной недели.
-        :returns: Список экземпляров Entry.
+        :param group_id: (Необязательно) ID группы.
+        :param teacher_id: (Необязательно) ID преподавателя.
+        :param classroom_id: (Необязательно) ID аудитории.
+        :param after: (Необязательно) Пара (start_datetime, id) последней записи предыдущей страницы.
+        :param limit: (Необязательно) Максимальное количество записей.
+        :param semester: (Необязательно) Семестр, по умолчанию текущий.
+        :raises ValueError: Если недели нет в учебном календаре.
+        :returns: Список EntryRow.
+        """
+        start, end = self.study_week_bounds(study_week_number, semester)
+        return await self.get_range(start, end, group_id=group_id, teacher_id=teacher_id,
+                                    classroom_id=classroom_id, after=after, limit=limit)
+
+    @staticmethod
+    def study_week_bounds(study_week_number: int, semester: Optional[str] = None) -> Tuple[datetime, datetime]:
         """
-        # TODO: Реализовать метод для получения записей по номеру учебной недели
-        raise NotImplementedError()
+        Возвращает границы учебной недели по учебному календарю.
+
+        :param study_week_number: Номер учебной недели, начиная с 1.
+        :param semester: (Необязательно) Семестр, по умолчанию текущий.
+        :raises ValueError: Если номер недели меньше 1 или недели нет в календаре.
+        :returns: Кортеж (начало недели включительно, конец недели не включительно).
+        """
+        return study_calendar.week_bounds(study_week_number, semester)
+
+    async def replace_range(self, group_id: UUID, start: datetime, end: datetime,
+                            parameters: List[Dict[str, Any]]) -> List[UUID]:
+        """
+        Заменяет записи группы за период новыми записями.
+
+        Занятия ищутся по хэшу содержимого, поэтому неизменившиеся занятия и их связи с группой не перезаписываются:
+        удаляются только связи с занятиями, которых больше нет в расписании группы, и добавляются связи с новыми.
+        Занятия, уже сохранённые для других групп потока, переиспользуются, а занятия, оставшиеся
+        без групп, удаляются.
+
+        :param group_id: ID группы.
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :param parameters: Список словарей с параметрами записей, формат как в create_all_with_relations.
+        :returns: Список ID записей в порядке параметров.
+        """
+        entry_parameters = await self._resolve_relations(parameters)
+        entry_ids = await self._resolve_events(entry_parameters)
+        links = self._links(entry_ids, entry_parameters)
+
+        in_period = (entry_groups.c.entry_start >= start) & (entry_groups.c.entry_start < end)
+        result = await self._session.execute(
+            select(entry_groups.c.entry_id)
+            .where(entry_groups.c.group_id == group_id)
+            .where(in_period)
+        )
+        current = set(result.scalars().all())
+        stale = current - {entry_id for entry_id, _, link_group_id in links if link_group_id == group_id}
+        if stale:
+            await self._session.execute(
+                delete(entry_groups)
+                .where(entry_groups.c.group_id == group_id)
+                .where(in_period)
+                .where(entry_groups.c.entry_id.in_(stale))
+            )
+            await self._session.execute(
+                delete(Entry)
+                .where(Entry.id.in_(stale))
+                .where(Entry.start_datetime >= start)
+                .where(Entry.start_datetime < end)
+                .where(~select(entry_groups.c.entry_id)
+                       .where(entry_groups.c.entry_id == Entry.id)
+                       .where(entry_groups.c.entry_start == Entry.start_datetime)
+                       .exists())
+            )
+        await self._insert_links([(entry_id, entry_start, link_group_id)
+                                  for entry_id, entry_start, link_group_id in links
+                                  if link_group_id != group_id or entry_id not in current])
+        return entry_ids
+
+    @staticmethod
+    def period(start: datetime, end: datetime):
+        """
+        Возвращает SQL-выражение интервала [start, end) того же вида, что и столбец Entry.period.
+
+        :param start: Начало интервала включительно.
+        :param end: Конец интервала не включительно.
+        :returns: SQL-выражение tsrange.
+        """
+        return func.tsrange(start, end, literal("[)"))
+
+    async def get_overlapping(self, start: datetime, end: datetime, teacher_id: Optional[UUID] = None,
+                              classroom_id: Optional[UUID] = None) -> List[EntryRow]:
+        """
+        Возвращает записи, интервал которых пересекается с [start, end).
+
+        В отличие от get_range, в результат попадают и занятия, начавшиеся до start, но ещё не закончившиеся.
+        Запрос с фильтром по преподавателю или аудитории обслуживается GiST-индексом по (ID, period).
+
+        :param start: Начало интервала включительно.
+        :param end: Конец интервала не включительно.
+        :param teacher_id: (Необязательно) ID преподавателя.
+        :param classroom_id: (Необязательно) ID аудитории.
+        :returns: Список EntryRow.
+        """
+        query, query_parameters = self.range_query(None, None, None, teacher_id, classroom_id)
+        query = query.where(Entry.period.overlaps(self.period(start, end)))
+        result = await self._session.execute(query, query_parameters)
+        return [EntryRow(*row) for row in result.all()]
+
+    async def get_free_classrooms(self, start: datetime, end: datetime) -> List[str]:
+        """
+        Возвращает аудитории, в которых нет занятий, пересекающихся с [start, end).
+
+        :param start: Начало интервала включительно.
+        :param end: Конец интервала не включительно.
+        :returns: Список названий аудиторий в алфавитном порядке.
+        """
+        occupied = (select(Entry.id)
+                    .where(Entry.classroom_id == Classroom.id)
+                    .where(Entry.period.overlaps(self.period(start, end))))
+        query = select(Classroom.name).where(~occupied.exists()).order_by(Classroom.name)
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    async def find_conflicts(self, group_id: UUID, start: datetime, end: datetime) -> List[EntryConflict]:
+        """
+        Находит занятия группы за период, которые пересекаются по времени с другими занятиями
+        того же преподавателя или в той же аудитории.
+
+        Потоковое занятие хранится одной записью для всех групп, поэтому конфликтом не считается.
+
+        :param group_id: ID группы.
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :returns: Список EntryConflict, ресурс конфликта — "teacher" или "classroom",
+                  conflicting_group — группы второго занятия через запятую.
+        """
+        other = aliased(Entry)
+        same_teacher = and_(Entry.teacher_id.is_not(None), other.teacher_id == Entry.teacher_id)
+        same_classroom = and_(Entry.classroom_id.is_not(None), other.classroom_id == Entry.classroom_id)
+        other_groups = (
+            select(func.string_agg(Group.name, aggregate_order_by(literal_column("', '"), Group.name)))
+            .join(entry_groups, entry_groups.c.group_id == Group.id)
+            .where(entry_groups.c.entry_id == other.id)
+            .where(entry_groups.c.entry_start == other.start_datetime)
+            .scalar_subquery()
+        )
+        query = (
+            select(Entry.id, other.id, Entry.start_datetime, same_teacher, Group.name, other_groups)
+            .join(entry_groups, (entry_groups.c.entry_id == Entry.id)
+                  & (entry_groups.c.entry_start == Entry.start_datetime))
+            .join(Group, entry_groups.c.group_id == Group.id)
+            .join(other, and_(other.id != Entry.id, other.period.overlaps(Entry.period),
+                              or_(same_teacher, same_classroom)))
+            .where(entry_groups.c.group_id == group_id)
+            .where(entry_groups.c.entry_start >= start)
+            .where(entry_groups.c.entry_start < end)
+            .where(Entry.start_datetime >= start)
+            .where(Entry.start_datetime < end)
+            .order_by(Entry.start_datetime, Entry.id)
+        )
+        result = await self._session.execute(query)
+        return [EntryConflict(entry_id, other_id, start_datetime, "teacher" if by_teacher else "classroom",
+                              group, conflicting_group)
+                for entry_id, other_id, start_datetime, by_teacher, group, conflicting_group in result.all()]
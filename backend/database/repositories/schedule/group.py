@@ -1,10 +1,12 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update, bindparam, inspect, ColumnExpressionArgument
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Group
+from database.models import Group, Entry, entry_groups
+from database.models.base import uuid7
+from database.notifications import CacheInvalidation, notify
 from database.repositories.base import NamedBaseRepository
 
 
@@ -53,6 +55,87 @@ class GroupRepository(NamedBaseRepository[Group]):
         """
         return await super().update(uuid, name=name, department=department, level=level, course=course)
 
+    async def get_schedule_version(self, name: str) -> Optional[Tuple[UUID, UUID]]:
+        """
+        Возвращает ID и версию расписания группы одним запросом по уникальному индексу названия.
+
+        :param name: Название группы.
+        :returns: Кортеж (ID группы, версия расписания) или None, если группа не найдена.
+        """
+        query = self._statement("get_schedule_version", lambda: select(Group.id, Group.schedule_version)
+                                .where(Group.name == bindparam("name")))
+        result = await self._session.execute(query, {"name": name})
+        row = result.first()
+        return tuple(row) if row is not None else None
+
+    async def get_schedule_versions(self, names: Iterable[str]) -> Dict[str, Tuple[UUID, UUID]]:
+        """
+        Возвращает ID и версии расписания нескольких групп одним запросом.
+
+        :param names: Названия групп.
+        :returns: Словарь название → (ID группы, версия расписания) только для найденных групп.
+        """
+        names = list(names)
+        if not names:
+            return {}
+        query = self._statement("get_schedule_versions",
+                                lambda: select(Group.name, Group.id, Group.schedule_version)
+                                .where(Group.name.in_(bindparam("names", expanding=True))))
+        result = await self._session.execute(query, {"names": names})
+        return {name: (group_id, version) for name, group_id, version in result.all()}
+
+    async def touch_schedule(self, group_ids: Optional[Iterable[UUID]] = None):
+        """
+        Меняет версию расписания групп. Вызывается в транзакции, в которой изменено расписание.
+
+        :param group_ids: (Необязательно) ID групп, по умолчанию все группы.
+        """
+        # Одна версия uuid7 на весь UPDATE, как в touch_schedule_of_entries и в значении по умолчанию столбца
+        statement = update(Group).values(schedule_version=uuid7())
+        if group_ids is not None:
+            statement = statement.where(Group.id.in_(list(group_ids)))
+        await self._session.execute(statement)
+
+    async def touch_schedule_of_entries(self, *conditions: ColumnExpressionArgument[bool]) -> List[str]:
+        """
+        Меняет версию расписания групп, у которых есть занятия, удовлетворяющие условиям, и уведомляет
+        процессы API об изменении их расписания. Вызывается в транзакции, в которой изменены занятия
+        или справочники, названия из которых попадают в расписание.
+
+        :param conditions: Условия на столбцы Entry.
+        :returns: Названия затронутых групп.
+        """
+        affected = (select(entry_groups.c.group_id)
+                    .join(Entry, (Entry.id == entry_groups.c.entry_id)
+                          & (Entry.start_datetime == entry_groups.c.entry_start))
+                    .where(*conditions))
+        result = await self._session.execute(
+            update(Group)
+            .where(Group.id.in_(affected))
+            .values(schedule_version=uuid7())
+            .returning(Group.name)
+        )
+        names = list(result.scalars().all())
+        await notify(self._session, [CacheInvalidation("schedule", name, None) for name in names])
+        return names
+
+    async def _notify_changed(self, group: Group):
+        # Название группы входит в её расписание и в ключи закэшированных ответов, поэтому устаревают
+        # и ответы под прежним названием. История атрибута читается до того, как запросы ниже сбросят изменения
+        names = {group.name, *inspect(group).attrs.name.history.deleted}
+        await super()._notify_changed(group)
+        await self.touch_schedule([group.id])
+        await notify(self._session, [CacheInvalidation("schedule", name, None) for name in names])
+
+    async def get_all_names(self) -> List[str]:
+        """
+        Возвращает названия всех групп без загрузки объектов.
+
+        :returns: Список названий групп.
+        """
+        result = await self._session.execute(select(Group.name).order_by(Group.name))
+        return list(result.scalars().all())
+
     async def get_by_filters(self, name: Optional[str], department: Optional[str], level: Optional[str],
                              course: Optional[int]) -> Group:
         """
@@ -0,0 +1,65 @@
+from collections import namedtuple
+from typing import Optional, List, Iterable
+
+from sqlalchemy import select, func, literal, union_all, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import search_config
+from database.models import Group, Teacher, Classroom, Subject
+
+SearchMatch = namedtuple("SearchMatch", ["kind", "id", "name", "similarity"])
+
+SEARCH_COLUMNS = {
+    "group": Group.name,
+    "teacher": Teacher.full_name,
+    "classroom": Classroom.name,
+    "subject": Subject.name,
+}
+
+
+class SearchRepository:
+    def __init__(self, session: AsyncSession):
+        """
+        Нечёткий поиск по названиям групп, преподавателей, аудиторий и предметов.
+
+        :param session: Сессия БД.
+        """
+        self._session = session
+
+    async def search(self, text: str, kinds: Optional[Iterable[str]] = None, limit: Optional[int] = None,
+                     min_similarity: Optional[float] = None) -> List[SearchMatch]:
+        """
+        Возвращает названия, наиболее похожие на строку, по триграммной близости.
+
+        Все справочники опрашиваются одним запросом. Кандидаты отбираются оператором %, который обслуживается
+        GIN-индексами pg_trgm, поэтому порог min_similarity ниже pg_trgm.similarity_threshold (0.3 по умолчанию)
+        не расширяет выборку.
+
+        :param text: Строка поиска.
+        :param kinds: (Необязательно) Справочники: "group", "teacher", "classroom", "subject". По умолчанию все.
+        :param limit: (Необязательно) Максимальное количество результатов, по умолчанию из конфигурации.
+        :param min_similarity: (Необязательно) Минимальная близость от 0 до 1, по умолчанию из конфигурации.
+        :raises ValueError: Если указан неизвестный справочник.
+        :returns: Список SearchMatch в порядке убывания близости.
+        """
+        kinds = list(kinds or SEARCH_COLUMNS)
+        unknown_kinds = set(kinds) - SEARCH_COLUMNS.keys()
+        if unknown_kinds:
+            raise ValueError(f"Неизвестные справочники для поиска: {', '.join(sorted(unknown_kinds))}")
+        min_similarity = search_config.min_similarity if min_similarity is None else min_similarity
+
+        selects = []
+        for kind in kinds:
+            column = SEARCH_COLUMNS[kind]
+            similarity = func.similarity(column, text)
+            selects.append(
+                select(literal(kind).label("kind"), column.table.c.id.label("id"), column.label("name"),
+                       similarity.label("similarity"))
+                .where(column.op("%")(text))
+                .where(similarity >= min_similarity)
+            )
+        query = (union_all(*selects)
+                 .order_by(desc("similarity"), "name")
+                 .limit(limit or search_config.limit))
+        result = await self._session.execute(query)
+        return [SearchMatch(*row) for row in result.all()]
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import ScheduleSnapshot
+from database.pair_slots import pair_slots
+from database.repositories.base import BaseRepository
+from database.study_calendar import study_calendar, StudyWeekData
+
+from .entry import EntryRepository, EntryRow
+
+SNAPSHOT_COLUMNS = ["date", "pair", "time", "subject", "type", "classroom", "teacher"]
+
+
+class ScheduleSnapshotRepository(BaseRepository[ScheduleSnapshot]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ScheduleSnapshot)
+
+    async def get(self, group_id: UUID, semester: str, week_number: int) -> Optional[ScheduleSnapshot]:
+        """
+        Возвращает снимок расписания группы на учебную неделю.
+
+        :param group_id: ID группы.
+        :param semester: Обозначение семестра.
+        :param week_number: Номер учебной недели.
+        :returns: Экземпляр ScheduleSnapshot или None, если снимок ещё не построен.
+        """
+        query = (select(ScheduleSnapshot)
+                 .where(ScheduleSnapshot.group_id == group_id)
+                 .where(ScheduleSnapshot.semester == semester)
+                 .where(ScheduleSnapshot.week_number == week_number))
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def rebuild_range(self, group_id: UUID, start: datetime, end: datetime) -> List[StudyWeekData]:
+        """
+        Перестраивает снимки группы для учебных недель, пересекающихся с периодом.
+
+        Записи периода читаются одним запросом, снимки записываются только для недель, содержимое которых
+        изменилось, версия таких снимков увеличивается на единицу.
+
+        :param group_id: ID группы.
+        :param start: Начало периода включительно.
+        :param end: Конец периода не включительно.
+        :returns: Список недель, снимки которых были изменены.
+        """
+        weeks = [week for week in study_calendar.weeks()
+                 if week.start_date < end.date() and week.end_date >= start.date()]
+        if not weeks:
+            return []
+
+        rows_by_week: Dict[Tuple[str, int], List[EntryRow]] = defaultdict(list)
+        week_start, _ = study_calendar.week_bounds(weeks[0].number, weeks[0].semester)
+        _, week_end = study_calendar.week_bounds(weeks[-1].number, weeks[-1].semester)
+        for row in await EntryRepository(self._session).get_range(week_start, week_end, group_id=group_id):
+            week = study_calendar.week_of(row.start_datetime)
+            if week is not None:
+                rows_by_week[(week.semester, week.number)].append(row)
+
+        query = (select(ScheduleSnapshot.semester, ScheduleSnapshot.week_number, ScheduleSnapshot.payload)
+                 .where(ScheduleSnapshot.group_id == group_id)
+                 .where(tuple_(ScheduleSnapshot.semester, ScheduleSnapshot.week_number)
+                        .in_([(week.semester, week.number) for week in weeks])))
+        result = await self._session.execute(query)
+        stored_payloads = {(semester, number): payload for semester, number, payload in result.all()}
+
+        changed_weeks = []
+        for week in weeks:
+            payload = self.build_payload(rows_by_week[(week.semester, week.number)])
+            if stored_payloads.get((week.semester, week.number)) == payload:
+                continue
+            statement = insert(ScheduleSnapshot).values(
+                group_id=group_id, semester=week.semester, week_number=week.number, payload=payload
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[ScheduleSnapshot.group_id, ScheduleSnapshot.semester, ScheduleSnapshot.week_number],
+                set_={"payload": statement.excluded.payload, "built_at": statement.excluded.built_at,
+                      "version": ScheduleSnapshot.version + 1}
+            )
+            await self._session.execute(statement)
+            changed_weeks.append(week)
+        return changed_weeks
+
+    @staticmethod
+    def build_payload(rows: List[EntryRow]) -> dict:
+        """
+        Собирает компактное денормализованное представление недели: названия столбцов и массив строк.
+
+        Время занятия кодируется датой и номером пары, поле time ("ЧЧ:ММ-ЧЧ:ММ") заполняется только
+        для занятий в нестандартное время.
+
+        :param rows: Записи недели в порядке start_datetime.
+        :returns: Словарь для хранения в JSONB.
+        """
+        entries = []
+        for row in rows:
+            day, pair = pair_slots.encode(row.start_datetime, row.end_datetime)
+            entry_time = None if pair is not None else f"{row.start_datetime:%H:%M}-{row.end_datetime:%H:%M}"
+            entries.append([day.isoformat(), pair, entry_time, row.subject, row.type, row.classroom, row.teacher])
+        return {"columns": SNAPSHOT_COLUMNS, "entries": entries}
@@ -4,14 +4,21 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Subject
+from database.models import Subject, Entry
 from database.repositories.base import NamedBaseRepository
 
+from .group import GroupRepository
+
 
 class SubjectRepository(NamedBaseRepository[Subject]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Subject)
 
+    async def _notify_changed(self, subject: Subject):
+        # Переименование предмета меняет расписание всех групп, у которых он есть
+        await super()._notify_changed(subject)
+        await GroupRepository(self._session).touch_schedule_of_entries(Entry.subject_id == subject.id)
+
     async def create(self, name: str, short_name: Optional[str] = None) -> Subject:
         """
         Создаёт новый предмет с сокращением, если оно указано.
@@ -4,14 +4,23 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Teacher
+from database.models import Teacher, Entry
 from database.repositories.base import BaseRepository
 
+from .group import GroupRepository
+
 
 class TeacherRepository(BaseRepository[Teacher]):
+    _lookup_field = "full_name"
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Teacher)
 
+    async def _notify_changed(self, teacher: Teacher):
+        # Имя преподавателя выводится в занятиях всех групп, у которых он ведёт
+        await super()._notify_changed(teacher)
+        await GroupRepository(self._session).touch_schedule_of_entries(Entry.teacher_id == teacher.id)
+
     async def create(self, full_name: str) -> Teacher:
         """
         Создаёт нового преподавателя.
@@ -42,6 +51,15 @@ class TeacherRepository(BaseRepository[Teacher]):
         """
         return await super().update(uuid, full_name=full_name)
 
+    async def get_by_full_name(self, full_name: str) -> Optional[Teacher]:
+        """
+        Возвращает преподавателя по полному имени.
+
+        :param full_name: Полное имя преподавателя.
+        :returns: Экземпляр Teacher или None.
+        """
+        return await self.get_by_lookup(full_name)
+
     async def get_by_filters(self, full_name: Optional[str] = None) -> Optional[Teacher]:
         """
         Возвращает преподавателя по фильтрам.
@@ -4,15 +4,24 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Type
+from database.models import Type, Entry
 from database.repositories.base import BaseRepository
 
+from .group import GroupRepository
+
 
 class TypeRepository(BaseRepository[Type]):
+    _lookup_field = "short_name"
+
     def __init__(self, session: AsyncSession):
         self._session = session
         super().__init__(session, Type)
 
+    async def _notify_changed(self, entry_type: Type):
+        # Краткое название типа выводится в каждом занятии этого типа
+        await super()._notify_changed(entry_type)
+        await GroupRepository(self._session).touch_schedule_of_entries(Entry.type_id == entry_type.id)
+
     async def create(self, short_name: str, full_name: Optional[str] = None) -> Type:
         """
         Создаёт новый тип занятия.
@@ -46,6 +55,26 @@ class TypeRepository(BaseRepository[Type]):
         """
         return await super().update(uuid, short_name=short_name, full_name=full_name)
 
+    async def get_by_short_name(self, short_name: str) -> Optional[Type]:
+        """
+        Возвращает тип занятия по краткому названию.
+
+        :param short_name: Краткое название типа.
+        :returns: Экземпляр Type или None.
+        """
+        return await self.get_by_lookup(short_name)
+
+    async def get_by_full_name(self, full_name: str) -> Optional[Type]:
+        """
+        Возвращает тип занятия по полному названию.
+
+        :param full_name: Полное название типа.
+        :returns: Экземпляр Type или None.
+        """
+        query = select(Type).where(Type.full_name == full_name)
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+
     async def get_by_filters(self, short_name: Optional[str] = ..., full_name: Optional[str] = ...) -> Optional[Type]:
         """
         Возвращает тип по фильтрам.
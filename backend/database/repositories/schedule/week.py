@@ -0,0 +1,83 @@
+from datetime import date
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import StudyWeek
+from database.notifications import CacheInvalidation, notify
+from database.repositories.base import BaseRepository
+from database.study_calendar import StudyWeekData
+
+
+class StudyWeekRepository(BaseRepository[StudyWeek]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, StudyWeek)
+
+    async def create(self, number: int, start_date: date, end_date: date, semester: str) -> StudyWeek:
+        """
+        Создаёт новую учебную неделю.
+
+        :param number: Номер учебной недели.
+        :param start_date: Дата начала недели.
+        :param end_date: Дата окончания недели включительно.
+        :param semester: Обозначение семестра, например "2024-1".
+        :returns: Экземпляр StudyWeek.
+        """
+        return await super().create(number=number, start_date=start_date, end_date=end_date, semester=semester)
+
+    async def create_all(self, parameters: List[Dict[str, Any]]) -> List[StudyWeek]:
+        """
+        Создаёт несколько учебных недель по заданным параметрам.
+
+        :param parameters: Список словарей с параметрами для каждого создаваемого объекта
+        Каждый словарь должен содержать следующие ключи:
+            - **number** (*int*): Номер учебной недели.
+            - **start_date** (*date*): Дата начала недели.
+            - **end_date** (*date*): Дата окончания недели.
+            - **semester** (*str*): Обозначение семестра.
+        """
+        return await super().create_all(parameters)
+
+    async def get_by_semester(self, semester: str) -> List[StudyWeek]:
+        """
+        Возвращает учебные недели семестра в порядке номеров.
+
+        :param semester: Обозначение семестра.
+        :returns: Список экземпляров StudyWeek.
+        """
+        query = select(StudyWeek).where(StudyWeek.semester == semester).order_by(StudyWeek.number)
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    async def has_semester(self, semester: str) -> bool:
+        """
+        Проверяет, построен ли календарь семестра.
+
+        :param semester: Обозначение семестра.
+        :returns: True, если в базе данных есть хотя бы одна неделя семестра.
+        """
+        query = select(StudyWeek.id).where(StudyWeek.semester == semester).limit(1)
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def replace_semester(self, semester: str, weeks: List[StudyWeekData]) -> List[StudyWeek]:
+        """
+        Заменяет все учебные недели семестра. Если недели не изменились, запись в базу данных не выполняется.
+
+        :param semester: Обозначение семестра.
+        :param weeks: Новые учебные недели семестра.
+        :returns: Список экземпляров StudyWeek семестра.
+        """
+        query = select(StudyWeek).where(StudyWeek.semester == semester).order_by(StudyWeek.number)
+        result = await self._session.execute(query)
+        stored = list(result.scalars().all())
+        new_weeks = sorted((week.number, week.start_date, week.end_date) for week in weeks if week.semester == semester)
+        if new_weeks == [(week.number, week.start_date, week.end_date) for week in stored]:
+            return stored
+
+        await self._session.execute(delete(StudyWeek).where(StudyWeek.semester == semester))
+        created = await self.create_all([week._asdict() for week in weeks if week.semester == semester])
+        await notify(self._session, [CacheInvalidation(StudyWeek.__tablename__, semester, None)])
+        await self._session.commit()
+        return created
@@ -0,0 +1,25 @@
+from typing import Callable, Dict, Hashable, TypeVar
+
+from sqlalchemy import Executable
+
+Statement = TypeVar("Statement", bound=Executable)
+
+_statements: Dict[Hashable, Executable] = {}
+
+
+def cached_statement(key: Hashable, build: Callable[[], Statement]) -> Statement:
+    """
+    Возвращает запрос, построенный один раз на процесс. Значения передаются при выполнении через bindparam.
+
+    Повторное построение select() на каждый вызов стоит больше самого поиска в кэше скомпилированных запросов
+    SQLAlchemy, а у готового запроса ключ этого кэша вычисляется один раз и запоминается.
+
+    :param key: Ключ запроса, например (модель, название запроса, набор фильтров).
+    :param build: Функция, строящая запрос при первом обращении.
+    :returns: Запрос.
+    """
+    statement = _statements.get(key)
+    if statement is None:
+        # При одновременном первом обращении побеждает один из построенных запросов, они равнозначны
+        statement = _statements.setdefault(key, build())
+    return statement
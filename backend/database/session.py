@@ -8,13 +8,19 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from config import database_config
+from config import database_config, instrumentation_config
+from database.instrumentation import instrument_engine
+
+
+engine = create_async_engine(database_config.url)
+session_factory = async_sessionmaker(engine)
+
+if instrumentation_config.enabled:
+    instrument_engine(engine)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    engine = create_async_engine(database_config.url)
-    factory = async_sessionmaker(engine)
-    async with factory() as session:
+    async with session_factory() as session:
         try:
             yield session
             await session.commit()
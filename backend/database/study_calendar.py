@@ -0,0 +1,193 @@
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import StudyWeek
+
+StudyWeekData = namedtuple("StudyWeekData", ["number", "start_date", "end_date", "semester"])
+
+
+def semester_of(day: Union[date, datetime]) -> str:
+    """
+    Возвращает обозначение семестра, к которому относится дата.
+
+    Осенний семестр (август – январь) обозначается как "<год начала учебного года>-1",
+    весенний (февраль – июль) как "<год начала учебного года>-2".
+
+    :param day: Дата.
+    :returns: Обозначение семестра, например "2024-1".
+    """
+    if day.month >= 8:
+        return f"{day.year}-1"
+    if day.month == 1:
+        return f"{day.year - 1}-1"
+    return f"{day.year - 1}-2"
+
+
+def semester_bounds(semester: str) -> Tuple[datetime, datetime]:
+    """
+    Возвращает границы семестра по календарю: август – январь для осеннего и февраль – июль для весеннего.
+
+    :param semester: Обозначение семестра, например "2024-1".
+    :raises ValueError: Если обозначение семестра некорректно.
+    :returns: Кортеж (начало семестра включительно, конец семестра не включительно).
+    """
+    try:
+        year, half = (int(part) for part in semester.split("-"))
+    except ValueError as exception:
+        raise ValueError(f"Некорректное обозначение семестра: {semester}") from exception
+    if half == 1:
+        return datetime(year, 8, 1), datetime(year + 1, 2, 1)
+    if half == 2:
+        return datetime(year + 1, 2, 1), datetime(year + 1, 8, 1)
+    raise ValueError(f"Некорректное обозначение семестра: {semester}")
+
+
+class StudyCalendar:
+    def __init__(self, weeks: Iterable[StudyWeekData] = ()):
+        """
+        Учебный календарь в памяти процесса.
+
+        Недели хранятся в массиве, отсортированном по дате начала, поэтому поиск недели по дате выполняется
+        бинарным поиском, а поиск границ недели по номеру — обращением к словарю.
+
+        :param weeks: Учебные недели.
+        """
+        self._weeks: List[StudyWeekData] = []
+        self._starts: List[date] = []
+        self._by_number: Dict[Tuple[str, int], StudyWeekData] = {}
+        self.replace(weeks)
+
+    def __len__(self) -> int:
+        return len(self._weeks)
+
+    def replace(self, weeks: Iterable[StudyWeekData]):
+        """
+        Атомарно заменяет содержимое календаря.
+
+        :param weeks: Учебные недели.
+        """
+        sorted_weeks = sorted(weeks, key=lambda week: week.start_date)
+        self._weeks, self._starts, self._by_number = (
+            sorted_weeks,
+            [week.start_date for week in sorted_weeks],
+            {(week.semester, week.number): week for week in sorted_weeks},
+        )
+
+    @property
+    def semesters(self) -> List[str]:
+        return sorted({week.semester for week in self._weeks})
+
+    def weeks(self, semester: Optional[str] = None) -> List[StudyWeekData]:
+        """
+        Возвращает недели календаря.
+
+        :param semester: (Необязательно) Семестр, по умолчанию все недели.
+        :returns: Список недель в порядке дат.
+        """
+        return [week for week in self._weeks if semester is None or week.semester == semester]
+
+    def week_of(self, day: Union[date, datetime]) -> Optional[StudyWeekData]:
+        """
+        Возвращает учебную неделю, в которую попадает дата.
+
+        :param day: Дата или дата и время.
+        :returns: Учебная неделя или None, если дата не попадает ни в одну неделю.
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        index = bisect_right(self._starts, day) - 1
+        if index < 0:
+            return None
+        week = self._weeks[index]
+        return week if day <= week.end_date else None
+
+    def current_semester(self, today: Optional[date] = None) -> Optional[str]:
+        """
+        Возвращает семестр, к которому относится сегодняшний день, или последний известный семестр.
+
+        :param today: (Необязательно) Дата, по умолчанию сегодня.
+        :returns: Обозначение семестра или None для пустого календаря.
+        """
+        if not self._weeks:
+            return None
+        semester = semester_of(today or date.today())
+        return semester if semester in self.semesters else self._weeks[-1].semester
+
+    def get_week(self, number: int, semester: Optional[str] = None) -> Optional[StudyWeekData]:
+        """
+        Возвращает учебную неделю по номеру.
+
+        :param number: Номер учебной недели.
+        :param semester: (Необязательно) Семестр, по умолчанию текущий.
+        :returns: Учебная неделя или None.
+        """
+        return self._by_number.get((semester or self.current_semester(), number))
+
+    def week_bounds(self, number: int, semester: Optional[str] = None) -> Tuple[datetime, datetime]:
+        """
+        Возвращает границы учебной недели.
+
+        :param number: Номер учебной недели, начиная с 1.
+        :param semester: (Необязательно) Семестр, по умолчанию текущий.
+        :raises ValueError: Если номер недели меньше 1 или недели нет в календаре.
+        :returns: Кортеж (начало недели включительно, конец недели не включительно).
+        """
+        if number < 1:
+            raise ValueError(f"Некорректный номер учебной недели: {number}")
+        week = self.get_week(number, semester)
+        if week is None:
+            raise ValueError(f"Учебная неделя {number} не найдена")
+        start = datetime.combine(week.start_date, time.min)
+        return start, datetime.combine(week.end_date + timedelta(days=1), time.min)
+
+    @staticmethod
+    def infer_weeks(days: Iterable[Union[date, datetime]]) -> List[StudyWeekData]:
+        """
+        Восстанавливает учебные недели по датам занятий, если страница недель недоступна.
+
+        Недели начинаются с понедельника и идут подряд от самого раннего до самого позднего занятия
+        каждого семестра.
+
+        :param days: Даты занятий.
+        :returns: Список учебных недель.
+        """
+        bounds_by_semester: Dict[str, List[date]] = {}
+        for day in days:
+            if isinstance(day, datetime):
+                day = day.date()
+            bounds = bounds_by_semester.setdefault(semester_of(day), [day, day])
+            bounds[0] = min(bounds[0], day)
+            bounds[1] = max(bounds[1], day)
+
+        weeks = []
+        for semester, (first_day, last_day) in bounds_by_semester.items():
+            week_start = first_day - timedelta(days=first_day.weekday())
+            number = 1
+            while week_start <= last_day:
+                weeks.append(StudyWeekData(number, week_start, week_start + timedelta(days=6), semester))
+                week_start += timedelta(weeks=1)
+                number += 1
+        return weeks
+
+
+study_calendar = StudyCalendar()
+
+
+async def load_study_calendar(session: AsyncSession) -> StudyCalendar:
+    """
+    Загружает учебный календарь процесса из базы данных.
+
+    :param session: Сессия БД.
+    :returns: Обновлённый календарь.
+    """
+    query = select(StudyWeek.number, StudyWeek.start_date, StudyWeek.end_date, StudyWeek.semester)
+    result = await session.execute(query)
+    study_calendar.replace(StudyWeekData(*row) for row in result.all())
+    logger.info(f"Учебный календарь загружен: {len(study_calendar)} недель")
+    return study_calendar
@@ -1,26 +1,65 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from loguru import logger
 
-from api.schedule.routes import classroom_router
+from api.schedule.routes import (classroom_router, entry_router, week_router, group_router,
+                                 export_router, occupancy_router, search_router, analytics_router, change_router,
+                                 ingest_router, archive_router, schedule_router)
+from api.schedule.response_cache import register_response_cache_handlers, response_cache
+from config import instrumentation_config, notification_config, parsing_config
+from database.instrumentation import record_queries
+from database.notifications import CacheInvalidation, InvalidationListener, register_handler
+from database.repositories.cache import lookup_cache_stats
+from database.session import session_factory, engine
+from database.study_calendar import load_study_calendar
+from parser.scheduler import ingest_scheduler
 
 
 def include_routers(fastapi_app: FastAPI):
     fastapi_app.include_router(classroom_router)
+    fastapi_app.include_router(entry_router)
+    fastapi_app.include_router(week_router)
+    fastapi_app.include_router(group_router)
+    fastapi_app.include_router(export_router)
+    fastapi_app.include_router(occupancy_router)
+    fastapi_app.include_router(search_router)
+    fastapi_app.include_router(analytics_router)
+    fastapi_app.include_router(change_router)
+    fastapi_app.include_router(ingest_router)
+    fastapi_app.include_router(archive_router)
+    fastapi_app.include_router(schedule_router)
+
+
+async def reload_study_calendar(invalidation: CacheInvalidation):
+    async with session_factory() as session:
+        await load_study_calendar(session)
+    logger.info(f"Учебный календарь перезагружен после изменения семестра {invalidation.key or '*'}")
 
 
 @asynccontextmanager
 async def app_lifespan(fastapi_app: FastAPI):
     logger.info("Запуск сервера...")
+    listener = InvalidationListener(engine)
     try:
         # TODO: database health check
+        async with session_factory() as session:
+            await load_study_calendar(session)
         logger.info("Подключение к базе данных успешно.")
+        if notification_config.enabled:
+            register_handler("study_weeks", reload_study_calendar)
+            register_response_cache_handlers()
+            listener.start()
+        if parsing_config.scheduler_enabled:
+            ingest_scheduler.start()
         yield
     except Exception as exception:
         logger.error(f"Ошибка при запуске приложения: {exception}")
         raise
     finally:
         logger.info("Завершение работы приложения...")
+        await ingest_scheduler.stop()
+        await listener.stop()
+        await response_cache.backend.close()
         logger.info("База данных отключена.")
 
 
@@ -28,6 +67,19 @@ app = FastAPI(lifespan=app_lifespan)
 include_routers(app)
 
 
+@app.middleware("http")
+async def record_request_queries(request: Request, call_next):
+    if not instrumentation_config.enabled:
+        return await call_next(request)
+    with record_queries(f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
 @app.get("/")
 async def root():
     return {"message": "Сервер работает!"}
+
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    return {**lookup_cache_stats(), "responses": response_cache.stats()}
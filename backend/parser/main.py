@@ -1,14 +1,19 @@
 import asyncio
 
-from database import init_db
-from parser.targets import populate_database_weeks, populate_database_groups, populate_database_subjects
+from database.instrumentation import record_queries
+from parser.targets import (populate_database_weeks, populate_database_groups, populate_database_subjects,
+                            archive_past_semesters, ensure_upcoming_partitions)
 
 
 async def main():
-    await init_db()
-    # groups = await populate_database_groups()
-    # await populate_database_weeks(groups[0])
-    await populate_database_subjects()
+    with record_queries("ingest"):
+        groups = await populate_database_groups()
+        if groups:
+            await populate_database_weeks(groups[0])
+        # Архивирование до записи расписания, чтобы снимок расписания строился уже без прошедших семестров
+        await archive_past_semesters()
+        await ensure_upcoming_partitions()
+        await populate_database_subjects()
 
 
 if __name__ == "__main__":
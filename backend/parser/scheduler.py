@@ -0,0 +1,152 @@
+import asyncio
+import sys
+from contextlib import suppress
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from config import parsing_config
+from database.session import engine
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+
+class IngestScheduler:
+    def __init__(self, database_engine: AsyncEngine, interval: Optional[int] = None, lock_key: Optional[int] = None,
+                 leader_check_interval: Optional[int] = None):
+        """
+        Периодический запуск парсера внутри процесса API с выбором ведущей реплики.
+
+        Ведущей становится реплика, получившая advisory-блокировку PostgreSQL на отдельном соединении.
+        Блокировка удерживается, пока живо соединение, поэтому при падении ведущей реплики её место
+        занимает другая. Парсер запускается отдельным процессом и не блокирует обработку запросов.
+
+        :param database_engine: Асинхронный движок SQLAlchemy.
+        :param interval: (Необязательно) Интервал между запусками в секундах.
+        :param lock_key: (Необязательно) Ключ advisory-блокировки.
+        :param leader_check_interval: (Необязательно) Интервал попыток стать ведущей репликой в секундах.
+        """
+        self._engine = database_engine
+        self.interval = interval if interval is not None else parsing_config.interval
+        self.lock_key = lock_key if lock_key is not None else parsing_config.scheduler_lock_key
+        self.leader_check_interval = (leader_check_interval if leader_check_interval is not None
+                                      else parsing_config.leader_check_interval)
+        self._task: Optional[asyncio.Task] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+        self.leader = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at: Optional[datetime] = None
+        self.last_finished_at: Optional[datetime] = None
+        self.last_exit_code: Optional[int] = None
+        self.next_run_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние планировщика в этой реплике.
+
+        :returns: Словарь с признаками работы и ведущей реплики, счётчиками и временем запусков.
+        """
+        return {
+            "enabled": self._task is not None,
+            "leader": self.leader,
+            "running": self.running,
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_exit_code": self.last_exit_code,
+            "next_run_at": self.next_run_at,
+        }
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="ingest-scheduler")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                async with self._engine.connect() as connection:
+                    while not await self._try_lock(connection):
+                        await asyncio.sleep(self.leader_check_interval)
+                    self.leader = True
+                    logger.info("Реплика стала ведущей и запускает парсер по расписанию")
+                    try:
+                        await self._lead(connection)
+                    finally:
+                        self.leader = False
+                        self.next_run_at = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logger.error(f"Ошибка планировщика парсера: {exception}")
+            await asyncio.sleep(self.leader_check_interval)
+
+    async def _try_lock(self, connection: AsyncConnection) -> bool:
+        # Блокировка уровня сессии переживает фиксацию транзакции, фиксация нужна, чтобы соединение не простаивало
+        # в открытой транзакции
+        result = await connection.execute(select(func.pg_try_advisory_lock(self.lock_key)))
+        acquired = result.scalar_one()
+        await connection.commit()
+        return acquired
+
+    async def _lead(self, connection: AsyncConnection):
+        while True:
+            await self._ingest()
+            self.next_run_at = datetime.now() + timedelta(seconds=self.interval)
+            await asyncio.sleep(self.interval)
+            # Если соединение с блокировкой потеряно, ведущей уже могла стать другая реплика
+            await connection.execute(select(1))
+            await connection.commit()
+
+    async def _ingest(self):
+        for attempt in range(1, parsing_config.retry_attempts + 1):
+            if await self._run_parser():
+                return
+            if attempt < parsing_config.retry_attempts:
+                logger.warning(f"Парсер завершился с ошибкой, повтор через {parsing_config.retry_delay} с "
+                               f"(попытка {attempt} из {parsing_config.retry_attempts})")
+                await asyncio.sleep(parsing_config.retry_delay)
+        logger.error("Парсер завершился с ошибкой во всех попытках")
+
+    async def _run_parser(self) -> bool:
+        self.runs += 1
+        self.last_started_at = datetime.now()
+        self._process = await asyncio.create_subprocess_exec(sys.executable, "-m", "parser.main", cwd=_BACKEND_ROOT)
+        try:
+            self.last_exit_code = await self._process.wait()
+        except asyncio.CancelledError:
+            # При остановке API незавершённый запуск прерывается, транзакции парсера откатываются
+            # Процесс мог завершиться сам между ожиданием и отменой
+            with suppress(ProcessLookupError):
+                self._process.terminate()
+            await self._process.wait()
+            raise
+        finally:
+            self.last_finished_at = datetime.now()
+        if self.last_exit_code != 0:
+            self.failures += 1
+        return self.last_exit_code == 0
+
+
+ingest_scheduler = IngestScheduler(engine)
@@ -8,16 +8,16 @@ from fake_useragent import UserAgent
 from loguru import logger
 from tenacity import retry_if_exception_type, retry, wait_exponential, stop_after_delay, before_sleep_log
 
-from config import backend_config
+from config import parsing_config
 
 
-semaphore = asyncio.Semaphore(backend_config.parsing.concurrent_requests)
+semaphore = asyncio.Semaphore(parsing_config.concurrent_requests)
 
 
 @retry(
     retry=retry_if_exception_type((ClientConnectionError, asyncio.TimeoutError)),
-    wait=wait_exponential(multiplier=1, min=2, max=backend_config.parsing.retry_delay),
-    stop=stop_after_delay(backend_config.parsing.retry_attempts),
+    wait=wait_exponential(multiplier=1, min=2, max=parsing_config.retry_delay),
+    stop=stop_after_delay(parsing_config.retry_attempts),
     before_sleep=before_sleep_log(logger, logging.WARNING)
 )
 async def scrape_target_url(
@@ -40,10 +40,10 @@ async def scrape_target_url(
     """
     async with semaphore:
         async with ClientSession(
-                connector=TCPConnector(ssl=False, ttl_dns_cache=600, limit=backend_config.parsing.concurrent_requests),
+                connector=TCPConnector(ssl=False, ttl_dns_cache=600, limit=parsing_config.concurrent_requests),
                 headers={"User-Agent": UserAgent().chrome},
                 cookies={"schedule-group-cache": "2.0"},
-                timeout=ClientTimeout(total=backend_config.parsing.retry_delay)
+                timeout=ClientTimeout(total=parsing_config.retry_delay)
         ) as session:
             try:
                 response = await session.get(url)
@@ -1,3 +1,5 @@
 from .weeks import populate_database as populate_database_weeks
 from .groups import populate_database as populate_database_groups
-from .subjects import populate_database as populate_database_subjects
\ No newline at end of file
+from .subjects import populate_database as populate_database_subjects
+from .archive import archive_past_semesters
+from .partitions import ensure_upcoming_partitions
@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from config import schedule_config
+from database.repositories import ArchiveRepository
+from database.session import session_factory
+
+
+async def archive_past_semesters():
+    """
+    Переносит в архив занятия семестров, закончившихся раньше горизонта хранения.
+    Каждый семестр переносится в отдельной транзакции.
+    """
+    horizon = datetime.now() - timedelta(days=schedule_config.archive_after_days)
+    async with session_factory() as db_session:
+        repository = ArchiveRepository(db_session)
+        for semester in await repository.archivable_semesters(horizon):
+            count = await repository.archive_semester(semester)
+            await db_session.commit()
+            logger.success(f"Занятия семестра {semester} перенесены в архив: {count}")
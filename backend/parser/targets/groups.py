@@ -4,10 +4,10 @@ from typing import AsyncGenerator, List, Tuple
 from bs4 import BeautifulSoup
 from loguru import logger
 
-from config import backend_config
-from database import get_session_generator
-from database.crud import crud_group
-from database.schemas import GroupCreate
+from config import source_config
+from database.repositories import GroupRepository
+from database.schema.schedule.group import GroupCreate
+from database.session import session_factory
 from parser.scrape import url_with_parameters, scrape_target_url, scrape_target_urls
 
 
@@ -17,7 +17,7 @@ async def scrape_groups_page() -> List[dict]:
     :return: BeautifulSoup объект html страницы.
     """
     logger.info(f"Скрапинг страницы групп...")
-    target_url = url_with_parameters(backend_config.source.groups_url)
+    target_url = url_with_parameters(str(source_config.groups_url))
     result = await scrape_target_url(target_url, as_json=True)
     logger.success("Страница групп получена")
     return result
@@ -41,18 +41,20 @@ async def extract_groups(data: List[dict]) -> List[GroupCreate]:
     return groups
 
 
-async def write_to_database(group: GroupCreate):
-    async with get_session_generator() as db_session:
-        await crud_group.create_or_update(db_session, group)
+async def write_to_database(groups: List[GroupCreate]):
+    async with session_factory() as db_session:
+        repository = GroupRepository(db_session)
+        existing = await repository.resolve_ids([group.name for group in groups])
+        new_groups = [group.model_dump() for group in groups if group.name not in existing]
+        if new_groups:
+            await repository.create_all(new_groups)
+        await db_session.commit()
+    logger.info(f"Новых групп записано: {len(new_groups)}")
 
 
 async def populate_database() -> list[str]:
     groups_data = await scrape_groups_page()
-    tasks = []
-    group_names = []
-    for group in await extract_groups(groups_data):
-        group_names.append(group.name)
-        tasks.append(write_to_database(group))
+    groups = await extract_groups(groups_data)
     logger.success("Данные о группах собраны, запись в базу данных...")
-    await asyncio.gather(*tasks)
-    return group_names
\ No newline at end of file
+    await write_to_database(groups)
+    return [group.name for group in groups]
@@ -0,0 +1,15 @@
+from loguru import logger
+
+from database.partitions import PartitionManager
+from database.session import session_factory
+
+
+async def ensure_upcoming_partitions():
+    """
+    Создаёт месячные секции расписания на несколько месяцев вперёд.
+    """
+    async with session_factory() as db_session:
+        created = await PartitionManager(db_session).ensure_upcoming()
+        await db_session.commit()
+    if created:
+        logger.success(f"Созданы секции расписания на {len(created)} мес.")
@@ -1,5 +1,5 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, time, timedelta
 import hashlib
 from collections import namedtuple
 from typing import List, Tuple, AsyncGenerator
@@ -7,11 +7,14 @@ from typing import List, Tuple, AsyncGenerator
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import backend_config
-from database import get_session_generator
-from database.crud import crud_group, crud_classroom, crud_teacher, crud_type, crud_subject, crud_entry, \
-    crud_week
-from database.schemas import ClassroomCreate, TeacherCreate, TypeCreate, SubjectCreate, EntryCreate
+from config import source_config, schedule_config
+from database.columnar import publish_snapshot
+from database.notifications import CacheInvalidation, notify
+from database.pair_slots import pair_slots
+from database.repositories import (GroupRepository, EntryRepository, StudyWeekRepository,
+                                   ScheduleSnapshotRepository, ScheduleChangeRepository)
+from database.session import session_factory
+from database.study_calendar import study_calendar, semester_of, load_study_calendar, StudyCalendar
 from parser.scrape import scrape_target_urls, url_with_parameters
 
 
@@ -21,7 +24,7 @@ async def scrape_schedule_api_pages(target_groups: List[str]) -> (AsyncGenerator
     urls_with_context = []
     for group in target_groups:
         group_hash = hashlib.md5(group.encode()).hexdigest()
-        url = f"{backend_config.source.api_url}/{group_hash}.json"
+        url = f"{source_config.api_url}/{group_hash}.json"
         context = {"group": group}
         urls_with_context.append((url, context))
 
@@ -39,23 +42,20 @@ def extract_subjects(schedule_json: dict) -> List[SubjectData]:
     :return: Список предметов.
     """
     if not schedule_json:
-        return
+        return []
 
     subjects = []
 
     schedule_json.pop("group")
     for schedule_date, schedule_data in schedule_json.items():
+        day = datetime.strptime(schedule_date, "%d.%m.%Y").date()
         for subject in schedule_data["pairs"].values():
             subject: dict
             if "name" not in subject:
                 name, subject = list(subject.items())[0]
             else:
                 name = subject["name"]
-            time_start = subject["time_start"]
-            time_end = subject["time_end"]
-
-            datetime_start = datetime.strptime(f"{schedule_date} {time_start}", "%d.%m.%Y %H:%M:%S")
-            datetime_end = datetime.strptime(f"{schedule_date} {time_end}", "%d.%m.%Y %H:%M:%S")
+            datetime_start, datetime_end = pair_slots.parse(day, subject["time_start"], subject["time_end"])
 
             teacher = list(subject["lector"].values())[0]
             subject_type = list(subject["type"].keys())[0]
@@ -64,51 +64,95 @@ def extract_subjects(schedule_json: dict) -> List[SubjectData]:
     return subjects
 
 
-async def create_subject(subject: SubjectData, group: str):
-    async with get_session_generator() as db_fetch_session:
-        group_id = (await crud_group.get_by_name(db_fetch_session, group)).id
-        week = await crud_week.get_by_datetime(db_fetch_session, subject.datetime_start)
-        if not week:
-            logger.error(f"Дата и время пары не попадает в учебные недели: {subject.datetime_start} {group}")
-            return
-
-    async with get_session_generator() as db_subject_session:
-        subject_data = SubjectCreate(name=subject.name)
-        subject_id = (await crud_subject.create_or_update(db_subject_session, subject_data)).id
+async def infer_missing_weeks(schedules: List[Tuple[str, List[SubjectData]]]):
+    """
+    Восстанавливает учебный календарь по датам занятий для семестров, которых нет в календаре.
+    :param schedules: Список пар (название группы, предметы группы).
+    """
+    known_semesters = set(study_calendar.semesters)
+    days = [subject.datetime_start for _, subjects in schedules for subject in subjects
+            if semester_of(subject.datetime_start) not in known_semesters]
+    if not days:
+        return
 
-    async with get_session_generator() as db_type_session:
-        type_data = TypeCreate(short_name=subject.type if subject.type != "Экзамен" else "ЭКЗ")
-        type_id = (await crud_type.create_or_update(db_type_session, type_data)).id
+    weeks = StudyCalendar.infer_weeks(days)
+    async with session_factory() as db_session:
+        repository = StudyWeekRepository(db_session)
+        for semester in {week.semester for week in weeks}:
+            await repository.replace_semester(semester, weeks)
+            logger.warning(f"Учебный календарь семестра {semester} восстановлен по датам занятий")
+        await load_study_calendar(db_session)
 
-    async with get_session_generator() as db_classroom_session:
-        classroom_data = ClassroomCreate(name=subject.classroom)
-        classroom_id = (await crud_classroom.create_or_update(db_classroom_session, classroom_data)).id
 
-        if subject.teacher:
-            async with get_session_generator() as db_teacher_session:
-                teacher_data = TeacherCreate(full_name=subject.teacher)
-                teacher_id = (await crud_teacher.create_or_update(db_teacher_session, teacher_data)).id
-        else:
-            teacher_id = None
+async def write_group_schedule(group: str, subjects: List[SubjectData]):
+    """
+    Заменяет расписание группы за период, охватываемый полученными предметами.
+    :param group: Название группы.
+    :param subjects: Предметы группы.
+    """
+    entries = []
+    for subject in subjects:
+        # Проверка по календарю в памяти, без запроса к базе данных на каждое занятие
+        if study_calendar.week_of(subject.datetime_start) is None:
+            logger.error(f"Дата и время пары не попадает в учебные недели: {subject.datetime_start} {group}")
+            continue
+        entries.append({
+            "start_datetime": subject.datetime_start,
+            "end_datetime": subject.datetime_end,
+            "subject_name": subject.name,
+            "type_short_name": subject.type if subject.type != "Экзамен" else "ЭКЗ",
+            "group_name": group,
+            "classroom": subject.classroom or None,
+            "teacher_full_name": subject.teacher or None,
+        })
+    if not entries:
+        return
 
-    async with get_session_generator() as db_entry_session:
-        entry_data = EntryCreate(start_datetime=subject.datetime_start, end_datetime=subject.datetime_end,
-                                 subject_id=subject_id, type_id=type_id, classroom_id=classroom_id,
-                                 teacher_id=teacher_id, group_id=group_id, week_id=week.id)
-        subject = await crud_entry.create_or_update(db_entry_session, entry_data)
-        logger.success(subject)
+    start = datetime.combine(min(entry["start_datetime"] for entry in entries).date(), time.min)
+    end = datetime.combine(max(entry["start_datetime"] for entry in entries).date() + timedelta(days=1), time.min)
+    async with session_factory() as db_session:
+        group_id = await GroupRepository(db_session).get_or_create_id(group)
+        entry_repository = EntryRepository(db_session)
+        change_repository = ScheduleChangeRepository(db_session)
+        old_versions = await change_repository.day_versions(group_id, start, end)
+        await entry_repository.replace_range(group_id, start, end, entries)
+        new_versions = await change_repository.day_versions(group_id, start, end)
+        changed_days = await change_repository.record(group_id, old_versions, new_versions)
+        if changed_days:
+            await GroupRepository(db_session).touch_schedule([group_id])
+        for conflict in await entry_repository.find_conflicts(group_id, start, end):
+            resource = "преподавателя" if conflict.resource == "teacher" else "аудитории"
+            logger.warning(f"Пересечение занятий {resource}: {conflict.start_datetime} {conflict.group} "
+                           f"и {conflict.conflicting_group}")
+        changed_weeks = await ScheduleSnapshotRepository(db_session).rebuild_range(group_id, start, end)
+        await notify(db_session, [CacheInvalidation("schedule", f"{group}:{day.isoformat()}", new_versions.get(day))
+                                  for day in changed_days])
+        await db_session.commit()
+    logger.success(f"Расписание группы {group} записано: {len(entries)} занятий, изменено дней: {len(changed_days)}, "
+                   f"обновлено снимков недель: {len(changed_weeks)}")
 
 
 async def populate_database():
-    tasks = []
-    async with get_session_generator() as db_session:
-        target_groups = await crud_group.get_all_names(db_session)
+    async with session_factory() as db_session:
+        target_groups = await GroupRepository(db_session).get_all_names()
+        await load_study_calendar(db_session)
+
+    schedules = []
     async for schedule_json, context in scrape_schedule_api_pages(target_groups):
         if not context:
             continue
         logger.info(f"Получение расписания группы {context['group']}")
-        subjects = extract_subjects(schedule_json)
+        schedules.append((context["group"], extract_subjects(schedule_json)))
+
+    await infer_missing_weeks(schedules)
 
-        for subject in subjects:
-            await create_subject(subject, context['group'])
+    for group, subjects in schedules:
+        await write_group_schedule(group, subjects)
 
+    async with session_factory() as db_session:
+        await publish_snapshot(db_session)
+        retention_start = datetime.now() - timedelta(days=schedule_config.change_retention_days)
+        deleted_changes = await ScheduleChangeRepository(db_session).delete_before(retention_start)
+        await db_session.commit()
+    if deleted_changes:
+        logger.info(f"Удалено устаревших изменений расписания: {deleted_changes}")
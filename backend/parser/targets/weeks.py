@@ -3,10 +3,10 @@ from datetime import datetime, date
 from bs4 import BeautifulSoup
 from loguru import logger
 
-from config import backend_config
-from database import get_session_generator
-from database.crud import crud_week
-from database.schemas import WeekCreate
+from config import source_config
+from database.repositories import StudyWeekRepository
+from database.session import session_factory
+from database.study_calendar import StudyWeekData, semester_of, load_study_calendar
 from parser.scrape import scrape_target_url, url_with_parameters
 
 
@@ -16,7 +16,7 @@ async def scrape_weeks_page(group: str) -> BeautifulSoup:
     :return: BeautifulSoup объект html страницы.
     """
     logger.info("Скрапинг страницы недель...")
-    target_url = url_with_parameters(backend_config.source.schedule_url, group=group)
+    target_url = url_with_parameters(str(source_config.schedule_url), group=group)
     result = await scrape_target_url(target_url)
     return BeautifulSoup(result, features="lxml")
 
@@ -37,9 +37,25 @@ async def extract_weeks(group_soup: BeautifulSoup) -> dict[int, tuple[date, ...]
 
 
 async def populate_database(group: str):
-    soup = await scrape_weeks_page(group)
-    weeks = await extract_weeks(soup)
-    for week_number, week_dates in weeks.items():
-        week_data = WeekCreate(number=week_number, start_date=week_dates[0], end_date=week_dates[1])
-        async with get_session_generator() as db_session:
-            await crud_week.create_or_update(db_session, week_data)
\ No newline at end of file
+    """
+    Строит учебный календарь текущего семестра по странице недель, если он ещё не построен.
+    :param group: Название любой группы, страница недель которой используется.
+    """
+    async with session_factory() as db_session:
+        repository = StudyWeekRepository(db_session)
+        semester = semester_of(date.today())
+        if await repository.has_semester(semester):
+            logger.info(f"Учебный календарь семестра {semester} уже построен")
+        else:
+            soup = await scrape_weeks_page(group)
+            weeks = await extract_weeks(soup)
+            if weeks:
+                semester = semester_of(min(week_dates[0] for week_dates in weeks.values()))
+                await repository.replace_semester(semester, [
+                    StudyWeekData(week_number, week_dates[0], week_dates[1], semester)
+                    for week_number, week_dates in weeks.items()
+                ])
+                logger.success(f"Учебный календарь семестра {semester} записан: {len(weeks)} недель")
+            else:
+                logger.warning("Страница недель не содержит учебных недель")
+        await load_study_calendar(db_session)
@@ -1,12 +1,16 @@
 import asyncio
+import json
 from collections.abc import AsyncGenerator
+from contextlib import contextmanager
 
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from config import test_database_config
+from database.instrumentation import instrument_engine, record_queries
 from database.models.base import Base
+from database.repositories.cache import clear_lookup_caches
 
 
 @pytest.fixture(scope="session")
@@ -18,6 +22,7 @@ def event_loop():
 def engine():
     """Создание и возвращение engine для всех тестов."""
     engine = create_async_engine(test_database_config.url)
+    instrument_engine(engine)
     yield engine
 
 
@@ -27,7 +32,52 @@ async def database_session(engine) -> AsyncSession:
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.drop_all)
         await connection.run_sync(Base.metadata.create_all)
+    clear_lookup_caches()
 
     session = async_sessionmaker(engine)()
     yield session
     await session.close()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Проверка, что участок кода укладывается в заданное количество SQL-запросов и не содержит N+1.
+
+    Пример: ``with query_budget(10): await repository.create_all_relations(...)``
+    """
+    @contextmanager
+    def budget(max_queries: int, allow_n_plus_one: bool = False):
+        with record_queries("query_budget") as recorder:
+            yield recorder
+        assert recorder.query_count <= max_queries, recorder.report()
+        assert allow_n_plus_one or not recorder.n_plus_one(), recorder.report()
+
+    return budget
+
+
+@pytest.fixture
+def asgi_get():
+    """
+    Выполнение GET-запроса к приложению FastAPI напрямую через ASGI, без HTTP-клиента и сервера.
+
+    Пример: ``status_code, body = await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-02&pair=2")``
+    """
+    async def get(app, path: str, query: str = ""):
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                 "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+                 "query_string": query.encode(), "headers": [], "server": ("test", 80), "client": ("test", 1)}
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+        status_code = next(message["status"] for message in messages if message["type"] == "http.response.start")
+        body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+        return status_code, json.loads(body)
+
+    return get
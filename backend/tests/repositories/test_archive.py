@@ -0,0 +1,56 @@
+from datetime import timedelta
+from typing import List
+
+import pytest
+
+from database.repositories import ArchiveRepository, EntryRepository, GroupRepository
+from database.study_calendar import semester_of, semester_bounds
+
+from repository_fixtures import entries_data
+
+
+@pytest.fixture
+async def repository(database_session) -> ArchiveRepository:
+    return ArchiveRepository(database_session)
+
+
+class TestArchiveRepository:
+    async def test_archive_semester(self, database_session, repository: ArchiveRepository, entries_data: List[dict]):
+        entry_repository = EntryRepository(database_session)
+        await entry_repository.create_all_with_relations(entries_data)
+        semester = semester_of(entries_data[0]["start_datetime"])
+        group_id = await GroupRepository(database_session).resolve_id(entries_data[0]["group_name"])
+        _, semester_end = semester_bounds(semester)
+
+        assert await repository.archivable_semesters(semester_end - timedelta(days=1)) == []
+        assert await repository.archivable_semesters(semester_end + timedelta(days=1)) == [semester]
+
+        archived = await repository.archive_semester(semester)
+
+        assert archived == len(entries_data)
+        assert await entry_repository.get_range(group_id=group_id) == []
+        assert await repository.archived_semesters() == [semester]
+        rows = await repository.get_range(*semester_bounds(semester), group_id=group_id)
+        assert [row.start_datetime for row in rows] == sorted(entry_data["start_datetime"]
+                                                              for entry_data in entries_data)
+
+    async def test_reingested_week_is_not_duplicated(self, database_session, repository: ArchiveRepository,
+                                                     entries_data: List[dict]):
+        entry_repository = EntryRepository(database_session)
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+        semester = semester_of(entry_data["start_datetime"])
+        first_entry = await entry_repository.create_with_relations(**entry_data)
+        first_id = first_entry.id
+        await repository.archive_semester(semester)
+
+        # Прошедшая неделя загружена заново: то же занятие получает новый UUID и ещё одну группу
+        entries = await entry_repository.create_all_with_relations([entry_data, shared_lecture])
+        assert entries[0].id != first_id
+        await repository.archive_semester(semester)
+
+        group_repository = GroupRepository(database_session)
+        for group_name in (entry_data["group_name"], shared_lecture["group_name"]):
+            group_id = await group_repository.resolve_id(group_name)
+            rows = await repository.get_range(*semester_bounds(semester), group_id=group_id)
+            assert [row.id for row in rows] == [first_id]
@@ -0,0 +1,46 @@
+from typing import List
+
+import pytest
+
+from database.repositories import EntryRepository, GroupRepository, ScheduleChangeRepository
+
+from repository_fixtures import entries_data
+
+
+@pytest.fixture
+async def repository(database_session) -> ScheduleChangeRepository:
+    return ScheduleChangeRepository(database_session)
+
+
+class TestScheduleChangeRepository:
+    async def test_record_changed_days(self, database_session, repository: ScheduleChangeRepository,
+                                       entries_data: List[dict]):
+        entry_repository = EntryRepository(database_session)
+        group_id = await GroupRepository(database_session).get_or_create_id(entries_data[0]["group_name"])
+        start = min(entry_data["start_datetime"] for entry_data in entries_data).replace(hour=0, minute=0)
+        end = max(entry_data["start_datetime"] for entry_data in entries_data).replace(hour=23)
+
+        old_versions = await repository.day_versions(group_id, start, end)
+        await entry_repository.replace_range(group_id, start, end, entries_data)
+        new_versions = await repository.day_versions(group_id, start, end)
+        changed_days = await repository.record(group_id, old_versions, new_versions)
+
+        assert old_versions == {}
+        assert changed_days == sorted({entry_data["start_datetime"].date() for entry_data in entries_data})
+
+        await entry_repository.replace_range(group_id, start, end, entries_data)
+
+        assert await repository.day_versions(group_id, start, end) == new_versions
+
+    async def test_get_after(self, database_session, repository: ScheduleChangeRepository,
+                             entries_data: List[dict]):
+        group_id = await GroupRepository(database_session).get_or_create_id(entries_data[0]["group_name"])
+        first_day, second_day = entries_data[0]["start_datetime"].date(), entries_data[-1]["start_datetime"].date()
+        await repository.record(group_id, {}, {first_day: group_id, second_day: group_id})
+
+        changes = await repository.get_after()
+        next_changes = await repository.get_after(changes[0].id)
+
+        assert [change.day for change in changes] == sorted({first_day, second_day})
+        assert all(change.group == entries_data[0]["group_name"] for change in changes)
+        assert [change.id for change in next_changes] == [change.id for change in changes[1:]]
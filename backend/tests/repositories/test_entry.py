@@ -2,9 +2,10 @@ from typing import List
 
 import pytest
 from datetime import datetime
-from sqlalchemy import exc
+from uuid import uuid4
+from sqlalchemy import exc, select
 
-from database.models import Entry
+from database.models import Entry, Group
 from database.repositories import (
     EntryRepository,
     SubjectRepository,
@@ -30,7 +31,7 @@ def check_entry(entry: Entry, entry_data: dict):
     assert entry.type.short_name == entry_data["type_short_name"]
     assert entry.classroom.name == entry_data["classroom"]
     assert entry.teacher.full_name == entry_data["teacher_full_name"]
-    assert entry.group.name == entry_data["group_name"]
+    assert [group.name for group in entry.groups] == [entry_data["group_name"]]
 
 
 class TestEntryRepository:
@@ -137,7 +138,231 @@ class TestEntryRepository:
         entry_data = entries_data[0]
 
         created_entry = await repository.create_with_relations(**entry_data)
-        received_entries = await repository.get_by_group_id(created_entry.group_id)
+        received_entries = await repository.get_by_group_id(created_entry.groups[0].id)
 
         assert len(received_entries) == 1
         assert received_entries[0] is created_entry
+
+    async def test_get_entries_range(self, database_session, repository: EntryRepository, entries_data: List[dict]):
+        await repository.create_all_with_relations(entries_data)
+        day_start = entries_data[0]["start_datetime"].replace(hour=0, minute=0)
+        day_end = entries_data[4]["start_datetime"].replace(hour=0, minute=0)
+
+        rows = await repository.get_range(day_start, day_end)
+
+        assert [row.start_datetime for row in rows] == [entry_data["start_datetime"] for entry_data in entries_data[:4]]
+        assert rows[0].subject == entries_data[0]["subject_name"]
+        assert rows[0].classroom == entries_data[0]["classroom"]
+        assert rows[3].teacher is None
+
+    async def test_get_entries_range_pagination(self, database_session, repository: EntryRepository,
+                                                entries_data: List[dict]):
+        await repository.create_all_with_relations(entries_data)
+        group_id = await GroupRepository(database_session).resolve_id(entries_data[0]["group_name"])
+
+        received_rows = []
+        after = None
+        while True:
+            rows = await repository.get_range(group_id=group_id, after=after, limit=2)
+            received_rows.extend(rows)
+            if len(rows) < 2:
+                break
+            after = (rows[-1].start_datetime, rows[-1].id)
+
+        assert len(received_rows) == len(entries_data)
+        assert len({row.id for row in received_rows}) == len(entries_data)
+        assert [row.start_datetime for row in received_rows] == sorted(row.start_datetime for row in received_rows)
+
+    async def test_stream_entries_range(self, database_session, repository: EntryRepository, entries_data: List[dict]):
+        await repository.create_all_with_relations(entries_data)
+
+        streamed_rows = [row async for row in repository.stream_range(fetch_size=2)]
+
+        assert streamed_rows == await repository.get_range()
+
+    async def test_create_all_relations_query_budget(self, database_session, repository: EntryRepository,
+                                                     entries_data: List[dict], query_budget):
+        relation_parameters = await repository.parse_relations(entries_data)
+
+        # По одному SELECT и одному INSERT на каждый из пяти справочников, независимо от количества записей
+        with query_budget(10):
+            await repository.create_all_relations(**relation_parameters)
+
+        with query_budget(0):
+            await repository.create_all_relations(**relation_parameters)
+
+    async def test_get_overlapping_entries(self, database_session, repository: EntryRepository,
+                                           entries_data: List[dict]):
+        await repository.create_all_with_relations(entries_data)
+        teacher_id = await TeacherRepository(database_session).resolve_id(entries_data[0]["teacher_full_name"])
+        first_start = entries_data[0]["start_datetime"]
+
+        # Интервал начинается посреди первой пары и заканчивается посреди второй
+        rows = await repository.get_overlapping(first_start.replace(hour=11), first_start.replace(hour=13, minute=30),
+                                                teacher_id=teacher_id)
+
+        assert [row.start_datetime for row in rows] == [entries_data[0]["start_datetime"],
+                                                        entries_data[1]["start_datetime"]]
+
+    async def test_get_free_classrooms(self, database_session, repository: EntryRepository,
+                                       entries_data: List[dict]):
+        await repository.create_all_with_relations(entries_data)
+        first_start = entries_data[0]["start_datetime"]
+
+        free_classrooms = await repository.get_free_classrooms(first_start, entries_data[0]["end_datetime"])
+
+        assert entries_data[0]["classroom"] not in free_classrooms
+        assert entries_data[1]["classroom"] in free_classrooms
+
+    async def test_shared_lecture_stored_once(self, database_session, repository: EntryRepository,
+                                              entries_data: List[dict]):
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+
+        entries = await repository.create_all_with_relations([entry_data, shared_lecture])
+        teacher_id = await TeacherRepository(database_session).resolve_id(entry_data["teacher_full_name"])
+        teacher_rows = await repository.get_range(teacher_id=teacher_id)
+        group_id = await GroupRepository(database_session).resolve_id(shared_lecture["group_name"])
+        group_rows = await repository.get_range(group_id=group_id)
+
+        assert entries[0] is entries[1]
+        assert sorted(group.name for group in entries[0].groups) == ["М14О-101БВ-24", "М14О-105БВ-24"]
+        assert [row.group for row in teacher_rows] == ["М14О-101БВ-24, М14О-105БВ-24"]
+        assert [row.group for row in group_rows] == ["М14О-101БВ-24"]
+
+    async def test_get_range_by_groups(self, database_session, repository: EntryRepository,
+                                       entries_data: List[dict]):
+        shared_lecture = {**entries_data[0], "group_name": "М14О-101БВ-24"}
+        await repository.create_all_with_relations([*entries_data, shared_lecture])
+        group_repository = GroupRepository(database_session)
+        group_ids = [await group_repository.resolve_id(name) for name in ("М14О-105БВ-24", "М14О-101БВ-24")]
+        start = entries_data[0]["start_datetime"].replace(hour=0, minute=0)
+        end = entries_data[4]["start_datetime"].replace(hour=0, minute=0)
+
+        rows_by_group = await repository.get_range_by_groups(start, end, group_ids)
+
+        assert rows_by_group["М14О-105БВ-24"] == await repository.get_range(start, end, group_id=group_ids[0])
+        assert [row.id for row in rows_by_group["М14О-101БВ-24"]] == [rows_by_group["М14О-105БВ-24"][0].id]
+        assert await repository.get_range_by_groups(start, end, []) == {}
+
+    async def test_replace_range_keeps_shared_lectures(self, database_session, repository: EntryRepository,
+                                                       entries_data: List[dict]):
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+        await repository.create_all_with_relations([entry_data, shared_lecture])
+        group_repository = GroupRepository(database_session)
+        group_id = await group_repository.resolve_id(entry_data["group_name"])
+        other_group_id = await group_repository.resolve_id(shared_lecture["group_name"])
+        day_start = entry_data["start_datetime"].replace(hour=0, minute=0)
+        day_end = day_start.replace(hour=23)
+
+        await repository.replace_range(group_id, day_start, day_end, [])
+
+        assert await repository.get_range(group_id=group_id) == []
+        assert len(await repository.get_range(group_id=other_group_id)) == 1
+
+        await repository.replace_range(other_group_id, day_start, day_end, [])
+
+        assert await repository.get_range(day_start, day_end) == []
+
+    async def test_replace_range_keeps_unchanged_entries(self, database_session, repository: EntryRepository,
+                                                         entries_data: List[dict]):
+        created = await repository.create_all_with_relations(entries_data)
+        group_id = await GroupRepository(database_session).resolve_id(entries_data[0]["group_name"])
+        start = min(entry_data["start_datetime"] for entry_data in entries_data).replace(hour=0, minute=0)
+        end = max(entry_data["start_datetime"] for entry_data in entries_data).replace(hour=23)
+        moved = {**entries_data[0], "classroom": "ГУК Б-419"}
+
+        entry_ids = await repository.replace_range(group_id, start, end, [moved, *entries_data[1:]])
+
+        assert entry_ids[1:] == [entry.id for entry in created[1:]]
+        assert entry_ids[0] != created[0].id
+        assert await repository.get_by_id(created[0].id) is None
+
+    async def test_update_skips_unchanged_content(self, database_session, repository: EntryRepository,
+                                                  entries_data: List[dict]):
+        entry = await repository.create_with_relations(**entries_data[0])
+        content_hash = entry.content_hash
+
+        await repository.update(entry.id, start_datetime=entry.start_datetime)
+
+        assert entry not in database_session.dirty
+        assert entry.content_hash == content_hash
+
+        updated = await repository.update(entry.id, end_datetime=entry.end_datetime.replace(minute=0))
+
+        assert updated.content_hash != content_hash
+
+    async def test_update_moves_entry_to_another_month(self, database_session, repository: EntryRepository,
+                                                        entries_data: List[dict]):
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+        entry, _ = await repository.create_all_with_relations([entry_data, shared_lecture])
+        entry_id = entry.id
+        start = entry_data["start_datetime"].replace(year=entry_data["start_datetime"].year + 1)
+        end = entry_data["end_datetime"].replace(year=entry_data["end_datetime"].year + 1)
+
+        moved = await repository.update(entry_id, start_datetime=start, end_datetime=end)
+
+        assert (moved.id, moved.start_datetime, moved.end_datetime) == (entry_id, start, end)
+        assert sorted(group.name for group in moved.groups) == ["М14О-101БВ-24", "М14О-105БВ-24"]
+        group_id = await GroupRepository(database_session).resolve_id(entry_data["group_name"])
+        assert [row.start_datetime for row in await repository.get_range(group_id=group_id)
+                if row.id == entry_id] == [start]
+
+    async def test_update_and_delete_change_schedule_version(self, database_session, repository: EntryRepository,
+                                                             entries_data: List[dict]):
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+        entry, _ = await repository.create_all_with_relations([entry_data, shared_lecture])
+        group_repository = GroupRepository(database_session)
+        names = [entry_data["group_name"], shared_lecture["group_name"]]
+        created = await group_repository.get_schedule_versions(names)
+
+        await repository.update(entry.id, classroom_id=None)
+        updated = await group_repository.get_schedule_versions(names)
+        await repository.delete(entry.id)
+        deleted = await group_repository.get_schedule_versions(names)
+
+        for name in names:
+            assert len({created[name][1], updated[name][1], deleted[name][1]}) == 3
+
+    async def test_update_to_existing_event_raises(self, database_session, repository: EntryRepository,
+                                                   entries_data: List[dict]):
+        entry_data = entries_data[0]
+        other_room = {**entry_data, "group_name": "М14О-101БВ-24", "classroom": "ГУК Б-419"}
+        entry, other = await repository.create_all_with_relations([entry_data, other_room])
+
+        with pytest.raises(ValueError):
+            await repository.update(other.id, classroom_id=entry.classroom_id)
+
+        assert (await repository.get_by_id(other.id)).classroom.name == "ГУК Б-419"
+
+    async def test_update_with_unknown_reference_keeps_transaction(self, database_session, repository: EntryRepository,
+                                                                   entries_data: List[dict]):
+        entry = await repository.create_with_relations(**entries_data[0])
+        subject_name = entry.subject.name
+        # Группа создаётся без фиксации, ошибка обновления не должна откатить её вместе с транзакцией
+        group_id = await GroupRepository(database_session).get_or_create_id("М14О-199БВ-24")
+
+        with pytest.raises(exc.IntegrityError):
+            await repository.update(entry.id, subject_id=uuid4())
+
+        result = await database_session.execute(select(Group.name).where(Group.id == group_id))
+        assert result.scalar_one() == "М14О-199БВ-24"
+        assert (await repository.get_by_id(entry.id)).subject.name == subject_name
+
+    async def test_find_conflicts(self, database_session, repository: EntryRepository, entries_data: List[dict]):
+        entry_data = entries_data[0]
+        shared_lecture = {**entry_data, "group_name": "М14О-101БВ-24"}
+        double_booking = {**entry_data, "group_name": "М14О-103БВ-24", "subject_name": "Базы данных",
+                          "classroom": "ГУК Б-419"}
+        await repository.create_all_with_relations([entry_data, shared_lecture, double_booking])
+        group_id = await GroupRepository(database_session).resolve_id(entry_data["group_name"])
+        day_start = entry_data["start_datetime"].replace(hour=0, minute=0)
+
+        conflicts = await repository.find_conflicts(group_id, day_start, day_start.replace(hour=23))
+
+        assert len(conflicts) == 1
+        assert conflicts[0].resource == "teacher"
+        assert conflicts[0].conflicting_group == "М14О-103БВ-24"
@@ -3,11 +3,11 @@ from typing import List
 import pytest
 
 from database.models import Group
-from database.repositories import GroupRepository
+from database.repositories import GroupRepository, EntryRepository, SubjectRepository
 
 from sqlalchemy import exc
 
-from repository_fixtures import groups_data
+from repository_fixtures import groups_data, entries_data
 
 
 @pytest.fixture
@@ -96,3 +96,51 @@ class TestGroupRepository:
         await repository.delete(created_group.id)
         received_group = await repository.get_by_id(created_group.id)
         assert received_group is None
+
+    async def test_stream_all_groups(self, database_session, repository: GroupRepository, groups_data: List[dict]):
+        await repository.create_all(groups_data)
+
+        received_names = [group.name async for group in repository.stream_all(fetch_size=2)]
+
+        assert sorted(received_names) == sorted(group_data["name"] for group_data in groups_data)
+
+    async def test_touch_schedule(self, database_session, repository: GroupRepository, groups_data: List[dict]):
+        created_group = await repository.create(**groups_data[0])
+        group_id, version = await repository.get_schedule_version(created_group.name)
+
+        await repository.touch_schedule([group_id])
+
+        assert group_id == created_group.id
+        assert (await repository.get_schedule_version(created_group.name))[1] != version
+        assert await repository.get_schedule_version("Несуществующая") is None
+
+        await repository.touch_schedule()
+        _, touched_version = await repository.get_schedule_version(created_group.name)
+        # Версии из обоих путей генерируются uuid7
+        assert touched_version.version == 7
+
+    async def test_get_schedule_versions(self, database_session, repository: GroupRepository,
+                                         groups_data: List[dict]):
+        created_groups = [await repository.create(**group_data) for group_data in groups_data[:2]]
+
+        versions = await repository.get_schedule_versions([group.name for group in created_groups] + ["Несуществующая"])
+
+        assert versions == {group.name: await repository.get_schedule_version(group.name) for group in created_groups}
+
+    async def test_renames_change_schedule_version(self, database_session, repository: GroupRepository,
+                                                   entries_data: List[dict]):
+        entry_data = entries_data[0]
+        await EntryRepository(database_session).create_with_relations(**entry_data)
+        other_group = await repository.create("М14О-101БВ-24")
+        group_id, version = await repository.get_schedule_version(entry_data["group_name"])
+        _, other_version = await repository.get_schedule_version(other_group.name)
+        subject_repository = SubjectRepository(database_session)
+        subject_id = await subject_repository.resolve_id(entry_data["subject_name"])
+
+        await subject_repository.update(subject_id, name="Психология")
+        _, subject_renamed_version = await repository.get_schedule_version(entry_data["group_name"])
+        await repository.update(group_id, name="М14О-109БВ-24")
+
+        assert subject_renamed_version != version
+        assert (await repository.get_schedule_version(other_group.name))[1] == other_version
+        assert (await repository.get_schedule_version("М14О-109БВ-24"))[1] != subject_renamed_version
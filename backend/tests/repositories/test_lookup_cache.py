@@ -0,0 +1,102 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database.repositories.cache import LookupCache, get_lookup_cache
+
+
+class TestLookupCache:
+    def test_get_and_set(self):
+        cache = LookupCache(max_size=10, ttl=60)
+        subject_id = uuid.uuid4()
+        cache.set("Базы данных", subject_id)
+
+        assert cache.get("Базы данных") == subject_id
+        assert cache.get("Общая физика") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_lru_eviction(self):
+        cache = LookupCache(max_size=2, ttl=60)
+        cache.set("a", uuid.uuid4())
+        cache.set("b", uuid.uuid4())
+        cache.get("a")
+        cache.set("c", uuid.uuid4())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self):
+        cache = LookupCache(max_size=10, ttl=0.01)
+        cache.set("a", uuid.uuid4())
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_id(self):
+        cache = LookupCache(max_size=10, ttl=60)
+        subject_id = uuid.uuid4()
+        cache.set_many({"a": subject_id, "b": subject_id, "c": uuid.uuid4()})
+        cache.invalidate_id(subject_id)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+
+class TestLookupCacheTransactions:
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        metadata = MetaData()
+        table = Table("lookups", metadata, Column("id", Integer, primary_key=True))
+        metadata.create_all(engine)
+        with Session(engine) as session:
+            session.info["table"] = table
+            yield session
+
+    @pytest.fixture
+    def cache(self):
+        cache = get_lookup_cache("lookups")
+        cache.clear()
+        return cache
+
+    def test_rolled_back_writes_clear_cache(self, session, cache):
+        session.execute(insert(session.info["table"]).values(id=1))
+        cache.set("a", uuid.uuid4())
+        session.rollback()
+
+        assert len(cache) == 0
+
+    def test_uncommitted_writes_clear_cache_on_close(self, session, cache):
+        session.execute(insert(session.info["table"]).values(id=1))
+        cache.set("a", uuid.uuid4())
+        session.close()
+
+        assert len(cache) == 0
+
+    def test_savepoint_rollback_clears_cache(self, session, cache):
+        with pytest.raises(RuntimeError):
+            with session.begin_nested():
+                session.execute(insert(session.info["table"]).values(id=1))
+                cache.set("a", uuid.uuid4())
+                raise RuntimeError()
+
+        assert len(cache) == 0
+
+    def test_committed_and_read_only_transactions_keep_cache(self, session, cache):
+        session.execute(insert(session.info["table"]).values(id=1))
+        cache.set("a", uuid.uuid4())
+        session.commit()
+        session.execute(select(session.info["table"]))
+        cache.set("b", uuid.uuid4())
+        session.close()
+
+        assert len(cache) == 2
@@ -0,0 +1,37 @@
+from typing import List
+
+import pytest
+
+from database.repositories import SearchRepository, GroupRepository, TeacherRepository
+
+from repository_fixtures import groups_data, teachers_data
+
+
+@pytest.fixture
+async def repository(database_session) -> SearchRepository:
+    return SearchRepository(database_session)
+
+
+class TestSearchRepository:
+    async def test_search_with_typo(self, database_session, repository: SearchRepository, groups_data: List[dict],
+                                    teachers_data: List[dict]):
+        await GroupRepository(database_session).create_all(groups_data)
+        await TeacherRepository(database_session).create_all(teachers_data)
+
+        matches = await repository.search("м14о-105бв24")
+
+        assert matches[0].kind == "group"
+        assert matches[0].name == "М14О-105БВ-24"
+        assert [match.similarity for match in matches] == sorted((match.similarity for match in matches),
+                                                                 reverse=True)
+
+    async def test_search_kinds(self, database_session, repository: SearchRepository, groups_data: List[dict],
+                                teachers_data: List[dict]):
+        await GroupRepository(database_session).create_all(groups_data)
+        await TeacherRepository(database_session).create_all(teachers_data)
+
+        matches = await repository.search("Иванов Иван", kinds=["teacher"], limit=1)
+
+        assert [(match.kind, match.name) for match in matches] == [("teacher", "Иванов Иван Иванович")]
+        with pytest.raises(ValueError):
+            await repository.search("Иванов", kinds=["unknown"])
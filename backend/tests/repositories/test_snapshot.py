@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+from typing import List
+
+import pytest
+
+from database.repositories import EntryRepository, GroupRepository, ScheduleSnapshotRepository
+from database.study_calendar import study_calendar, StudyWeekData, semester_of
+
+from repository_fixtures import entries_data
+
+
+@pytest.fixture
+def calendar(entries_data: List[dict]):
+    first_day = entries_data[0]["start_datetime"].date()
+    week_start = first_day - timedelta(days=first_day.weekday())
+    study_calendar.replace([StudyWeekData(11, week_start, week_start + timedelta(days=6), semester_of(week_start))])
+    yield study_calendar
+    study_calendar.replace([])
+
+
+@pytest.fixture
+async def repository(database_session) -> ScheduleSnapshotRepository:
+    return ScheduleSnapshotRepository(database_session)
+
+
+class TestScheduleSnapshotRepository:
+    async def test_rebuild_range(self, database_session, repository: ScheduleSnapshotRepository, calendar,
+                                 entries_data: List[dict]):
+        await EntryRepository(database_session).create_all_with_relations(entries_data)
+        group_id = await GroupRepository(database_session).resolve_id(entries_data[0]["group_name"])
+        week = calendar.weeks()[0]
+        start, end = calendar.week_bounds(week.number, week.semester)
+
+        changed_weeks = await repository.rebuild_range(group_id, start, end)
+        snapshot = await repository.get(group_id, week.semester, week.number)
+
+        assert changed_weeks == [week]
+        assert snapshot.version == 1
+        assert len(snapshot.payload["entries"]) == len(entries_data)
+        assert snapshot.payload["entries"][0][:4] == [
+            entries_data[0]["start_datetime"].date().isoformat(), 2, None, entries_data[0]["subject_name"]
+        ]
+
+    async def test_rebuild_range_skips_unchanged(self, database_session, repository: ScheduleSnapshotRepository,
+                                                 calendar, entries_data: List[dict]):
+        entry_repository = EntryRepository(database_session)
+        entries = await entry_repository.create_all_with_relations(entries_data)
+        group_id = await GroupRepository(database_session).resolve_id(entries_data[0]["group_name"])
+        week = calendar.weeks()[0]
+        start, end = calendar.week_bounds(week.number, week.semester)
+
+        await repository.rebuild_range(group_id, start, end)
+        assert await repository.rebuild_range(group_id, start, end) == []
+
+        await entry_repository.delete(entries[0].id)
+        await repository.rebuild_range(group_id, start, end)
+        snapshot = await repository.get(group_id, week.semester, week.number)
+
+        assert snapshot.version == 2
+        assert len(snapshot.payload["entries"]) == len(entries_data) - 1
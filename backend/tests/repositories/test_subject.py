@@ -75,3 +75,24 @@ class TestSubjectRepository:
         received_subject = await repository.get_by_id(created_subject.id)
 
         assert received_subject is None
+
+    async def test_resolve_subject_ids(self, database_session, repository: SubjectRepository, subjects_data: List[dict]):
+        created_subject = await repository.create(**subjects_data[0])
+        names = [subjects_data[0]["name"], subjects_data[1]["name"], None, subjects_data[0]["name"]]
+
+        resolved = await repository.resolve_ids(names, create_missing=True)
+
+        assert len(resolved) == 2
+        assert resolved[subjects_data[0]["name"]] == created_subject.id
+        assert (await repository.get_by_name(subjects_data[1]["name"])).id == resolved[subjects_data[1]["name"]]
+
+    async def test_update_subject_invalidates_cache(self, database_session, repository: SubjectRepository,
+                                                    subjects_data: List[dict]):
+        old_name = subjects_data[0]["name"]
+        created_subject = await repository.create(**subjects_data[0])
+        assert await repository.resolve_id(old_name) == created_subject.id
+
+        await repository.update(uuid=created_subject.id, name="Новое название")
+
+        assert await repository.resolve_id(old_name) is None
+        assert await repository.resolve_id("Новое название") == created_subject.id
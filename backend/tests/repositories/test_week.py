@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+
+from database.repositories import StudyWeekRepository
+from database.study_calendar import StudyWeekData, load_study_calendar
+
+
+@pytest.fixture
+def weeks_data():
+    return [
+        StudyWeekData(1, date(2024, 9, 2), date(2024, 9, 8), "2024-1"),
+        StudyWeekData(2, date(2024, 9, 9), date(2024, 9, 15), "2024-1"),
+    ]
+
+
+@pytest.fixture
+async def repository(database_session) -> StudyWeekRepository:
+    return StudyWeekRepository(database_session)
+
+
+class TestStudyWeekRepository:
+    async def test_replace_semester(self, database_session, repository: StudyWeekRepository, weeks_data):
+        await repository.replace_semester("2024-1", weeks_data)
+        await repository.replace_semester("2024-1", weeks_data[:1])
+
+        weeks = await repository.get_by_semester("2024-1")
+
+        assert len(weeks) == 1
+        assert await repository.has_semester("2024-1")
+        assert not await repository.has_semester("2024-2")
+
+    async def test_load_study_calendar(self, database_session, repository: StudyWeekRepository, weeks_data):
+        await repository.replace_semester("2024-1", weeks_data)
+
+        calendar = await load_study_calendar(database_session)
+
+        assert calendar.week_of(date(2024, 9, 10)).number == 2
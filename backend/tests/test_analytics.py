@@ -0,0 +1,89 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from api.schedule.routes import analytics
+from database.analytics import ClassroomOccupancy, PAIR_SLOTS
+from database.session import get_db_session
+
+
+def make_occupancy() -> ClassroomOccupancy:
+    classrooms = ["3-420", "3-435", "ГУК В-221"]
+    intervals = [
+        (0, datetime(2024, 9, 2, 9, 0), datetime(2024, 9, 2, 10, 30)),
+        # Сдвоенная пара занимает два слота
+        (1, datetime(2024, 9, 2, 13, 0), datetime(2024, 9, 2, 16, 15)),
+        (1, datetime(2024, 9, 3, 9, 0), datetime(2024, 9, 3, 10, 30)),
+        # Занятие вне периода отбрасывается
+        (2, datetime(2024, 9, 20, 9, 0), datetime(2024, 9, 20, 10, 30)),
+    ]
+    codes = np.array([code for code, _, _ in intervals])
+    starts = np.array([start for _, start, _ in intervals], dtype="datetime64[m]")
+    ends = np.array([end for _, _, end in intervals], dtype="datetime64[m]")
+    return ClassroomOccupancy.from_intervals(classrooms, codes, starts, ends, date(2024, 9, 2), date(2024, 9, 8))
+
+
+class TestClassroomOccupancy:
+    def test_from_intervals(self):
+        occupancy = make_occupancy()
+
+        assert occupancy.occupancy.shape == (3, 7, len(PAIR_SLOTS))
+        assert occupancy.occupancy.sum() == 4
+        assert occupancy.occupancy[1, 0, 2] and occupancy.occupancy[1, 0, 3]
+        assert not occupancy.occupancy[2].any()
+
+    def test_utilisation(self):
+        utilisation = make_occupancy().utilisation()
+
+        study_slots = 6 * len(PAIR_SLOTS)
+        assert utilisation["3-420"] == round(100 / study_slots, 2)
+        assert utilisation["3-435"] == round(300 / study_slots, 2)
+        assert utilisation["ГУК В-221"] == 0.0
+
+    def test_heatmap(self):
+        heatmap = make_occupancy().heatmap()
+
+        assert heatmap.shape == (6, len(PAIR_SLOTS))
+        assert heatmap[0, 0] == round(100 / 3, 2)
+        assert heatmap[5].sum() == 0
+
+    def test_free_classrooms(self):
+        occupancy = make_occupancy()
+
+        assert occupancy.free_classrooms(date(2024, 9, 2), [2, 3, 4]) == ["3-420", "ГУК В-221"]
+        assert occupancy.free_classrooms(date(2024, 9, 2), [0]) == ["3-435", "ГУК В-221"]
+        assert not occupancy.free_slots("3-435")[0, 2]
+        with pytest.raises(ValueError):
+            occupancy.free_classrooms(date(2024, 9, 9), [0])
+
+
+class TestFreeClassroomsRoute:
+    @pytest.fixture
+    def app(self, monkeypatch):
+        async def load_occupancy(session, first_day, last_day):
+            return make_occupancy()
+
+        monkeypatch.setattr("api.schedule.routes.analytics.load_classroom_occupancy", load_occupancy)
+        app = FastAPI()
+        app.include_router(analytics.router)
+        app.dependency_overrides[get_db_session] = lambda: None
+        return app
+
+    async def test_pairs(self, app, asgi_get):
+        assert await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-02&pair=2") == \
+               (200, ["3-420", "3-435", "ГУК В-221"])
+        assert await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-02&pair=1&pair=3") == \
+               (200, ["ГУК В-221"])
+        # Без номеров пар проверяются пары с 13:00
+        assert await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-02") == (200, ["3-420", "ГУК В-221"])
+
+    async def test_invalid_pair_and_day(self, app, asgi_get):
+        status_code, _ = await asgi_get(app, "/analytics/classrooms/free", f"day=2024-09-02&pair={len(PAIR_SLOTS) + 1}")
+        assert status_code == 422
+        status_code, _ = await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-02&pair=0")
+        assert status_code == 422
+        status_code, body = await asgi_get(app, "/analytics/classrooms/free", "day=2024-09-20&pair=1")
+        assert status_code == 400
+        assert "вне периода" in body["detail"]
@@ -0,0 +1,68 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from database.columnar import ColumnarSnapshot, SnapshotReader
+from database.repositories import EntryRow
+
+
+def make_rows():
+    return [
+        EntryRow(uuid4(), datetime(2024, 9, 2, 9, 0), datetime(2024, 9, 2, 10, 30), "Базы данных", "ЛК",
+                 "М14О-105БВ-24", "3-435", "Склеймин Юрий Борисович"),
+        EntryRow(uuid4(), datetime(2024, 9, 2, 10, 45), datetime(2024, 9, 2, 12, 15), "Общая физика", "ЛК",
+                 "М14О-101БВ-24", None, None),
+        EntryRow(uuid4(), datetime(2024, 9, 3, 13, 0), datetime(2024, 9, 3, 14, 30), "Базы данных", "ПЗ",
+                 "М14О-105БВ-24", "3-420", None),
+        EntryRow(uuid4(), datetime(2024, 9, 2, 13, 0), datetime(2024, 9, 2, 14, 30), "Общая физика", "ПЗ",
+                 "М14О-105БВ-24", None, "Склеймин Юрий Борисович"),
+    ]
+
+
+async def iterate(rows):
+    for row in rows:
+        yield row
+
+
+class TestColumnarSnapshot:
+    async def test_get_range(self, tmp_path):
+        rows = make_rows()
+        path = tmp_path / "schedule.snapshot"
+
+        assert await ColumnarSnapshot.write(path, iterate(rows), version=1) == len(rows)
+        snapshot = ColumnarSnapshot(path)
+
+        group_rows = [row for row in rows if row.group == "М14О-105БВ-24"]
+        assert snapshot.get_range("М14О-105БВ-24") == sorted(group_rows, key=lambda row: row.start_datetime)
+        assert snapshot.get_range("М14О-105БВ-24", datetime(2024, 9, 2, 12), datetime(2024, 9, 3)) == [rows[3]]
+        assert snapshot.get_range("М14О-101БВ-24", datetime(2024, 9, 3)) == []
+        with pytest.raises(KeyError):
+            snapshot.get_range("М14О-999БВ-24")
+        assert snapshot.has_group("М14О-101БВ-24")
+        assert not snapshot.has_group("М14О-999БВ-24")
+
+    async def test_read_version(self, tmp_path):
+        path = tmp_path / "schedule.snapshot"
+        await ColumnarSnapshot.write(path, iterate(make_rows()), version=7)
+
+        assert ColumnarSnapshot.read_version(path) == 7
+        path.write_bytes(b"MAIS")
+        with pytest.raises(ValueError):
+            ColumnarSnapshot.read_version(path)
+
+    async def test_reader_swaps_versions(self, tmp_path):
+        rows = make_rows()
+        path = tmp_path / "schedule.snapshot"
+        reader = SnapshotReader(path)
+        assert reader.get() is None
+
+        await ColumnarSnapshot.write(path, iterate(rows[:2]), version=1)
+        old_snapshot = reader.get()
+        await ColumnarSnapshot.write(path, iterate(rows), version=2)
+        new_snapshot = reader.get()
+
+        assert (old_snapshot.version, len(old_snapshot)) == (1, 2)
+        assert (new_snapshot.version, len(new_snapshot)) == (2, 4)
+        # Старая версия остаётся читаемой после публикации новой
+        assert old_snapshot.get_range("М14О-105БВ-24") == [rows[0]]
@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+
+from api.schedule.dependencies import (get_entry_repository, get_group_repository, get_teacher_repository,
+                                       get_classroom_repository)
+from api.schedule.response_cache import MemoryCacheBackend, ResponseCache, get_response_cache
+from api.schedule.routes import entry
+from database.study_calendar import StudyCalendar
+from tests.test_study_calendar import make_weeks
+
+
+class EntryRepositoryStub:
+    def __init__(self, calendar: StudyCalendar):
+        self.calendar = calendar
+        self.periods = []
+
+    def study_week_bounds(self, number, semester=None):
+        return self.calendar.week_bounds(number, semester)
+
+    async def get_range(self, start, end, **filters):
+        self.periods.append((start, end))
+        return []
+
+
+class TestEntriesRoute:
+    @pytest.fixture
+    def repository(self):
+        return EntryRepositoryStub(StudyCalendar(make_weeks()))
+
+    @pytest.fixture
+    def app(self, repository):
+        app = FastAPI()
+        app.include_router(entry.router)
+        app.dependency_overrides[get_entry_repository] = lambda: repository
+        for dependency in (get_group_repository, get_teacher_repository, get_classroom_repository):
+            app.dependency_overrides[dependency] = lambda: None
+        app.dependency_overrides[get_response_cache] = lambda: ResponseCache(MemoryCacheBackend(100), ttl=60)
+        return app
+
+    async def test_week(self, app, repository, asgi_get):
+        assert await asgi_get(app, "/entries/", "week=2") == (200, {"entries": [], "next_cursor": None})
+        assert [(start.day, end.day) for start, end in repository.periods] == [(9, 16)]
+
+    async def test_unknown_week_is_not_found(self, app, repository, asgi_get):
+        status_code, body = await asgi_get(app, "/entries/", "week=10")
+
+        assert status_code == 404
+        assert body["detail"] == "Учебная неделя 10 не найдена"
+        assert repository.periods == []
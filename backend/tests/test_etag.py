@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+
+from api.schedule.etag import schedule_etag, etag_matches
+
+
+class TestETag:
+    def test_schedule_etag(self):
+        version = uuid.uuid4()
+        start, end = datetime(2024, 9, 2), datetime(2024, 9, 9)
+        etag = schedule_etag(version, start, end)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert schedule_etag(version, start, end) == etag
+        assert schedule_etag(uuid.uuid4(), start, end) != etag
+        assert schedule_etag(version, start, datetime(2024, 9, 16)) != etag
+
+    def test_etag_matches(self):
+        etag = '"abc"'
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"other", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
@@ -0,0 +1,138 @@
+import asyncio
+import sys
+
+import pytest
+
+from api.schedule.routes.ingest import get_ingest_status
+from config import parsing_config
+from parser.scheduler import IngestScheduler
+
+
+class AdvisoryLocks:
+    """
+    Заменитель advisory-блокировок PostgreSQL: блокировка уровня сессии освобождается при закрытии соединения.
+    """
+
+    def __init__(self):
+        self.holders = {}
+
+    def connect(self):
+        return LockConnection(self)
+
+
+class LockConnection:
+    def __init__(self, locks: AdvisoryLocks):
+        self._locks = locks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._locks.holders = {key: holder for key, holder in self._locks.holders.items() if holder is not self}
+
+    async def execute(self, statement):
+        compiled = statement.compile()
+        if "pg_try_advisory_lock" not in str(compiled):
+            return LockResult(1)
+        key = next(iter(compiled.params.values()))
+        return LockResult(self._locks.holders.setdefault(key, self) is self)
+
+    async def commit(self):
+        pass
+
+
+class LockResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one(self):
+        return self._value
+
+
+async def wait_for(condition, timeout: float = 5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestIngestScheduler:
+    async def test_second_instance_skips_while_lock_is_held(self):
+        locks = AdvisoryLocks()
+        runs = []
+        schedulers = {name: IngestScheduler(locks, interval=3600, lock_key=1, leader_check_interval=0.01)
+                      for name in ("first", "second")}
+        for name, scheduler in schedulers.items():
+            async def run_parser(name=name):
+                runs.append(name)
+                return True
+            scheduler._run_parser = run_parser
+
+        schedulers["first"].start()
+        await wait_for(lambda: runs == ["first"])
+        schedulers["second"].start()
+        await asyncio.sleep(0.05)
+
+        assert schedulers["first"].status()["leader"]
+        assert not schedulers["second"].status()["leader"]
+        assert runs == ["first"]
+
+        # Остановка ведущей реплики закрывает соединение с блокировкой, и её место занимает вторая
+        await schedulers["first"].stop()
+        await wait_for(lambda: runs == ["first", "second"])
+        assert schedulers["second"].status()["leader"]
+        await schedulers["second"].stop()
+
+    async def test_failed_run_is_reported_by_status(self, monkeypatch):
+        scheduler = IngestScheduler(AdvisoryLocks(), interval=3600, lock_key=1, leader_check_interval=0.01)
+        monkeypatch.setattr("api.schedule.routes.ingest.ingest_scheduler", scheduler)
+        monkeypatch.setattr(parsing_config, "retry_attempts", 2)
+        monkeypatch.setattr(parsing_config, "retry_delay", 0)
+        create_subprocess_exec = asyncio.create_subprocess_exec
+
+        async def failing_parser(*arguments, **kwargs):
+            return await create_subprocess_exec(sys.executable, "-c", "raise SystemExit(3)", **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", failing_parser)
+
+        scheduler.start()
+        await wait_for(lambda: scheduler.next_run_at is not None)
+        status = await get_ingest_status()
+        await scheduler.stop()
+
+        assert status["leader"]
+        assert not status["running"]
+        assert status["runs"] == 2
+        assert status["failures"] == 2
+        assert status["last_exit_code"] == 3
+        assert status["last_finished_at"] >= status["last_started_at"]
+
+    async def test_cancelling_after_parser_exited(self, monkeypatch):
+        scheduler = IngestScheduler(AdvisoryLocks(), interval=0, lock_key=1, leader_check_interval=0)
+        waiting = asyncio.Event()
+
+        class ExitedProcess:
+            returncode = None
+
+            async def wait(self):
+                # Первое ожидание прерывается отменой, к моменту terminate процесс уже завершился сам
+                if not waiting.is_set():
+                    waiting.set()
+                    await asyncio.Event().wait()
+                return 0
+
+            def terminate(self):
+                raise ProcessLookupError()
+
+        async def create_process(*arguments, **kwargs):
+            return ExitedProcess()
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", create_process)
+        run = asyncio.create_task(scheduler._run_parser())
+        await waiting.wait()
+        run.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        # Явный ноль из параметров не заменяется значением из конфигурации
+        assert (scheduler.interval, scheduler.leader_check_interval) == (0, 0)
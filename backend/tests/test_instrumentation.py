@@ -0,0 +1,26 @@
+from database.instrumentation import QueryRecord, QueryRecorder, normalize_statement, record_queries, _call_site
+
+
+class TestQueryRecorder:
+    def test_normalize_statement(self):
+        statement = "SELECT subjects.id FROM subjects\n WHERE subjects.name IN ($1::VARCHAR, $2::VARCHAR, $3::VARCHAR)"
+
+        assert normalize_statement(statement) == "SELECT subjects.id FROM subjects WHERE subjects.name IN (?)"
+
+    def test_n_plus_one(self):
+        recorder = QueryRecorder("test", n_plus_one_threshold=3, slow_threshold=1.0)
+        for _ in range(3):
+            recorder.add(QueryRecord("SELECT * FROM types WHERE short_name = $1", 0.001, 1, "entry.py:10", None))
+        recorder.add(QueryRecord("SELECT * FROM types WHERE short_name = $1", 0.001, 1, "entry.py:20", None))
+        recorder.add(QueryRecord("SELECT * FROM entries", 2.0, 100, "entry.py:30", None))
+
+        assert recorder.n_plus_one() == [("entry.py:10", "SELECT * FROM types WHERE short_name = ?", 3)]
+        assert len(recorder.slow_queries()) == 1
+        assert recorder.summary()["rows"] == 104
+
+    def test_call_site(self):
+        assert "tests/test_instrumentation.py" in _call_site()
+
+    def test_record_queries_context(self):
+        with record_queries("outer") as recorder:
+            assert recorder.name == "outer"
@@ -0,0 +1,43 @@
+import pytest
+
+from database.models.base import uuid7
+from database.notifications import CacheInvalidation, MAX_PAYLOAD_SIZE, decode_payload, dispatch, encode_payloads
+from database.repositories.cache import get_lookup_cache
+
+
+class TestNotifications:
+    def test_payload_round_trip(self):
+        uuid = uuid7()
+        invalidations = [CacheInvalidation("groups", uuid, None),
+                         CacheInvalidation("schedule", "М14О-105БВ-24:2024-09-02", "v2")]
+
+        payloads = encode_payloads(invalidations)
+
+        assert len(payloads) == 1
+        assert decode_payload(payloads[0]) == [CacheInvalidation("groups", str(uuid), None),
+                                               CacheInvalidation("schedule", "М14О-105БВ-24:2024-09-02", "v2")]
+        with pytest.raises(ValueError):
+            decode_payload("[1, 2]")
+
+    def test_payloads_fit_notify_limit(self):
+        invalidations = [CacheInvalidation("schedule", f"М14О-105БВ-24:{index}", uuid7()) for index in range(500)]
+
+        payloads = encode_payloads(invalidations)
+
+        assert len(payloads) > 1
+        assert all(len(payload.encode()) <= MAX_PAYLOAD_SIZE for payload in payloads)
+        assert sum(len(decode_payload(payload)) for payload in payloads) == len(invalidations)
+
+    def test_dispatch_evicts_lookup_cache(self):
+        cache = get_lookup_cache("test_notifications")
+        uuid, other_uuid = uuid7(), uuid7()
+        cache.set_many({"first": uuid, "second": other_uuid})
+
+        dispatch(CacheInvalidation("test_notifications", str(uuid), None))
+
+        assert cache.get("first") is None
+        assert cache.get("second") == other_uuid
+
+        dispatch(CacheInvalidation("test_notifications", None, None))
+
+        assert len(cache) == 0
@@ -0,0 +1,28 @@
+from datetime import date, datetime
+
+import pytest
+
+from database.pair_slots import PairSlots
+
+
+class TestPairSlots:
+    def test_encode(self):
+        pair_slots = PairSlots()
+
+        assert pair_slots.encode(datetime(2024, 9, 2, 10, 45), datetime(2024, 9, 2, 12, 15)) == (date(2024, 9, 2), 2)
+        assert pair_slots.encode(datetime(2024, 9, 2, 10, 0), datetime(2024, 9, 2, 12, 0)) == (date(2024, 9, 2), None)
+
+    def test_bounds(self):
+        pair_slots = PairSlots()
+
+        assert pair_slots.bounds(date(2024, 9, 2), 1) == (datetime(2024, 9, 2, 9, 0), datetime(2024, 9, 2, 10, 30))
+        with pytest.raises(ValueError):
+            pair_slots.bounds(date(2024, 9, 2), len(pair_slots) + 1)
+
+    def test_parse(self):
+        pair_slots = PairSlots()
+
+        assert pair_slots.parse(date(2024, 9, 2), "13:00:00", "14:30:00") == (datetime(2024, 9, 2, 13, 0),
+                                                                             datetime(2024, 9, 2, 14, 30))
+        assert pair_slots.parse(date(2024, 9, 2), "10:00:00", "13:00:00") == (datetime(2024, 9, 2, 10, 0),
+                                                                             datetime(2024, 9, 2, 13, 0))
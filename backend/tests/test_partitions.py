@@ -0,0 +1,16 @@
+from datetime import date, datetime
+
+from database.partitions import months_between, next_month, partition_name
+
+
+class TestPartitions:
+    def test_months_between(self):
+        assert months_between(datetime(2024, 11, 15, 9), datetime(2025, 2, 1)) == [
+            date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)
+        ]
+        assert months_between(datetime(2024, 11, 15), datetime(2025, 2, 1, 0, 1))[-1] == date(2025, 2, 1)
+        assert months_between(date(2024, 9, 1), date(2024, 9, 1)) == []
+
+    def test_partition_name(self):
+        assert next_month(date(2024, 12, 1)) == date(2025, 1, 1)
+        assert partition_name("entries", date(2024, 9, 1)) == "entries_y2024m09"
@@ -0,0 +1,252 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from redis.asyncio import Redis
+
+from api.schedule.response_cache import (ANY_GROUP_TAG, MemoryCacheBackend, RedisCacheBackend, ResponseCache,
+                                         group_tag, invalidate_schedule_responses)
+from database.notifications import CacheInvalidation
+
+
+class ReplyError(str):
+    pass
+
+
+def encode_reply(value) -> bytes:
+    if isinstance(value, ReplyError):
+        return f"-{value}\r\n".encode()
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return f"${len(value)}\r\n".encode() + value + b"\r\n"
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(encode_reply(item) for item in value)
+    return f"+{value}\r\n".encode()
+
+
+async def read_command(reader: asyncio.StreamReader) -> list:
+    # Клиент отправляет команды массивом строк: *<количество>, затем $<длина> и значение каждого аргумента
+    count = int((await reader.readuntil(b"\r\n"))[1:-2])
+    arguments = []
+    for _ in range(count):
+        length = int((await reader.readuntil(b"\r\n"))[1:-2])
+        arguments.append((await reader.readexactly(length + 2))[:-2])
+    return arguments
+
+
+def redis_client(url: str) -> Redis:
+    # Заменитель сервера отвечает только в RESP2, новые версии клиента по умолчанию переходят на RESP3
+    return Redis.from_url(url, protocol=2)
+
+
+class LocalRedisServer:
+    """
+    Заменитель сервера Redis для тестов: команды, которые использует RedisCacheBackend, без учёта времени жизни.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.expires = {}
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def _serve(self, reader, writer):
+        transaction = None
+        try:
+            while True:
+                command, *arguments = await read_command(reader)
+                command = command.decode().upper()
+                if command == "MULTI":
+                    transaction, reply = [], "OK"
+                elif command == "EXEC":
+                    reply = [self._execute(*queued) for queued in transaction]
+                    transaction = None
+                elif transaction is not None:
+                    transaction.append((command, arguments))
+                    reply = "QUEUED"
+                else:
+                    reply = self._execute(command, arguments)
+                writer.write(encode_reply(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+
+    def _execute(self, command, arguments):
+        if command == "CLIENT":
+            return "OK"
+        if command == "GET":
+            return self.values.get(arguments[0])
+        if command == "MGET":
+            return [self.values.get(key) for key in arguments]
+        if command == "SET":
+            key, value, _, ttl = arguments
+            self.values[key] = value
+            self.expires[key] = int(ttl)
+            return "OK"
+        if command == "SADD":
+            self.sets.setdefault(arguments[0], set()).add(arguments[1])
+            return 1
+        if command == "EXPIRE":
+            self.expires[arguments[0]] = int(arguments[1])
+            return 1
+        if command == "SMEMBERS":
+            return sorted(self.sets.get(arguments[0], ()))
+        if command == "DEL":
+            return sum(self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None
+                       for key in arguments)
+        if command in ("INCR", "INCRBY"):
+            increment = int(arguments[1]) if command == "INCRBY" else 1
+            self.values[arguments[0]] = str(int(self.values.get(arguments[0], 0)) + increment).encode()
+            return int(self.values[arguments[0]])
+        return ReplyError(f"ERR unknown command '{command}'")
+
+
+class TestResponseCache:
+    def test_key_is_normalised(self):
+        assert ResponseCache.key("entries", to="b", group="М8О-101БВ-24", teacher=None) == \
+               ResponseCache.key("entries", group="М8О-101БВ-24", to="b")
+
+    async def test_get_or_set_and_invalidate(self):
+        cache = ResponseCache(MemoryCacheBackend(100), ttl=60)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"group": "М8О-101БВ-24", "number": len(calls)}
+
+        key = cache.key("group_week", name="М8О-101БВ-24", number=1)
+        first = await cache.get_or_set(key, compute, tags=[group_tag("М8О-101БВ-24")])
+        second = await cache.get_or_set(key, compute, tags=[group_tag("М8О-101БВ-24")])
+
+        assert first == second == '{"group":"М8О-101БВ-24","number":1}'.encode()
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+        await cache.invalidate([group_tag("М8О-102БВ-24")])
+        await cache.get_or_set(key, compute)
+        assert len(calls) == 1
+
+        await cache.invalidate([group_tag("М8О-101БВ-24")])
+        await cache.get_or_set(key, compute)
+        assert len(calls) == 2
+
+    async def test_errors_and_invalidated_results_are_not_cached(self):
+        cache = ResponseCache(MemoryCacheBackend(100), ttl=60)
+
+        async def not_found():
+            raise HTTPException(status_code=404)
+
+        async def invalidated_while_computing():
+            await cache.invalidate([ANY_GROUP_TAG])
+            return {"group": "М8О-101БВ-24", "number": 1}
+
+        with pytest.raises(HTTPException):
+            await cache.get_or_set("missing", not_found)
+        await cache.get_or_set("stale", invalidated_while_computing, tags=[ANY_GROUP_TAG])
+
+        assert len(cache.backend) == 0
+
+    async def test_get_many_and_set(self):
+        cache = ResponseCache(MemoryCacheBackend(100), ttl=60)
+        generation = cache.generation
+        await cache.set("first", b"1", [group_tag("М8О-101БВ-24")], generation=generation)
+        await cache.set("expired", b"2", ttl=-1)
+        await cache.invalidate([ANY_GROUP_TAG])
+        await cache.set("stale", b"3", generation=generation)
+
+        assert await cache.get_many(["first", "expired", "stale", "missing"]) == {"first": b"1"}
+        assert cache.stats()["misses"] == 3
+
+    async def test_memory_backend_evicts_and_expires(self):
+        backend = MemoryCacheBackend(2)
+        await backend.set("first", b"1", 60, ["a"])
+        await backend.set("second", b"2", 60, ["a"])
+        await backend.get("first")
+        await backend.set("third", b"3", 60, ["b"])
+        await backend.set("expired", b"4", -1, [])
+
+        assert await backend.get("second") is None
+        assert await backend.get("expired") is None
+        assert await backend.invalidate(["a", "b"]) == 1
+        assert len(backend) == 0
+
+    async def test_schedule_notification_invalidates_group(self, monkeypatch):
+        cache = ResponseCache(MemoryCacheBackend(100), ttl=60)
+        monkeypatch.setattr("api.schedule.response_cache.response_cache", cache)
+        await cache.backend.set("week", b"{}", 60, [group_tag("М8О-101БВ-24")])
+        await cache.backend.set("teacher", b"{}", 60, [ANY_GROUP_TAG])
+        await cache.backend.set("other", b"{}", 60, [group_tag("М8О-102БВ-24")])
+
+        await invalidate_schedule_responses(CacheInvalidation("schedule", "М8О-101БВ-24:2024-09-02", None))
+
+        assert await cache.backend.get("week") is None
+        assert await cache.backend.get("teacher") is None
+        assert await cache.backend.get("other") == b"{}"
+
+        await invalidate_schedule_responses(CacheInvalidation("schedule", None, None))
+        assert len(cache.backend) == 0
+
+
+class TestRedisCacheBackend:
+    async def test_tags_and_generations(self):
+        async with LocalRedisServer() as server:
+            backend = RedisCacheBackend(redis_client(server.url), "test:", tag_ttl=3600)
+            await backend.set("week", b"{}", 60, [group_tag("М8О-101БВ-24")])
+            await backend.set("other", b"[]", 60, [group_tag("М8О-102БВ-24")])
+
+            assert await backend.get("week") == b"{}"
+            assert await backend.get_many(["week", "other", "missing"]) == {"week": b"{}", "other": b"[]"}
+            assert server.expires[b"test:response:week"] == 60
+            assert server.expires[f"test:tag:{group_tag('М8О-101БВ-24')}".encode()] == 3600
+            assert await backend.invalidate([group_tag("М8О-101БВ-24")]) == 1
+            assert await backend.get("week") is None
+            assert await backend.get("other") == b"[]"
+
+            await backend.clear()
+            assert await backend.get("other") is None
+            await backend.close()
+
+    async def test_processes_share_entries_and_clears(self):
+        async with LocalRedisServer() as server:
+            first = RedisCacheBackend(redis_client(server.url), "test:", tag_ttl=3600)
+            second = RedisCacheBackend(redis_client(server.url), "test:", tag_ttl=3600)
+            await first.set("week", b"{}", 60, [])
+            assert await second.get("week") == b"{}"
+
+            # Каждый процесс очищает кэш по одному и тому же уведомлению, записи после этого снова общие
+            await first.clear()
+            await second.clear()
+            assert await first.get("week") is None
+            await second.set("week", b"[]", 60, [])
+            assert await first.get("week") == b"[]"
+
+            await first.close()
+            await second.close()
+
+    async def test_unavailable_server_is_a_miss(self):
+        async with LocalRedisServer() as server:
+            url = server.url
+        cache = ResponseCache(RedisCacheBackend(redis_client(url), "test:", tag_ttl=60), ttl=60)
+
+        async def compute():
+            return {"group": "М8О-101БВ-24", "number": 1}
+
+        assert await cache.get_or_set("week", compute) == '{"group":"М8О-101БВ-24","number":1}'.encode()
+        assert cache.stats()["errors"] == 2
+        await cache.backend.close()
@@ -0,0 +1,87 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from api.schedule.model import ScheduleBatch, ScheduleBatchRequest
+from api.schedule.response_cache import MemoryCacheBackend, ResponseCache
+from api.schedule.routes.schedule import get_schedules_batch
+from config import schedule_config
+from database.repositories import EntryRow
+
+START, END = datetime(2024, 9, 2), datetime(2024, 9, 9)
+
+
+class GroupRepositoryStub:
+    def __init__(self, versions):
+        self.versions = versions
+        self.requests = []
+
+    async def get_schedule_versions(self, names):
+        self.requests.append(list(names))
+        return {name: self.versions[name] for name in names if name in self.versions}
+
+
+class EntryRepositoryStub:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    async def get_range_by_groups(self, start, end, group_ids):
+        self.requests.append(list(group_ids))
+        return self.rows
+
+
+class RecordingBackend(MemoryCacheBackend):
+    def __init__(self):
+        super().__init__(100)
+        self.batches = []
+
+    async def set_many(self, entries, ttl):
+        entries = list(entries)
+        self.batches.append([key for key, _, _ in entries])
+        await super().set_many(entries, ttl)
+
+
+async def read_body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestScheduleBatch:
+    async def test_too_many_groups(self, monkeypatch):
+        monkeypatch.setattr(schedule_config, "batch_max_groups", 2)
+        batch = ScheduleBatchRequest(groups=["М8О-101БВ-24", "М8О-102БВ-24", "М8О-103БВ-24"], start=START, end=END)
+        group_repository = GroupRepositoryStub({})
+
+        with pytest.raises(HTTPException) as error:
+            await get_schedules_batch(batch, group_repository, EntryRepositoryStub({}),
+                                      ResponseCache(MemoryCacheBackend(100), ttl=60))
+        assert error.value.status_code == 400
+        assert group_repository.requests == []
+
+    async def test_schedules_are_streamed_and_cached(self):
+        versions = {"М8О-101БВ-24": (uuid4(), uuid4()), "М8О-102БВ-24": (uuid4(), uuid4())}
+        rows = {"М8О-101БВ-24": [EntryRow(uuid4(), datetime(2024, 9, 2, 9, 0), datetime(2024, 9, 2, 10, 30),
+                                          "Базы данных", "ЛК", "М8О-101БВ-24", "3-435", None)]}
+        group_repository, entry_repository = GroupRepositoryStub(versions), EntryRepositoryStub(rows)
+        backend = RecordingBackend()
+        cache = ResponseCache(backend, ttl=60)
+        # Повторы схлопываются, ненайденная группа попадает в not_found
+        batch = ScheduleBatchRequest(groups=["М8О-101БВ-24", "М8О-102БВ-24", "М8О-101БВ-24", "М8О-999БВ-24"],
+                                     start=START, end=END)
+
+        first = await read_body(await get_schedules_batch(batch, group_repository, entry_repository, cache))
+        result = ScheduleBatch.model_validate_json(first)
+        assert [schedule.group for schedule in result.schedules] == ["М8О-101БВ-24", "М8О-102БВ-24"]
+        assert [len(schedule.entries) for schedule in result.schedules] == [1, 0]
+        assert result.schedules[0].version == versions["М8О-101БВ-24"][1]
+        assert result.not_found == ["М8О-999БВ-24"]
+        # Версии и расписания сохраняются одним обращением к хранилищу на каждую из двух частей
+        assert [len(keys) for keys in backend.batches] == [2, 2]
+
+        second = await read_body(await get_schedules_batch(batch, group_repository, entry_repository, cache))
+        assert second == first
+        assert entry_repository.requests == [[versions["М8О-101БВ-24"][0], versions["М8О-102БВ-24"][0]]]
+        assert group_repository.requests == [["М8О-101БВ-24", "М8О-102БВ-24", "М8О-999БВ-24"], ["М8О-999БВ-24"]]
+        assert len(backend.batches) == 2
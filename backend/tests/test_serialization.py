@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import TypeAdapter
+
+from api.schedule.model import GroupSchedule, ScheduleEntry, ScheduleEntryPage
+from api.schedule.serialization import dumps
+from database.repositories import ScheduleSnapshotRepository
+from database.repositories.schedule.entry import EntryRow
+
+
+def make_rows(count: int):
+    start = datetime(2024, 9, 2, 9)
+    return [EntryRow(uuid.uuid4(), start + timedelta(days=index), start + timedelta(days=index, minutes=90),
+                     "Математический анализ", "ЛК", "М8О-101БВ-24", None if index % 2 else "ГУК Б-226",
+                     "Иванов Иван Иванович") for index in range(count)]
+
+
+def pydantic_json(model, data) -> bytes:
+    adapter = TypeAdapter(model)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+class TestSerialization:
+    def test_entry_rows_have_response_model_fields(self):
+        # Быстрый путь не отбрасывает лишние поля, поэтому строки должны совпадать с моделью ответа
+        assert EntryRow._fields == tuple(ScheduleEntry.model_fields)
+
+    def test_matches_pydantic_output(self):
+        rows = make_rows(3)
+        page = {"entries": rows, "next_cursor": "курсор"}
+        schedule = {"group": "М8О-101БВ-24", "start": datetime(2024, 9, 2), "end": datetime(2024, 9, 9),
+                    "version": uuid.uuid4(), "pairs": [["09:00", "10:30"]],
+                    **ScheduleSnapshotRepository.build_payload(rows)}
+
+        assert dumps(page) == pydantic_json(ScheduleEntryPage, {**page, "entries": [row._asdict() for row in rows]})
+        assert dumps(schedule) == pydantic_json(GroupSchedule, schedule)
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from api.schedule.response_cache import MemoryCacheBackend, ResponseCache
+from api.schedule.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_computation(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*[flights.run("М8О-101БВ-24", compute) for _ in range(100)])
+
+        assert results == [1] * 100
+        assert flights.stats() == {"computations": 1, "coalesced": 99, "in_flight": 0, "coalescing_ratio": 0.99}
+        assert await flights.run("М8О-101БВ-24", compute) == 2
+
+    async def test_exception_reaches_every_caller(self):
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise LookupError("Группа не найдена")
+
+        results = await asyncio.gather(*[flights.run("key", compute) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+        assert len(flights) == 0
+
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        leader = asyncio.create_task(flights.run("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.run("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestStaleWhileRevalidate:
+    async def test_stale_entry_is_served_while_refreshing(self):
+        cache = ResponseCache(MemoryCacheBackend(100), ttl=0, stale_ttl=60)
+        refreshed = asyncio.Event()
+
+        async def compute():
+            await refreshed.wait()
+            return "новое"
+
+        async def first():
+            return "старое"
+
+        assert await cache.get_or_set("week", first) == '"старое"'.encode()
+        refresh = asyncio.create_task(cache.get_or_set("week", compute))
+        await asyncio.sleep(0)
+
+        assert await cache.get_or_set("week", compute) == '"старое"'.encode()
+        refreshed.set()
+        assert await refresh == '"новое"'.encode()
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["computations"] == 2
@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+from database.repositories import EntryRepository
+from database.repositories.statements import cached_statement
+
+
+class TestStatements:
+    def test_cached_statement_built_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return object()
+
+        assert cached_statement(("test", "statement"), build) is cached_statement(("test", "statement"), build)
+        assert len(calls) == 1
+
+    def test_range_query_reused_for_same_filters(self):
+        group_id = uuid.uuid4()
+        query, parameters = EntryRepository.range_query(datetime(2024, 9, 2), datetime(2024, 9, 9), group_id,
+                                                        None, None)
+        same_query, _ = EntryRepository.range_query(datetime(2024, 9, 9), datetime(2024, 9, 16), uuid.uuid4(),
+                                                    None, None)
+        other_query, _ = EntryRepository.range_query(datetime(2024, 9, 2), None, None, None, None)
+
+        assert query is same_query
+        assert query is not other_query
+        assert parameters == {"start": datetime(2024, 9, 2), "end": datetime(2024, 9, 9), "group_id": group_id}
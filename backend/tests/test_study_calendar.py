@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+import pytest
+
+from database.study_calendar import StudyCalendar, StudyWeekData, semester_of, semester_bounds
+
+
+def make_weeks():
+    return [
+        StudyWeekData(2, date(2024, 9, 9), date(2024, 9, 15), "2024-1"),
+        StudyWeekData(1, date(2024, 9, 2), date(2024, 9, 8), "2024-1"),
+        StudyWeekData(3, date(2024, 9, 16), date(2024, 9, 22), "2024-1"),
+    ]
+
+
+class TestStudyCalendar:
+    def test_semester_of(self):
+        assert semester_of(date(2024, 9, 1)) == "2024-1"
+        assert semester_of(date(2025, 1, 20)) == "2024-1"
+        assert semester_of(date(2025, 2, 10)) == "2024-2"
+
+    def test_semester_bounds(self):
+        assert semester_bounds("2024-1") == (datetime(2024, 8, 1), datetime(2025, 2, 1))
+        assert semester_bounds("2024-2") == (datetime(2025, 2, 1), datetime(2025, 8, 1))
+        assert semester_of(semester_bounds("2024-2")[0]) == "2024-2"
+        with pytest.raises(ValueError):
+            semester_bounds("2024-3")
+
+    def test_week_of(self):
+        calendar = StudyCalendar(make_weeks())
+
+        assert calendar.week_of(date(2024, 9, 2)).number == 1
+        assert calendar.week_of(datetime(2024, 9, 15, 18, 0)).number == 2
+        assert calendar.week_of(date(2024, 9, 22)).number == 3
+        assert calendar.week_of(date(2024, 9, 1)) is None
+        assert calendar.week_of(date(2024, 9, 23)) is None
+
+    def test_week_bounds(self):
+        calendar = StudyCalendar(make_weeks())
+
+        start, end = calendar.week_bounds(2, "2024-1")
+
+        assert start == datetime(2024, 9, 9)
+        assert end == datetime(2024, 9, 16)
+        with pytest.raises(ValueError):
+            calendar.week_bounds(4, "2024-1")
+        with pytest.raises(ValueError):
+            calendar.week_bounds(2, "2024-2")
+
+    def test_infer_weeks(self):
+        weeks = StudyCalendar.infer_weeks([datetime(2024, 9, 4, 9, 0), date(2024, 9, 17), date(2024, 9, 2)])
+
+        assert [week.number for week in weeks] == [1, 2, 3]
+        assert weeks[0].start_date == date(2024, 9, 2)
+        assert weeks[-1].end_date == date(2024, 9, 22)
+        assert {week.semester for week in weeks} == {"2024-1"}
@@ -0,0 +1,25 @@
+import time
+import uuid
+
+from database.models.base import uuid7
+
+
+class TestUUID7:
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_timestamp(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        assert before <= value.int >> 80 <= after
+
+    def test_monotonic(self):
+        values = [uuid7() for _ in range(10000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)